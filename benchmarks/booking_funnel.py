@@ -0,0 +1,419 @@
+"""Load-test the booking funnel end to end.
+
+Seeds `--users` verified users and a schedule of flights, then runs
+`--concurrency` virtual users for `--duration` seconds. Each one repeatedly
+signs in and books a flight through the whole funnel:
+
+    /sign_in -> /select_date_route_passengers -> /get_available_flights
+    -> /select_time -> /send_payment_otp -> (OTP email) -> /verify_payment
+
+Payment OTPs are read from the emails the app sends to a local aiosmtpd
+stand-in; the wait for that email is reported as the ``otp_email`` step.
+
+By default the app in ``main.py`` is served in-process through httpx's ASGI
+transport, on a throwaway SQLite file (or ``DB_URL``). To load a real server,
+start it with the same ``DB_URL`` and the SMTP stand-in's address, and pass
+its URL:
+
+    SMTP_HOST=127.0.0.1 SMTP_PORT=8025 SMTP_STARTTLS=false uvicorn main:app
+    python -m benchmarks.booking_funnel --url http://127.0.0.1:8000 --smtp-port 8025
+
+The report is JSON: throughput, and per step the request count, error rate,
+status codes of failures and p50/p95/p99 latency. Write it to a file with
+`--output` and pass a previous report as `--baseline` to add the relative
+change of throughput and of each step's p95.
+
+    python -m benchmarks.booking_funnel --concurrency 20 --duration 30 --output after.json --baseline before.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import date, datetime, time as clock, timedelta
+
+os.environ.setdefault(
+    "DB_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+os.environ.setdefault("SECRET_KEY", "booking-funnel-load-test-secret-key")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("SENDER_EMAIL_ID", "noreply@example.com")
+
+import httpx
+from aiosmtpd.controller import Controller
+from sqlalchemy import insert
+
+STEPS = (
+    "sign_in",
+    "select_date_route_passengers",
+    "get_available_flights",
+    "select_time",
+    "send_payment_otp",
+    "otp_email",
+    "verify_payment",
+)
+PASSWORD = "load-test-password"
+FIRST_DAY = date(2030, 1, 1)
+OTP = re.compile(r"OTP: (\d+)")
+
+
+class OTPInbox:
+    """aiosmtpd handler that routes each emailed OTP to its recipient's queue."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.inboxes = defaultdict(asyncio.Queue)
+
+    async def handle_DATA(self, server, session, envelope):
+        match = OTP.search(envelope.content.decode(errors="replace"))
+        if match:
+            for receiver in envelope.rcpt_tos:
+                self.loop.call_soon_threadsafe(
+                    self.inboxes[receiver].put_nowait, match.group(1)
+                )
+        return "250 OK"
+
+    def clear(self, email: str):
+        inbox = self.inboxes[email]
+        while not inbox.empty():
+            inbox.get_nowait()
+
+    async def next_otp(self, email: str, timeout: float):
+        return await asyncio.wait_for(self.inboxes[email].get(), timeout)
+
+
+def seed(users: int, routes: int, days: int, flights_per_day: int):
+    from database.database import Base, engine
+    from src.models.admin import Admin  # noqa: F401
+    from src.models.booking import Booking  # noqa: F401
+    from src.models.flights import Flight
+    from src.models.user import User, ACTIVE
+    from src.utils.passwords import pwd_context
+
+    Base.metadata.create_all(engine)
+    hashed = pwd_context.hash(PASSWORD)
+    now = datetime.now()
+    run = uuid.uuid4().hex[:8]
+    accounts = [f"load-{run}-{n}@example.com" for n in range(users)]
+    user_rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "first_name": "Load",
+            "last_name": f"User{n}",
+            "password": hashed,
+            "email": email,
+            "phone_no": "+10000000000",
+            "status": ACTIVE,
+            "is_created": now,
+            "is_modified": now,
+        }
+        for n, email in enumerate(accounts)
+    ]
+    route_names = [(f"LT{run}{n}A", f"LT{run}{n}B") for n in range(routes)]
+    flight_rows = [
+        {
+            "flight_id": str(uuid.uuid4()),
+            "flight_name": f"LT{route}-{n}",
+            "start_point": start_point,
+            "end_point": end_point,
+            "journey_date": FIRST_DAY + timedelta(days=day),
+            "journey_time": clock(6 + n % 16, 5 * (n // 16) % 60),
+            "duration_minutes": 120,
+            "available_capacity": 1_000_000,
+            "flight_price": float(100 + n),
+            "is_cancelled": False,
+        }
+        for route, (start_point, end_point) in enumerate(route_names)
+        for day in range(days)
+        for n in range(flights_per_day)
+    ]
+    with engine.begin() as connection:
+        for table, rows in (
+            (User.__table__, user_rows),
+            (Flight.__table__, flight_rows),
+        ):
+            for offset in range(0, len(rows), 5000):
+                connection.execute(insert(table), rows[offset : offset + 5000])
+    return accounts, route_names
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.failures = defaultdict(Counter)
+        self.funnels = 0
+
+    def ok(self, step: str, started: float):
+        self.latencies[step].append(time.perf_counter() - started)
+
+    def failed(self, step: str, started: float, reason):
+        self.latencies[step].append(time.perf_counter() - started)
+        self.failures[step][str(reason)] += 1
+
+
+class StepFailed(Exception):
+    pass
+
+
+async def call(client, recorder, step, method, url, **kwargs):
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except httpx.HTTPError as e:
+        recorder.failed(step, started, type(e).__name__)
+        raise StepFailed(step)
+    if response.status_code >= 400:
+        recorder.failed(step, started, response.status_code)
+        raise StepFailed(step)
+    recorder.ok(step, started)
+    return response.json()
+
+
+async def funnel(client, recorder, inbox, email, route, days, rng, otp_timeout):
+    signed_in = await call(
+        client,
+        recorder,
+        "sign_in",
+        "GET",
+        "/sign_in",
+        params={"email": email, "password": PASSWORD},
+    )
+    headers = {"token": signed_in["access_token"]["access_token"]}
+
+    start_point, end_point = route
+    booking = await call(
+        client,
+        recorder,
+        "select_date_route_passengers",
+        "POST",
+        "/select_date_route_passengers",
+        headers=headers,
+        json={
+            "journey_date": str(FIRST_DAY + timedelta(days=rng.randrange(days))),
+            "start_point": start_point,
+            "end_point": end_point,
+            "no_of_adults": rng.randint(1, 3),
+            "no_of_children": rng.randint(0, 2),
+            "no_of_infants": rng.randint(0, 1),
+        },
+    )
+    booking_id = booking["booking_id"]
+
+    flights = await call(
+        client,
+        recorder,
+        "get_available_flights",
+        "GET",
+        "/get_available_flights",
+        params={"booking_id": booking_id},
+    )
+    await call(
+        client,
+        recorder,
+        "select_time",
+        "POST",
+        "/select_time",
+        params={
+            "booking_id": booking_id,
+            "journey_time": rng.choice(flights)["journey_time"],
+        },
+    )
+    # A late email from an earlier, failed funnel must not be taken for this one
+    inbox.clear(email)
+    await call(
+        client,
+        recorder,
+        "send_payment_otp",
+        "POST",
+        "/send_payment_otp",
+        params={"booking_id": booking_id},
+    )
+
+    started = time.perf_counter()
+    try:
+        otp = await inbox.next_otp(email, otp_timeout)
+    except asyncio.TimeoutError:
+        recorder.failed("otp_email", started, "timeout")
+        raise StepFailed("otp_email")
+    recorder.ok("otp_email", started)
+
+    await call(
+        client,
+        recorder,
+        "verify_payment",
+        "POST",
+        "/verify_payment",
+        params={"booking_id": booking_id, "email": email, "otp": otp},
+    )
+    recorder.funnels += 1
+
+
+async def virtual_user(client, recorder, inbox, email, routes, days, deadline, seed):
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        try:
+            await funnel(
+                client, recorder, inbox, email, rng.choice(routes), days, rng, 30
+            )
+        except StepFailed:
+            pass
+
+
+def percentile(latencies: list, share: float):
+    return round(latencies[max(int(len(latencies) * share + 0.5) - 1, 0)] * 1000, 2)
+
+
+def summarize(recorder: Recorder, elapsed: float):
+    steps = {}
+    for step in STEPS:
+        latencies = sorted(recorder.latencies[step])
+        errors = sum(recorder.failures[step].values())
+        steps[step] = {
+            "requests": len(latencies),
+            "errors": errors,
+            "error_rate": round(errors / len(latencies), 4) if latencies else 0.0,
+            "failures": dict(recorder.failures[step]),
+            "p50_ms": percentile(latencies, 0.50) if latencies else None,
+            "p95_ms": percentile(latencies, 0.95) if latencies else None,
+            "p99_ms": percentile(latencies, 0.99) if latencies else None,
+        }
+    requests = sum(
+        step["requests"] for name, step in steps.items() if name != "otp_email"
+    )
+    return {
+        "funnels_completed": recorder.funnels,
+        "funnels_per_s": round(recorder.funnels / elapsed, 2),
+        "requests_per_s": round(requests / elapsed, 2),
+        "steps": steps,
+    }
+
+
+def compare(report: dict, baseline: dict):
+    def change(new, old):
+        return round((new - old) / old, 4) if new is not None and old else None
+
+    return {
+        "baseline_commit": baseline.get("commit"),
+        "funnels_per_s": change(report["funnels_per_s"], baseline["funnels_per_s"]),
+        "p95_ms": {
+            step: change(
+                report["steps"][step]["p95_ms"],
+                baseline["steps"].get(step, {}).get("p95_ms"),
+            )
+            for step in STEPS
+        },
+    }
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args):
+    loop = asyncio.get_running_loop()
+    inbox = OTPInbox(loop)
+    controller = Controller(inbox, hostname="127.0.0.1", port=args.smtp_port)
+    controller.start()
+    os.environ.update(
+        SMTP_HOST="127.0.0.1", SMTP_PORT=str(args.smtp_port), SMTP_STARTTLS="false"
+    )
+    os.environ.pop("EMAIL_PASSKEY", None)
+
+    # Each virtual user needs its own account, or they would read each
+    # other's OTP emails
+    accounts, routes = seed(
+        max(args.users, args.concurrency), args.routes, args.days, args.flights_per_day
+    )
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+        lifespan = None
+    else:
+        from logs.log_config import logger
+        import main
+
+        logger.remove()
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=main.app),
+            base_url="http://funnel.test",
+            timeout=60,
+        )
+        lifespan = main.app.router.lifespan_context(main.app)
+        await lifespan.__aenter__()
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    deadline = started + args.duration
+    try:
+        async with client:
+            await asyncio.gather(
+                *(
+                    virtual_user(
+                        client,
+                        recorder,
+                        inbox,
+                        accounts[n],
+                        routes,
+                        args.days,
+                        deadline,
+                        args.seed + n,
+                    )
+                    for n in range(args.concurrency)
+                )
+            )
+        elapsed = time.perf_counter() - started
+    finally:
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+        controller.stop()
+
+    report = {
+        "commit": current_commit(),
+        "target": args.url or "in-process",
+        "db": "async" if os.environ.get("DB_ASYNC", "").lower() == "true" else "sync",
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 2),
+        **summarize(recorder, elapsed),
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["vs_baseline"] = compare(report, json.load(f))
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Base URL of a running server")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--routes", type=int, default=20)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--flights-per-day", type=int, default=4)
+    parser.add_argument("--smtp-port", type=int, default=8025)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Also write the report to this file")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
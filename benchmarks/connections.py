@@ -0,0 +1,135 @@
+"""Time connection searches over a synthetic day of flights.
+
+Seeds `--flights` departures spread over `--airports` airports (plus a
+lighter next day for overnight connections), loads the day into the
+connection graph, then runs `--searches` random origin/destination searches
+and reports latency percentiles. Finally a handful of routes are marked as
+changed to time the incremental patch against a full reload.
+
+    python -m benchmarks.connections --flights 50000 --airports 300
+
+Set ``DB_URL`` to point at Postgres; by default a throwaway SQLite file is used.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import date, time as clock, timedelta
+
+os.environ.setdefault(
+    "DB_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+
+from sqlalchemy import insert
+
+from database.database import Base, engine, open_session, dispose_engines
+from logs.log_config import logger
+from src.models.admin import Admin  # noqa: F401
+from src.models.booking import Booking  # noqa: F401
+from src.models.flights import Flight
+from src.models.user import User  # noqa: F401
+from src.utils.connections import connection_graph
+
+logger.remove()
+
+DAY = date(2030, 1, 1)
+
+
+def seed(flights: int, airports: int, rng: random.Random):
+    Base.metadata.create_all(engine)
+    names = [f"AP{n:03d}" for n in range(airports)]
+    rows = []
+    for day, count in ((DAY, flights), (DAY + timedelta(days=1), flights // 4)):
+        for n in range(count):
+            start_point, end_point = rng.sample(names, 2)
+            rows.append(
+                {
+                    "flight_id": str(uuid.uuid4()),
+                    "flight_name": f"BN{n}",
+                    "start_point": start_point,
+                    "end_point": end_point,
+                    "journey_date": day,
+                    "journey_time": clock(rng.randrange(24), rng.randrange(0, 60, 5)),
+                    "duration_minutes": rng.randrange(45, 600, 5),
+                    "available_capacity": rng.randrange(0, 200),
+                    "flight_price": float(rng.randrange(50, 1500)),
+                    "is_cancelled": False,
+                }
+            )
+    with engine.begin() as connection:
+        for offset in range(0, len(rows), 5000):
+            connection.execute(insert(Flight.__table__), rows[offset : offset + 5000])
+    return names, rows
+
+
+def percentile(latencies: list, share: float):
+    return round(latencies[max(int(len(latencies) * share) - 1, 0)], 2)
+
+
+async def run(flights: int, airports: int, searches: int, seed_value: int):
+    rng = random.Random(seed_value)
+    names, rows = seed(flights, airports, rng)
+
+    async with open_session() as db:
+        started = time.perf_counter()
+        await connection_graph.schedule(db, DAY)
+        await connection_graph.schedule(db, DAY + timedelta(days=1))
+        load_s = time.perf_counter() - started
+
+        report = {"flights": len(rows), "airports": airports, "load_s": load_s}
+        for sort_by in ("price", "arrival"):
+            latencies, found = [], 0
+            for _ in range(searches):
+                start_point, end_point = rng.sample(names, 2)
+                started = time.perf_counter()
+                itineraries = await connection_graph.search(
+                    db, start_point, end_point, DAY, sort_by=sort_by
+                )
+                latencies.append((time.perf_counter() - started) * 1000)
+                found += bool(itineraries)
+            latencies.sort()
+            report[sort_by] = {
+                "searches": searches,
+                "with_results": found,
+                "p50_ms": round(statistics.median(latencies), 2),
+                "p99_ms": percentile(latencies, 0.99),
+                "max_ms": round(latencies[-1], 2),
+            }
+
+        changed = rng.sample(rows[:flights], 10)
+        connection_graph.routes_changed(
+            *(
+                (row["journey_date"], row["start_point"], row["end_point"])
+                for row in changed
+            )
+        )
+        started = time.perf_counter()
+        await connection_graph.schedule(db, DAY)
+        report["patch_10_routes_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    await dispose_engines()
+    report["load_s"] = round(report["load_s"], 3)
+    report["graph"] = connection_graph.stats()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flights", type=int, default=50000)
+    parser.add_argument("--airports", type=int, default=300)
+    parser.add_argument("--searches", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(
+        json.dumps(
+            asyncio.run(run(args.flights, args.airports, args.searches, args.seed)),
+            indent=2,
+        )
+    )
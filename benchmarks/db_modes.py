@@ -0,0 +1,188 @@
+"""Compare request throughput of the sync and async database modes.
+
+Each mode runs in its own process against a freshly seeded SQLite file and
+drives ``/get_available_flights`` and ``/verify_payment`` through the ASGI app
+at a fixed concurrency.
+
+    python -m benchmarks.db_modes --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, time as clock, timedelta
+
+
+def seed(bookings: int):
+    from database.database import Base, SessionLocal, engine
+    from src.models.admin import Admin  # noqa: F401
+    from src.models.booking import Booking
+    from src.models.flights import Flight
+    from src.models.user import ACTIVE, OTP, User
+    from src.utils.otp_store import payment_purpose
+
+    Base.metadata.create_all(engine)
+    flight_id = str(uuid.uuid4())
+    booking_ids, payments = [], []
+
+    with SessionLocal() as db:
+        db.add(
+            Flight(
+                flight_id=flight_id,
+                flight_name="BENCH-1",
+                start_point="A",
+                end_point="B",
+                journey_date=date(2030, 1, 1),
+                journey_time=clock(10, 0),
+                available_capacity=bookings * 2 + 10,
+            )
+        )
+        for n in range(bookings):
+            user_id, booking_id = str(uuid.uuid4()), str(uuid.uuid4())
+            email = f"bench{n}@example.com"
+            db.add(
+                User(
+                    id=user_id,
+                    first_name="Bench",
+                    last_name=str(n),
+                    password="x",
+                    email=email,
+                    phone_no="+10000000000",
+                    status=ACTIVE,
+                )
+            )
+            db.add(
+                Booking(
+                    booking_id=booking_id,
+                    flight_id=flight_id,
+                    flight_name="BENCH-1",
+                    user_id=user_id,
+                    first_name="Bench",
+                    last_name=str(n),
+                    email=email,
+                    phone_no="+10000000000",
+                    journey_date=date(2030, 1, 1),
+                    start_point="A",
+                    end_point="B",
+                    no_of_adults=1,
+                    journey_time=clock(10, 0),
+                )
+            )
+            db.add(
+                OTP(
+                    id=str(uuid.uuid4()),
+                    user_id=user_id,
+                    email=email,
+                    otp="1234",
+                    purpose=payment_purpose(booking_id),
+                    expires_at=datetime.now() + timedelta(hours=1),
+                )
+            )
+            booking_ids.append(booking_id)
+            payments.append({"booking_id": booking_id, "email": email, "otp": "1234"})
+        db.commit()
+
+    return booking_ids, payments
+
+
+async def drive(client, method, url, params_list, concurrency):
+    latencies, errors = [], 0
+    queue = asyncio.Queue()
+    for params in params_list:
+        queue.put_nowait(params)
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            params = queue.get_nowait()
+            started = time.perf_counter()
+            response = await client.request(method, url, params=params)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "req_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+    }
+
+
+async def child(requests: int, concurrency: int):
+    import httpx
+
+    from logs.log_config import logger
+
+    logger.remove()
+    booking_ids, payments = seed(requests)
+
+    from database.database import dispose_engines
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        search = [{"booking_id": booking_ids[n % 10]} for n in range(requests)]
+        results = {
+            "/get_available_flights": await drive(
+                client, "GET", "/get_available_flights", search, concurrency
+            ),
+            "/verify_payment": await drive(
+                client, "POST", "/verify_payment", payments, concurrency
+            ),
+        }
+    await dispose_engines()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(child(args.requests, args.concurrency))))
+        return
+
+    report = {}
+    for mode in ("sync", "async"):
+        env = dict(
+            os.environ,
+            DB_ASYNC="true" if mode == "async" else "false",
+            DB_URL=f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}",
+        )
+        env.setdefault("SECRET_KEY", "benchmark-secret")
+        env.setdefault("ALGORITHM", "HS256")
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.db_modes", "--child"]
+            + ["--requests", str(args.requests)]
+            + ["--concurrency", str(args.concurrency)],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        report[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Quote a large batch of itineraries with the fare engine.
+
+Draws `--itineraries` random (price, seats left, party) rows and quotes them
+with one vectorized ``FareEngine.quote`` call, then with the per-booking
+Python formula ``Send_Payment_Otp`` used before, and checks that the default
+engine reproduces it exactly. A second vectorized run adds tax and demand
+tiers to show what the extra rules cost.
+
+    python -m benchmarks.fare_quotes --itineraries 1000000
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from src.utils.pricing import FareEngine, parse_demand_tiers
+
+
+def legacy_bill(flight_price, adults, children, infants):
+    bill_amount = (adults + children) * flight_price
+    if infants > 0:
+        bill_amount += infants * 5000
+    return bill_amount
+
+
+def timed(function):
+    started = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - started
+
+
+def run(itineraries: int, seed: int):
+    rng = np.random.default_rng(seed)
+    prices = rng.integers(50, 20000, itineraries).astype(float)
+    seats_left = rng.integers(0, 300, itineraries)
+    adults = rng.integers(1, 5, itineraries)
+    children = rng.integers(0, 3, itineraries)
+    infants = rng.integers(0, 2, itineraries)
+
+    default = FareEngine(1.0, 0.0, 5000, 0.0, [])
+    dynamic = FareEngine(0.75, 0.1, 1500, 0.18, parse_demand_tiers("10:1.4,50:1.15"))
+
+    vectorized, vectorized_s = timed(
+        lambda: default.quote(prices, seats_left, adults, children, infants)
+    )
+    rows = list(
+        zip(prices.tolist(), adults.tolist(), children.tolist(), infants.tolist())
+    )
+    looped, looped_s = timed(lambda: [legacy_bill(*row) for row in rows])
+    _, dynamic_s = timed(
+        lambda: dynamic.quote(prices, seats_left, adults, children, infants)
+    )
+
+    return {
+        "itineraries": itineraries,
+        "vectorized_s": round(vectorized_s, 3),
+        "python_loop_s": round(looped_s, 3),
+        "speedup": round(looped_s / vectorized_s, 1),
+        "vectorized_with_tax_and_tiers_s": round(dynamic_s, 3),
+        "matches_legacy": bool(np.array_equal(vectorized, np.round(looped, 2))),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--itineraries", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    result = run(args.itineraries, args.seed)
+    print(json.dumps(result, indent=2))
+    raise SystemExit(0 if result["matches_legacy"] else 1)
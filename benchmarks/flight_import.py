@@ -0,0 +1,129 @@
+"""Time a bulk schedule import against one /register_new_flight call per flight.
+
+A season of flights is generated, uploaded once to ``/import_flights`` as CSV or
+JSON lines, and a sample of the same size class is registered one request at a
+time for comparison. Both run against a fresh SQLite file.
+
+    python -m benchmarks.flight_import --flights 100000 --format csv --single 500
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DB_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+from logs.log_config import logger
+
+logger.remove()
+
+FIELDS = [
+    "flight_name",
+    "journey_date",
+    "journey_time",
+    "start_point",
+    "end_point",
+    "available_capacity",
+    "flight_price",
+]
+
+
+def schedule(count: int, prefix: str):
+    for n in range(count):
+        yield {
+            "flight_name": f"{prefix}-{n // 365}",
+            "journey_date": f"2030-{n % 12 + 1:02d}-{n % 28 + 1:02d}",
+            "journey_time": f"{n % 24:02d}:{(n // 24) % 60:02d}",
+            "start_point": f"City{n % 50}",
+            "end_point": f"City{(n + 7) % 50}",
+            "available_capacity": 180,
+            "flight_price": 4500.0,
+        }
+
+
+def encode(rows, fmt: str):
+    if fmt == "ndjson":
+        return "".join(json.dumps(row) + "\n" for row in rows), "application/x-ndjson"
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue(), "text/csv"
+
+
+async def run(flights: int, fmt: str, single: int):
+    import httpx
+
+    from database.database import Base, dispose_engines, engine
+    from main import app
+    from src.models import admin, booking, flights as flight_models, user  # noqa: F401
+    from src.utils.admin import get_token
+
+    Base.metadata.create_all(engine)
+    headers = {"token": get_token("bench-admin", "admin")["access_token"]}
+    body, content_type = encode(list(schedule(flights, "BULK")), fmt)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        started = time.perf_counter()
+        response = await client.post(
+            "/import_flights",
+            content=body,
+            headers={**headers, "content-type": content_type},
+        )
+        bulk_elapsed = time.perf_counter() - started
+        summary = response.json()
+
+        started = time.perf_counter()
+        for row in schedule(single, "SINGLE"):
+            await client.post("/register_new_flight", json=row, headers=headers)
+        single_elapsed = time.perf_counter() - started
+
+    await dispose_engines()
+    report = {
+        "bulk": {
+            "flights": flights,
+            "format": fmt,
+            "created": summary["created"],
+            "duplicate": summary["duplicate"],
+            "invalid": summary["invalid"],
+            "seconds": round(bulk_elapsed, 2),
+            "flights_per_s": round(flights / bulk_elapsed, 1),
+        }
+    }
+    if single:
+        report["one_by_one"] = {
+            "flights": single,
+            "seconds": round(single_elapsed, 2),
+            "flights_per_s": round(single / single_elapsed, 1),
+            "projected_seconds_for_bulk": round(single_elapsed / single * flights, 1),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flights", type=int, default=100000)
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    parser.add_argument("--single", type=int, default=500)
+    args = parser.parse_args()
+
+    print(
+        json.dumps(asyncio.run(run(args.flights, args.format, args.single)), indent=2)
+    )
+
+
+if __name__ == "__main__":
+    main()
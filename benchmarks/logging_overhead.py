@@ -0,0 +1,152 @@
+"""Measure what logging costs a booking request.
+
+Replays the log calls one booking makes, from choosing a route to verifying
+the payment, `--requests` times under each logging setup, writing to a
+throwaway log file and to /dev/null in place of stdout:
+
+* blocking: the previous setup, eager f-strings and sinks written on the
+  calling thread, and blocking_json the same with JSON records;
+* enqueued: keyword-argument messages, written by the QueuedSink thread;
+* enqueued_json: the same with structured JSON records;
+* enqueued_sampled: the same with INFO and SUCCESS records sampled at 10%.
+
+Reports the time per request spent on the calling thread, how long the
+background writer then took to drain the queue, and how many records had to
+wait for room in it.
+
+    python -m benchmarks.logging_overhead --requests 20000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+
+from logs import log_config
+from logs.log_config import configure, logger
+
+
+def eager_booking(booking_id: str, flight_id: str, email: str):
+    logger.info("Starting the booking process for a user.")
+    logger.success(f"Booking details saved with ID: {booking_id}")
+    logger.info(f"Fetching available flights for booking ID: {booking_id}")
+    logger.success(f"Found {12} flights for booking ID: {booking_id}")
+    logger.info(f"Selecting journey time for booking ID: {booking_id}")
+    logger.success(
+        f"Journey time selected for booking ID: {booking_id}, flight ID: {flight_id}"
+    )
+    logger.info(f"Initiating payment process for booking ID: {booking_id}")
+    logger.info(f"Attempting to generate OTP for email: {email}")
+    logger.info("Generating OTP")
+    logger.success(f"OTP successfully generated and queued for {email}")
+    logger.success(f"OTP sent to email {email} for payment of {5200.0}")
+    logger.info(f"Verifying payment for booking ID: {booking_id}")
+    logger.info(f"Verifying OTP for email: {email}")
+    logger.success(f"OTP for email {email} has been verified and deleted.")
+    logger.info(f"Reserving {2} seats on flight ID: {flight_id}")
+    logger.info(f"{2} seats reserved on flight ID: {flight_id}")
+    logger.success(f"Payment verified, booking completed for ID: {booking_id}")
+
+
+def lazy_booking(booking_id: str, flight_id: str, email: str):
+    logger.info("Starting the booking process for a user.")
+    logger.success("Booking details saved with ID: {booking_id}", booking_id=booking_id)
+    logger.info(
+        "Fetching available flights for booking ID: {booking_id}",
+        booking_id=booking_id,
+    )
+    logger.success(
+        "Found {flights} flights for booking ID: {booking_id}",
+        flights=12,
+        booking_id=booking_id,
+    )
+    logger.info(
+        "Selecting journey time for booking ID: {booking_id}", booking_id=booking_id
+    )
+    logger.success(
+        "Journey time selected for booking ID: {booking_id}, flight ID: {flight_id}",
+        booking_id=booking_id,
+        flight_id=flight_id,
+    )
+    logger.info(
+        "Initiating payment process for booking ID: {booking_id}",
+        booking_id=booking_id,
+    )
+    logger.info("Attempting to generate OTP for email: {email}", email=email)
+    logger.info("Generating OTP")
+    logger.success("OTP successfully generated and queued for {email}", email=email)
+    logger.success(
+        "OTP sent to email {email} for payment of {bill_amount}",
+        email=email,
+        bill_amount=5200.0,
+    )
+    logger.info("Verifying payment for booking ID: {booking_id}", booking_id=booking_id)
+    logger.info("Verifying OTP for email: {email}", email=email)
+    logger.success("OTP for email {email} has been verified and deleted.", email=email)
+    logger.info(
+        "Reserving {seats} seats on flight ID: {flight_id}",
+        seats=2,
+        flight_id=flight_id,
+    )
+    logger.info(
+        "{seats} seats reserved on flight ID: {flight_id}",
+        seats=2,
+        flight_id=flight_id,
+    )
+    logger.success(
+        "Payment verified, booking completed for ID: {booking_id}",
+        booking_id=booking_id,
+    )
+
+
+SETUPS = {
+    "blocking": (eager_booking, {"enqueue": False}),
+    "blocking_json": (eager_booking, {"enqueue": False, "structured": True}),
+    "enqueued": (lazy_booking, {"enqueue": True}),
+    "enqueued_json": (lazy_booking, {"enqueue": True, "structured": True}),
+    "enqueued_sampled": (
+        lazy_booking,
+        {"enqueue": True, "sample_rates": {"INFO": 0.1, "SUCCESS": 0.1}},
+    ),
+}
+
+
+def run(requests: int):
+    directory = tempfile.mkdtemp()
+    ids = [(str(uuid.uuid4()), str(uuid.uuid4())) for _ in range(requests)]
+    result = {"requests": requests}
+
+    with open(os.devnull, "w") as devnull:
+        for name, (booking, options) in SETUPS.items():
+            configure(
+                level="INFO",
+                path=os.path.join(directory, f"{name}.log"),
+                stdout=devnull,
+                **options,
+            )
+            started = time.perf_counter()
+            for booking_id, flight_id in ids:
+                booking(booking_id, flight_id, "user@example.com")
+            caller_s = time.perf_counter() - started
+            if log_config.log_sink is not None:
+                log_config.log_sink.drain()
+            blocked = log_config.log_stats().get("blocked", 0)
+            drained_s = time.perf_counter() - started
+            logger.remove()
+
+            result[name] = {
+                "caller_us_per_request": round(caller_s / requests * 1e6, 1),
+                "drain_s": round(drained_s - caller_s, 3),
+                "blocked": blocked,
+            }
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.requests), indent=2))
@@ -0,0 +1,200 @@
+"""Compare entity and column-projected reads for the admin listings.
+
+Seeds `--flights` flights and `--users` users, then renders a page of
+`--limit` rows from ``/get_all_flight_details`` and ``/get_all_users_data``,
+and one user from ``/get_single_user_data``, two ways:
+
+* entity: load full ORM objects, validate them against the response schema
+  and encode the result, which is what FastAPI did with a ``response_model``;
+* projected: select only the schema's columns and encode the rows with
+  ``ProjectedJSONResponse``, as the handlers do now.
+
+Reports mean latency and the tracemalloc peak per request for each, and
+checks that both produce the same JSON.
+
+    python -m benchmarks.read_paths --flights 20000 --users 20000 --limit 1000
+
+Set ``DB_URL`` to point at Postgres; by default a throwaway SQLite file is used.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import date, datetime, time as clock, timedelta
+
+os.environ.setdefault(
+    "DB_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+
+from database.database import Base, engine, open_session, dispose_engines
+from logs.log_config import logger
+from src.models.admin import Admin  # noqa: F401
+from src.models.booking import Booking  # noqa: F401
+from src.models.flights import Flight
+from src.models.user import User, ACTIVE
+from src.schemas.admin import Get_All_User_Schema
+from src.schemas.flights import All_Flight_Schema
+from src.utils.listing import ProjectedJSONResponse, columns, keyset_page
+from src.utils.states import in_state
+
+logger.remove()
+
+ACTIVE_USER = (in_state(User.status, ACTIVE),)
+
+
+def seed(flights: int, users: int, rng: random.Random):
+    Base.metadata.create_all(engine)
+    flight_rows = [
+        {
+            "flight_id": str(uuid.uuid4()),
+            "flight_name": f"BN{n}",
+            "start_point": f"AP{rng.randrange(200):03d}",
+            "end_point": f"AP{rng.randrange(200):03d}",
+            "journey_date": date(2030, 1, 1) + timedelta(days=rng.randrange(180)),
+            "journey_time": clock(rng.randrange(24), rng.randrange(0, 60, 5)),
+            "duration_minutes": rng.randrange(45, 600, 5),
+            "available_capacity": rng.randrange(0, 200),
+            "flight_price": float(rng.randrange(50, 1500)),
+            "is_cancelled": False,
+        }
+        for n in range(flights)
+    ]
+    user_rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "first_name": f"first{n}",
+            "last_name": f"last{n}",
+            "password": "x" * 60,
+            "email": f"user{n}@example.com",
+            "phone_no": "9" * 10,
+            "status": ACTIVE,
+            "is_created": datetime(2030, 1, 1),
+            "is_modified": datetime(2030, 1, 1),
+        }
+        for n in range(users)
+    ]
+    with engine.begin() as connection:
+        for table, rows in (
+            (Flight.__table__, flight_rows),
+            (User.__table__, user_rows),
+        ):
+            for offset in range(0, len(rows), 5000):
+                connection.execute(insert(table), rows[offset : offset + 5000])
+    return user_rows
+
+
+def render_entities(rows, adapter: TypeAdapter):
+    content = adapter.dump_python(
+        adapter.validate_python(rows, from_attributes=True), mode="json"
+    )
+    return JSONResponse(content).body
+
+
+async def entity_page(db, model, schema, key, limit: int):
+    rows = (await db.scalars(select(model).order_by(key).limit(limit))).all()
+    return render_entities(rows, TypeAdapter(list[schema]))
+
+
+async def projected_page(db, model, schema, key, limit: int):
+    rows, cursor = await keyset_page(
+        db, select(*columns(model, schema)), key, None, limit
+    )
+    return ProjectedJSONResponse(rows, cursor=cursor).body
+
+
+async def entity_user(db, email: str):
+    user = await db.scalar(select(User).where(User.email == email, *ACTIVE_USER))
+    return render_entities(user, TypeAdapter(Get_All_User_Schema))
+
+
+async def projected_user(db, email: str):
+    user = (
+        await db.execute(
+            select(*columns(User, Get_All_User_Schema)).where(
+                User.email == email, *ACTIVE_USER
+            )
+        )
+    ).first()
+    return ProjectedJSONResponse(user._asdict()).body
+
+
+async def measure(render, repeats: int):
+    async with open_session() as db:
+        body = await render(db)
+        started = time.perf_counter()
+        for _ in range(repeats):
+            await render(db)
+        elapsed = time.perf_counter() - started
+
+        tracemalloc.start()
+        await render(db)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return body, {
+        "mean_ms": round(elapsed / repeats * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+async def run(flights: int, users: int, limit: int, repeats: int, seed_value: int):
+    rng = random.Random(seed_value)
+    user_rows = seed(flights, users, rng)
+    email = rng.choice(user_rows)["email"]
+
+    cases = {
+        "flights_page": (
+            lambda db: entity_page(
+                db, Flight, All_Flight_Schema, Flight.flight_id, limit
+            ),
+            lambda db: projected_page(
+                db, Flight, All_Flight_Schema, Flight.flight_id, limit
+            ),
+        ),
+        "users_page": (
+            lambda db: entity_page(db, User, Get_All_User_Schema, User.id, limit),
+            lambda db: projected_page(db, User, Get_All_User_Schema, User.id, limit),
+        ),
+        "single_user": (
+            lambda db: entity_user(db, email),
+            lambda db: projected_user(db, email),
+        ),
+    }
+
+    result = {"flights": flights, "users": users, "limit": limit}
+    for name, (entity, projected) in cases.items():
+        entity_body, entity_stats = await measure(entity, repeats)
+        projected_body, projected_stats = await measure(projected, repeats)
+        result[name] = {
+            "entity": entity_stats,
+            "projected": projected_stats,
+            "speedup": round(entity_stats["mean_ms"] / projected_stats["mean_ms"], 2),
+            "same_json": json.loads(entity_body) == json.loads(projected_body),
+        }
+
+    await dispose_engines()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flights", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    result = asyncio.run(
+        run(args.flights, args.users, args.limit, args.repeats, args.seed)
+    )
+    print(json.dumps(result, indent=2))
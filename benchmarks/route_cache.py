@@ -0,0 +1,174 @@
+"""Flight search latency with and without the route cache.
+
+Each run seeds a fresh SQLite file with many routes, then sends
+``/get_available_flights`` searches whose routes follow a Zipf distribution,
+so a few popular routes take most of the traffic, as they do in production.
+The cache-off run sets ROUTE_CACHE_SIZE=0.
+
+    python -m benchmarks.route_cache --routes 2000 --requests 5000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, time as clock
+
+
+def seed(routes: int, flights_per_route: int):
+    from sqlalchemy import insert
+    from database.database import Base, engine
+    from src.models.admin import Admin  # noqa: F401
+    from src.models.booking import Booking
+    from src.models.flights import Flight
+    from src.models.user import User
+
+    Base.metadata.create_all(engine)
+    flights, bookings = [], []
+    for route in range(routes):
+        start, end = f"City{route}", f"City{route + 1}"
+        for n in range(flights_per_route):
+            flights.append(
+                {
+                    "flight_id": str(uuid.uuid4()),
+                    "flight_name": f"R{route}-{n}",
+                    "start_point": start,
+                    "end_point": end,
+                    "journey_date": date(2030, 1, 1),
+                    "journey_time": clock(n % 24, 0),
+                    "available_capacity": 180,
+                    "flight_price": 4500.0,
+                }
+            )
+        bookings.append(
+            {
+                "booking_id": str(uuid.uuid4()),
+                "user_id": "bench-user",
+                "first_name": "Bench",
+                "last_name": "User",
+                "email": "bench@example.com",
+                "phone_no": "+10000000000",
+                "journey_date": date(2030, 1, 1),
+                "start_point": start,
+                "end_point": end,
+                "no_of_adults": 1,
+            }
+        )
+
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User.__table__),
+            [
+                {
+                    "id": "bench-user",
+                    "first_name": "Bench",
+                    "last_name": "User",
+                    "password": "x",
+                    "email": "bench@example.com",
+                    "phone_no": "+10000000000",
+                }
+            ],
+        )
+        connection.execute(insert(Flight.__table__), flights)
+        connection.execute(insert(Booking.__table__), bookings)
+    return [booking["booking_id"] for booking in bookings]
+
+
+async def child(routes: int, flights_per_route: int, requests: int, concurrency: int):
+    import httpx
+
+    from logs.log_config import logger
+
+    logger.remove()
+    booking_ids = seed(routes, flights_per_route)
+
+    from database.database import dispose_engines
+    from main import app
+    from src.utils.route_cache import route_cache
+
+    rng = random.Random(7)
+    weights = [1 / (rank + 1) for rank in range(routes)]
+    searches = rng.choices(booking_ids, weights=weights, k=requests)
+    latencies = []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def worker(queue):
+            while queue:
+                booking_id = queue.pop()
+                started = time.perf_counter()
+                response = await client.get(
+                    "/get_available_flights", params={"booking_id": booking_id}
+                )
+                latencies.append((time.perf_counter() - started) * 1000)
+                response.raise_for_status()
+
+        queue = list(searches)
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(queue) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    await dispose_engines()
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "req_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 2),
+        "hit_ratio": round(route_cache.stats()["hit_ratio"], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", type=int, default=2000)
+    parser.add_argument("--flights-per-route", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = asyncio.run(
+            child(args.routes, args.flights_per_route, args.requests, args.concurrency)
+        )
+        print(json.dumps(result))
+        return
+
+    report = {}
+    for label, cache_size in (("cache_off", "0"), ("cache_on", None)):
+        env = dict(
+            os.environ,
+            DB_URL=f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}",
+        )
+        if cache_size is not None:
+            env["ROUTE_CACHE_SIZE"] = cache_size
+        env.setdefault("SECRET_KEY", "benchmark-secret")
+        env.setdefault("ALGORITHM", "HS256")
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.route_cache", "--child"]
+            + ["--routes", str(args.routes)]
+            + ["--flights-per-route", str(args.flights_per_route)]
+            + ["--requests", str(args.requests)]
+            + ["--concurrency", str(args.concurrency)],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        report[label] = json.loads(output.strip().splitlines()[-1])
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Time seat-map reads and seat picks on a large cabin.
+
+Registers one flight with `--seats` seats, fills a random `--occupancy` share
+of them and then reports, in microseconds:
+
+* decode_render: turning the stored bitmap into the rows `/seat_map` serves,
+  and cached_render the same for a cabin drawn recently;
+* fetch_render: the same plus the SELECT of the row, on one open session;
+* best_block: picking the best block for each party size from 1 to 9;
+* assign_release: taking a party's seats and giving them back, committed.
+
+    python -m benchmarks.seat_maps --seats 400 --occupancy 0.7
+
+Set ``DB_URL`` to point at Postgres; by default a throwaway SQLite file is used.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import date, time as clock
+
+os.environ.setdefault(
+    "DB_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+
+from database.database import Base, engine, open_session, dispose_engines
+from logs.log_config import logger
+from src.models.admin import Admin  # noqa: F401
+from src.models.booking import Booking  # noqa: F401
+from src.models.flights import Flight, FlightSeatMap
+from src.models.user import User  # noqa: F401
+from src.utils.seats import SeatMap, SeatMaps, _rows
+
+logger.remove()
+
+
+def per_call_us(function, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return round((time.perf_counter() - started) / repeat * 1e6, 2)
+
+
+async def per_await_us(function, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await function()
+    return round((time.perf_counter() - started) / repeat * 1e6, 2)
+
+
+async def run(layout: str, seats: int, occupancy: float, repeat: int, seed: int):
+    Base.metadata.create_all(engine)
+    seat_maps = SeatMaps(layout)
+    rng = random.Random(seed)
+
+    occupied = 0
+    for seat in rng.sample(range(seats), int(seats * occupancy)):
+        occupied |= 1 << seat
+    flight_id = str(uuid.uuid4())
+    row = seat_maps.new_row(flight_id, seats)
+    row["occupied"] = SeatMap(layout, seats, occupied).encode()
+
+    async with open_session() as db:
+        db.add(
+            Flight(
+                flight_id=flight_id,
+                flight_name="BENCH-1",
+                start_point="A",
+                end_point="B",
+                journey_date=date(2030, 1, 1),
+                journey_time=clock(10, 0),
+                available_capacity=seats - occupied.bit_count(),
+            )
+        )
+        db.add(FlightSeatMap(**row))
+        await db.commit()
+
+        seat_map = await seat_maps.read(db, flight_id)
+        stored = (await db.execute(FlightSeatMap.__table__.select())).first()
+
+        def decode_render():
+            _rows.cache_clear()
+            SeatMap.from_row(stored).render()
+
+        async def fetch_render():
+            (await seat_maps.read(db, flight_id)).render()
+
+        async def assign_release():
+            labels = await seat_maps.assign(db, flight_id, 2)
+            await seat_maps.release(db, flight_id, labels)
+            await db.commit()
+
+        result = {
+            "layout": layout,
+            "seats": seats,
+            "free": seat_map.free.bit_count(),
+            "decode_render_us": per_call_us(decode_render, repeat),
+            "cached_render_us": per_call_us(seat_map.render, repeat),
+            "fetch_render_us": await per_await_us(fetch_render, repeat),
+            "best_block_us": {
+                party: per_call_us(lambda: seat_map.best_block(party), repeat)
+                for party in range(1, 10)
+            },
+            "assign_release_us": await per_await_us(assign_release, repeat // 10),
+        }
+
+    await dispose_engines()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--layout", default="ABC-DEFG-HJK")
+    parser.add_argument("--seats", type=int, default=400)
+    parser.add_argument("--occupancy", type=float, default=0.7)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(
+        json.dumps(
+            asyncio.run(
+                run(args.layout, args.seats, args.occupancy, args.repeat, args.seed)
+            ),
+            indent=2,
+        )
+    )
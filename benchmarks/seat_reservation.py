@@ -0,0 +1,129 @@
+"""Hammer one flight's seat inventory from many concurrent workers.
+
+Every worker runs the same ``reserve_seats`` / ``release_seats`` calls the
+booking router uses, each on its own session, and the final seat count is
+checked against what the workers actually managed to reserve. In sync mode
+each statement runs on the threadpool; with ``DB_ASYNC=true`` the async
+driver is used instead.
+
+    python -m benchmarks.seat_reservation --workers 32 --capacity 500
+
+Set ``DB_URL`` to point at Postgres; by default a throwaway SQLite file is used.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+from datetime import date, time as clock
+
+os.environ.setdefault(
+    "DB_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+
+from fastapi import HTTPException
+
+from database.database import Base, engine, open_session, dispose_engines, DB_ASYNC
+from logs.log_config import logger
+from src.models.admin import Admin  # noqa: F401
+from src.models.booking import Booking  # noqa: F401
+from src.models.flights import Flight
+from src.models.user import User  # noqa: F401
+from src.utils.booking import release_seats, reserve_seats
+
+logger.remove()
+
+
+async def run(
+    workers: int, capacity: int, attempts: int, party_size: int, cancel_every: int
+):
+    Base.metadata.create_all(engine)
+
+    flight_id = str(uuid.uuid4())
+    async with open_session() as db:
+        db.add(
+            Flight(
+                flight_id=flight_id,
+                flight_name="BENCH-1",
+                start_point="A",
+                end_point="B",
+                journey_date=date(2030, 1, 1),
+                journey_time=clock(10, 0),
+                available_capacity=capacity,
+            )
+        )
+        await db.commit()
+
+    totals = {"reserved": 0, "released": 0, "sold_out": 0, "errors": 0}
+
+    async def worker():
+        async with open_session() as db:
+            for attempt in range(attempts):
+                try:
+                    await reserve_seats(db, flight_id, party_size)
+                    await db.commit()
+                    totals["reserved"] += party_size
+                except HTTPException:
+                    totals["sold_out"] += 1
+                    continue
+                except Exception:
+                    await db.rollback()
+                    totals["errors"] += 1
+                    continue
+
+                if cancel_every and attempt % cancel_every == 0:
+                    try:
+                        await release_seats(db, flight_id, party_size)
+                        await db.commit()
+                        totals["released"] += party_size
+                    except Exception:
+                        await db.rollback()
+                        totals["errors"] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    elapsed = time.perf_counter() - started
+
+    async with open_session() as db:
+        final_capacity = (await db.get(Flight, flight_id)).available_capacity
+    await dispose_engines()
+
+    expected = capacity - totals["reserved"] + totals["released"]
+    operations = workers * attempts + totals["released"] // party_size
+    return {
+        "db": engine.url.get_backend_name(),
+        "mode": "async" if DB_ASYNC else "sync",
+        "workers": workers,
+        "initial_capacity": capacity,
+        "final_capacity": final_capacity,
+        "expected_capacity": expected,
+        "consistent": final_capacity == expected and final_capacity >= 0,
+        "elapsed_s": round(elapsed, 3),
+        "ops_per_s": round(operations / elapsed, 1),
+        **totals,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--capacity", type=int, default=300)
+    parser.add_argument("--attempts", type=int, default=50)
+    parser.add_argument("--party-size", type=int, default=2)
+    parser.add_argument("--cancel-every", type=int, default=5)
+    args = parser.parse_args()
+
+    result = asyncio.run(
+        run(
+            args.workers,
+            args.capacity,
+            args.attempts,
+            args.party_size,
+            args.cancel_every,
+        )
+    )
+    print(json.dumps(result, indent=2))
+    raise SystemExit(0 if result["consistent"] else 1)
@@ -0,0 +1,172 @@
+"""Show that waitlist promotion costs the same however long the queue is.
+
+For each `--lengths` queue length, fills a full flight's waitlist with that
+many bookings, parties of 1 to `--max-party` in random order behind a
+block of parties too large to ever fit. Each trial then frees `--freed`
+seats and promotes, in one transaction that is rolled back afterwards, and
+reports the time promotion took and how many bookings it confirmed.
+
+    python -m benchmarks.waitlist --lengths 1000,10000,100000 --freed 4
+
+Set ``DB_URL`` to point at Postgres; by default a throwaway SQLite file is used.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import date, time as clock
+
+os.environ.setdefault(
+    "DB_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+)
+
+from sqlalchemy import insert
+
+from database.database import Base, engine, open_session, dispose_engines
+from logs.log_config import logger
+from src.models.admin import Admin  # noqa: F401
+from src.models.booking import Booking, WAITLISTED, WaitlistEntry
+from src.models.flights import Flight, FlightSeatMap
+from src.models.user import User, ACTIVE
+from src.utils.booking import release_seats
+from src.utils.seats import SeatMap, seat_maps
+from src.utils.waitlist import waitlist
+
+logger.remove()
+
+CABIN_SEATS = 60
+
+
+def queue_rows(flight_id: str, user_id: str, length: int, max_party: int, rng):
+    # Parties larger than the cabin first: a scan in queue order would have
+    # to step over every one of them
+    blocked = length // 10
+    sizes = [CABIN_SEATS + 1] * blocked + [
+        rng.randint(1, max_party) for _ in range(length - blocked)
+    ]
+    bookings, entries = [], []
+    for seats in sizes:
+        booking_id = str(uuid.uuid4())
+        bookings.append(
+            {
+                "booking_id": booking_id,
+                "flight_id": flight_id,
+                "user_id": user_id,
+                "first_name": "Bench",
+                "last_name": "User",
+                "email": "bench@example.com",
+                "phone_no": "+10000000",
+                "journey_date": date(2030, 1, 1),
+                "start_point": "A",
+                "end_point": "B",
+                "no_of_adults": seats,
+                "no_of_children": 0,
+                "no_of_infants": 0,
+                "bill_amount": 0.0,
+                "status": WAITLISTED,
+            }
+        )
+        entries.append(
+            {"flight_id": flight_id, "booking_id": booking_id, "seats": seats}
+        )
+    return bookings, entries
+
+
+def create_flight(length: int, max_party: int, rng, user_id: str):
+    flight_id = str(uuid.uuid4())
+    seat_map = seat_maps.new_row(flight_id, CABIN_SEATS)
+    seat_map["occupied"] = SeatMap(
+        seat_maps.layout, CABIN_SEATS, (1 << CABIN_SEATS) - 1
+    ).encode()
+    bookings, entries = queue_rows(flight_id, user_id, length, max_party, rng)
+
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Flight),
+            {
+                "flight_id": flight_id,
+                "flight_name": f"BENCH-{length}",
+                "start_point": "A",
+                "end_point": "B",
+                "journey_date": date(2030, 1, 1),
+                "journey_time": clock(10, 0),
+                "available_capacity": 0,
+            },
+        )
+        connection.execute(insert(FlightSeatMap), seat_map)
+        connection.execute(insert(Booking), bookings)
+        connection.execute(insert(WaitlistEntry), entries)
+    return flight_id
+
+
+async def trial(flight_id: str, freed: int):
+    async with open_session() as db:
+        await release_seats(db, flight_id, freed)
+        labels = [SeatMap(seat_maps.layout, CABIN_SEATS).label(n) for n in range(freed)]
+        await seat_maps.release(db, flight_id, labels)
+
+        started = time.perf_counter()
+        promoted = await waitlist.promote(db, flight_id)
+        elapsed = time.perf_counter() - started
+        await db.rollback()
+    return elapsed, len(promoted)
+
+
+async def run(lengths: list, freed: int, max_party: int, trials: int, seed: int):
+    Base.metadata.create_all(engine)
+    rng = random.Random(seed)
+    user_id = str(uuid.uuid4())
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User),
+            {
+                "id": user_id,
+                "first_name": "Bench",
+                "last_name": "User",
+                "password": "-",
+                "email": "bench@example.com",
+                "phone_no": "+10000000",
+                "status": ACTIVE,
+            },
+        )
+
+    result = {"freed": freed, "max_party": max_party}
+    for length in lengths:
+        flight_id = create_flight(length, max_party, rng, user_id)
+        timings, promoted = [], 0
+        for _ in range(trials):
+            elapsed, promoted = await trial(flight_id, freed)
+            timings.append(elapsed)
+        result[length] = {
+            "promote_ms_median": round(statistics.median(timings) * 1e3, 2),
+            "promoted": promoted,
+        }
+
+    await dispose_engines()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", default="1000,10000,100000")
+    parser.add_argument("--freed", type=int, default=4)
+    parser.add_argument("--max-party", type=int, default=6)
+    parser.add_argument("--trials", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    lengths = [int(length) for length in args.lengths.split(",")]
+    print(
+        json.dumps(
+            asyncio.run(
+                run(lengths, args.freed, args.max_party, args.trials, args.seed)
+            ),
+            indent=2,
+        )
+    )
@@ -4,7 +4,59 @@ import os
 load_dotenv()
 
 DB_URL = os.environ.get("DB_URL")
+DB_ASYNC = os.environ.get("DB_ASYNC", "false").lower() == "true"
+ASYNC_DB_URL = os.environ.get("ASYNC_DB_URL")
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = int(os.environ.get("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+PAGE_SIZE_MAX = int(os.environ.get("PAGE_SIZE_MAX", 1000))
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", 1000))
+IMPORT_BATCH_SIZE = int(os.environ.get("IMPORT_BATCH_SIZE", 1000))
+BOOKING_HOLD_SECONDS = int(os.environ.get("BOOKING_HOLD_SECONDS", 900))
+HOLD_REAP_INTERVAL = float(os.environ.get("HOLD_REAP_INTERVAL", 60))
+HOLD_REAP_BATCH_SIZE = int(os.environ.get("HOLD_REAP_BATCH_SIZE", 500))
 SENDER_EMAIL_ID = os.environ.get("SENDER_EMAIL_ID")
 EMAIL_PASSKEY = os.environ.get("EMAIL_PASSKEY")
+SMTP_HOST = os.environ.get("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.environ.get("SMTP_PORT", 587))
+SMTP_STARTTLS = os.environ.get("SMTP_STARTTLS", "true").lower() == "true"
+SMTP_TIMEOUT = float(os.environ.get("SMTP_TIMEOUT", 30))
+SMTP_IDLE_TIMEOUT = float(os.environ.get("SMTP_IDLE_TIMEOUT", 60))
+EMAIL_BATCH_SIZE = int(os.environ.get("EMAIL_BATCH_SIZE", 20))
+EMAIL_MAX_RETRIES = int(os.environ.get("EMAIL_MAX_RETRIES", 5))
+EMAIL_RETRY_BACKOFF = float(os.environ.get("EMAIL_RETRY_BACKOFF", 1.0))
+OTP_BACKEND = os.environ.get("OTP_BACKEND", "database").lower()
+OTP_TTL_SECONDS = int(os.environ.get("OTP_TTL_SECONDS", 300))
+OTP_SWEEP_INTERVAL = float(os.environ.get("OTP_SWEEP_INTERVAL", 60))
+OTP_SWEEP_BATCH_SIZE = int(os.environ.get("OTP_SWEEP_BATCH_SIZE", 500))
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 4))
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", 64))
 SECRET_KEY = os.environ.get("SECRET_KEY")
 ALGORITHM = os.environ.get("ALGORITHM")
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", 10000))
+ROUTE_CACHE_SIZE = int(os.environ.get("ROUTE_CACHE_SIZE", 1024))
+ROUTE_CACHE_TTL = float(os.environ.get("ROUTE_CACHE_TTL", 60))
+FARE_CACHE_SIZE = int(os.environ.get("FARE_CACHE_SIZE", 1024))
+FARE_CHILD_MULTIPLIER = float(os.environ.get("FARE_CHILD_MULTIPLIER", 1.0))
+FARE_INFANT_MULTIPLIER = float(os.environ.get("FARE_INFANT_MULTIPLIER", 0.0))
+FARE_INFANT_FLAT = float(os.environ.get("FARE_INFANT_FLAT", 5000))
+FARE_TAX_RATE = float(os.environ.get("FARE_TAX_RATE", 0.0))
+FARE_DEMAND_TIERS = os.environ.get("FARE_DEMAND_TIERS", "")
+FARE_CALENDAR_MAX_DAYS = int(os.environ.get("FARE_CALENDAR_MAX_DAYS", 15))
+CONNECTION_MIN_LAYOVER = int(os.environ.get("CONNECTION_MIN_LAYOVER", 45))
+CONNECTION_MAX_LAYOVER = int(os.environ.get("CONNECTION_MAX_LAYOVER", 720))
+CONNECTION_GRAPH_DAYS = int(os.environ.get("CONNECTION_GRAPH_DAYS", 30))
+CONNECTION_GRAPH_TTL = float(os.environ.get("CONNECTION_GRAPH_TTL", 60))
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "false").lower() == "true"
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+METRICS_DB_HEADERS = os.environ.get("METRICS_DB_HEADERS", "false").lower() == "true"
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FILE = os.environ.get("LOG_FILE", "logs/app.log")
+LOG_JSON = os.environ.get("LOG_JSON", "false").lower() == "true"
+LOG_ENQUEUE = os.environ.get("LOG_ENQUEUE", "true").lower() == "true"
+LOG_STDOUT = os.environ.get("LOG_STDOUT", "true").lower() == "true"
+LOG_SAMPLE_RATES = os.environ.get("LOG_SAMPLE_RATES", "")
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", 10000))
+SEAT_LAYOUT = os.environ.get("SEAT_LAYOUT", "ABC-DEF")
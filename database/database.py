@@ -1,8 +1,268 @@
-from config import DB_URL
-from sqlalchemy import create_engine
+from config import (
+    DB_URL,
+    DB_ASYNC,
+    ASYNC_DB_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+)
+from contextlib import asynccontextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import CursorResult, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import run_in_threadpool
+import threading
+import time
 
-engine = create_engine(DB_URL)
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+class TimedCheckout:
+    """Pool mixin recording how long each checkout took to get a connection.
+
+    Covers waiting for a pooled connection to be returned and, when the pool
+    grows into its overflow, opening a new one; not pre-ping or the session's
+    own work. This is the number to watch when sizing the pool.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            record_checkout_wait(time.perf_counter() - started)
+
+
+class TimedQueuePool(TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(url: str, poolclass=TimedQueuePool):
+    options = {"pool_pre_ping": DB_POOL_PRE_PING, "pool_recycle": DB_POOL_RECYCLE}
+    parsed = make_url(url)
+
+    # In-memory SQLite is served from a single-connection pool without overflow
+    in_memory = parsed.database in (None, "", ":memory:")
+    if parsed.get_backend_name() == "sqlite" and in_memory:
+        return options
+
+    options.update(
+        poolclass=poolclass,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    return options
+
+
+def async_url(url: str):
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if parsed.drivername != backend or backend not in ASYNC_DRIVERS:
+        return url
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(
+        hide_password=False
+    )
+
+
+engine = create_engine(DB_URL, **pool_options(DB_URL))
 Base = declarative_base()
-SessionLocal = sessionmaker(bind=engine)
\ No newline at end of file
+SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC:
+    ASYNC_URL = ASYNC_DB_URL or async_url(DB_URL)
+    async_engine = create_async_engine(
+        ASYNC_URL, **pool_options(ASYNC_URL, TimedAsyncAdaptedQueuePool)
+    )
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+
+class ThreadedStreamResult:
+    """Server-side cursor result whose batches are fetched on the threadpool."""
+
+    def __init__(self, result):
+        self._result = result
+
+    async def partitions(self, size=None):
+        batches = self._result.partitions(size)
+        while batch := await run_in_threadpool(next, batches, None):
+            yield batch
+
+
+class ThreadedSession:
+    """Gives a sync Session the awaitable API of AsyncSession.
+
+    Each call runs on the threadpool, so routers are written once against the
+    AsyncSession interface and work with or without an async driver.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    def _execute(self, statement, params=None, **kwargs):
+        result = self.sync_session.execute(statement, params, **kwargs)
+        # Fetch rows on the worker thread, as AsyncSession does on the driver
+        if isinstance(result, CursorResult) and not result.returns_rows:
+            return result
+        return result.freeze()()
+
+    async def execute(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self._execute, statement, params, **kwargs)
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(
+            self.sync_session.scalar, statement, params, **kwargs
+        )
+
+    async def scalars(self, statement, params=None, **kwargs):
+        result = await self.execute(statement, params, **kwargs)
+        return result.scalars()
+
+    async def stream(self, statement, params=None, **kwargs):
+        result = await run_in_threadpool(
+            self.sync_session.execute,
+            statement.execution_options(stream_results=True),
+            params,
+            **kwargs,
+        )
+        return ThreadedStreamResult(result)
+
+    async def stream_scalars(self, statement, params=None, **kwargs):
+        result = await run_in_threadpool(
+            self.sync_session.scalars,
+            statement.execution_options(stream_results=True),
+            params,
+            **kwargs,
+        )
+        return ThreadedStreamResult(result)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def connection(self, **kwargs):
+        return await run_in_threadpool(self.sync_session.connection, **kwargs)
+
+    async def refresh(self, instance, **kwargs):
+        await run_in_threadpool(self.sync_session.refresh, instance, **kwargs)
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self, objects=None):
+        await run_in_threadpool(self.sync_session.flush, objects)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+
+_pool_stats_lock = threading.Lock()
+_pool_stats = {
+    "connects": 0,
+    "checkouts": 0,
+    "checkins": 0,
+    "invalidations": 0,
+    "waits": 0,
+    "wait_time_total_ms": 0.0,
+    "wait_time_max_ms": 0.0,
+}
+
+
+def _count(key: str):
+    with _pool_stats_lock:
+        _pool_stats[key] += 1
+
+
+def record_checkout_wait(seconds: float):
+    waited_ms = seconds * 1000
+    with _pool_stats_lock:
+        _pool_stats["waits"] += 1
+        _pool_stats["wait_time_total_ms"] += waited_ms
+        _pool_stats["wait_time_max_ms"] = max(
+            _pool_stats["wait_time_max_ms"], waited_ms
+        )
+
+
+def watch_pool(pool_engine):
+    event.listen(pool_engine, "connect", lambda *args: _count("connects"))
+    event.listen(pool_engine, "checkout", lambda *args: _count("checkouts"))
+    event.listen(pool_engine, "checkin", lambda *args: _count("checkins"))
+    event.listen(pool_engine, "invalidate", lambda *args: _count("invalidations"))
+
+
+request_engine = async_engine.sync_engine if DB_ASYNC else engine
+watch_pool(request_engine)
+
+
+def get_pool_stats():
+    pool = request_engine.pool
+    with _pool_stats_lock:
+        stats = dict(_pool_stats)
+
+    stats["wait_time_avg_ms"] = (
+        stats["wait_time_total_ms"] / stats["waits"] if stats["waits"] else 0.0
+    )
+    stats["mode"] = "async" if DB_ASYNC else "sync"
+    stats["pool_class"] = type(pool).__name__
+    if isinstance(pool, QueuePool):
+        stats.update(
+            pool_size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    return stats
+
+
+@asynccontextmanager
+async def open_session():
+    if DB_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = ThreadedSession(SessionLocal())
+        try:
+            yield db
+        finally:
+            await db.close()
+
+
+async def dispose_engines():
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+
+
+async def get_db():
+    async with open_session() as db:
+        yield db
@@ -1,13 +1,231 @@
-
+from config import (
+    LOG_LEVEL,
+    LOG_FILE,
+    LOG_JSON,
+    LOG_ENQUEUE,
+    LOG_STDOUT,
+    LOG_SAMPLE_RATES,
+    LOG_QUEUE_SIZE,
+)
+from datetime import datetime
 from loguru import logger
+import asyncio
+import json
+import os
+import queue
+import random
 import sys
-# Step 3: Configure Loguru logger to store logs in 'app.log'
-# Remove the default logger configuration
-logger.remove()
+import threading
+import traceback
+import zipfile
+
+FORMAT = "{time:DD-MM-YYYY hh:mm:ss A} {level} {message}"
+ROTATION_BYTES = 10 * 1024 * 1024
+
+
+def parse_sample_rates(text: str):
+    """Parse "LEVEL:rate,..." into {level name: share of records kept}."""
+    rates = {}
+    for part in filter(None, (part.strip() for part in text.split(","))):
+        level, rate = part.split(":")
+        rates[level.strip().upper()] = float(rate)
+    return rates
+
+
+def sampler(rates: dict):
+    def keep(record):
+        rate = rates.get(record["level"].name)
+        return rate is None or random.random() < rate
+
+    return keep
+
+
+def text_line(record):
+    """FORMAT, rendered without going through loguru's formatter."""
+    line = f"{record['time']:%d-%m-%Y %I:%M:%S %p} {record['level'].name} {record['message']}\n"
+    if record["exception"] is not None:
+        line += "".join(traceback.format_exception(*record["exception"]))
+    return line
+
+
+def json_line(record):
+    """One compact JSON object per line; keyword arguments become fields."""
+    entry = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "module": record["module"],
+        "function": record["function"],
+        "line": record["line"],
+        **record["extra"],
+    }
+    if record["exception"] is not None:
+        entry["exception"] = "".join(traceback.format_exception(*record["exception"]))
+    return json.dumps(entry, default=str) + "\n"
+
+
+def json_format(record):
+    # Loguru uses the returned string as a format template, so escape braces
+    # and anything that looks like a color tag
+    line = json_line(record).replace("{", "{{").replace("}", "}}")
+    return line.replace("<", "\\<")
+
+
+class RotatingFile:
+    """Log file that is moved aside and zipped once it reaches `max_bytes`."""
+
+    def __init__(self, path: str, max_bytes: int = ROTATION_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def write(self, text: str):
+        if self._size and self._size + len(text) > self.max_bytes:
+            self._rotate()
+        self._file.write(text)
+        self._size += len(text)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def _rotate(self):
+        self._file.close()
+        root, ext = os.path.splitext(self.path)
+        rotated = f"{root}.{datetime.now():%Y-%m-%d_%H-%M-%S_%f}{ext}"
+        os.replace(self.path, rotated)
+        with zipfile.ZipFile(f"{rotated}.zip", "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.write(rotated, os.path.basename(rotated))
+        os.remove(rotated)
+        self._open()
+
+
+class QueuedSink:
+    """Loguru sink that hands records to a writer thread.
+
+    The logging call only puts the record on an in-process queue; rendering
+    it with `render`, writing, flushing, rotating and zipping all happen on
+    the thread. Once `max_pending` records are waiting, callers wait for room
+    rather than losing records; how often that happened is counted.
+    """
+
+    def __init__(self, *streams, render=text_line, max_pending: int = 10000):
+        self.streams = streams
+        self.render = render
+        self._queue = queue.Queue(max_pending)
+        self._lock = threading.Lock()
+        self._stats = {"written": 0, "blocked": 0}
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, message):
+        try:
+            self._queue.put_nowait(message.record)
+        except queue.Full:
+            self._count("blocked")
+            self._queue.put(message.record)
+
+    def drain(self):
+        self._queue.join()
+
+    async def complete(self):
+        await asyncio.to_thread(self.drain)
+
+    def stop(self):
+        self._queue.put(None)
+        self._thread.join()
+        for stream in self.streams:
+            if isinstance(stream, RotatingFile):
+                stream.close()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["depth"] = self._queue.qsize()
+        return stats
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 1000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = batch[-1] is None
+            records = [record for record in batch if record is not None]
+            text = "".join(self.render(record) for record in records)
+            for stream in self.streams:
+                stream.write(text)
+                stream.flush()
+            self._count("written", len(records))
+            for _ in batch:
+                self._queue.task_done()
+            if stopping:
+                return
+
+
+log_sink = None
+
+
+def log_stats():
+    return log_sink.stats() if log_sink is not None else {}
+
+
+def configure(
+    level: str = LOG_LEVEL,
+    path: str = LOG_FILE,
+    structured: bool = LOG_JSON,
+    enqueue: bool = LOG_ENQUEUE,
+    stdout=LOG_STDOUT,
+    sample_rates: dict = None,
+):
+    """Replace the logger's sinks.
+
+    `stdout` may be True for sys.stdout, or another stream to write to.
+    With `enqueue`, stdout and the file are written by a QueuedSink;
+    otherwise each is written on the logging thread.
+    """
+    global log_sink
+    logger.remove()
+    log_sink = None
+    streams = [sys.stdout if stdout is True else stdout] if stdout else []
+    options = {
+        "level": level,
+        "format": json_format if structured else FORMAT,
+        "filter": sampler(sample_rates) if sample_rates else None,
+    }
+
+    if enqueue:
+        if path:
+            streams.append(RotatingFile(path))
+        log_sink = QueuedSink(
+            *streams,
+            render=json_line if structured else text_line,
+            max_pending=LOG_QUEUE_SIZE,
+        )
+        # The sink renders records itself; keep loguru's own formatting minimal
+        logger.add(log_sink, **{**options, "format": "{message}"})
+        return
 
+    for stream in streams:
+        logger.add(stream, **options)
+    if path:
+        logger.add(path, rotation=ROTATION_BYTES, compression="zip", **options)
 
-# Add a handler for logging to stdout (optional) with AM/PM time format
-logger.add(sys.stdout, format="{time:DD-MM-YYYY hh:mm:ss A} {level} {message}", level="INFO")
 
-# Add a handler for logging to 'app.log' with rotation and AM/PM time format
-logger.add("logs/app.log", format="{time:DD-MM-YYYY hh:mm:ss A} {level} {message}", level="INFO", rotation="10 MB", compression="zip")
+configure(sample_rates=parse_sample_rates(LOG_SAMPLE_RATES))
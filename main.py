@@ -1,12 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+from database.database import dispose_engines
+from logs.log_config import logger
+from src.utils.mailer import email_queue
+from src.utils.metrics import MetricsMiddleware
+from src.utils.otp_store import otp_store
+from src.utils.holds import hold_reaper
+from src.utils.passwords import password_hasher
 from src.routers.user import user_router
 from src.routers.flights import flight_router
 from src.routers.admin import admin_router
 from src.routers.booking import booking_router
-app = FastAPI()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    email_queue.start()
+    otp_store.start()
+    hold_reaper.start()
+    yield
+    await hold_reaper.stop()
+    await otp_store.stop()
+    await run_in_threadpool(email_queue.stop)
+    await run_in_threadpool(password_hasher.shutdown)
+    await dispose_engines()
+    await logger.complete()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
 
 
 app.include_router(user_router)
 app.include_router(flight_router)
 app.include_router(admin_router) 
-app.include_router(booking_router) 
\ No newline at end of file
+app.include_router(booking_router) 
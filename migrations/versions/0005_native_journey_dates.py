@@ -0,0 +1,193 @@
+"""native journey dates
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 15:12:40.318214
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from datetime import date, datetime
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Bookings used "na" for a journey time that has not been picked yet
+UNSET_TIME = "na"
+
+
+# Formats the free-form string columns were seen to hold, tried in order;
+# dates are read day first
+DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%Y/%m/%d", "%d.%m.%Y", "%d %b %Y")
+TIME_FORMATS = ("%H:%M", "%H:%M:%S", "%I:%M %p", "%I:%M%p", "%H.%M", "%H%M")
+
+
+def _plan(table_name, column_name, old_type, convert):
+    """{old value: new value} for every distinct value of the column.
+
+    Only reads, so it runs for every column before any DDL. Values `convert`
+    cannot read are returned separately instead of raising halfway.
+    """
+    table = sa.table(table_name, sa.column(column_name, old_type))
+    old = table.c[column_name]
+    values = op.get_bind().scalars(sa.select(old).distinct().where(old != None))
+    mapping, bad = {}, []
+    for value in values:
+        try:
+            mapping[value] = convert(value)
+        except ValueError:
+            bad.append(value)
+    return mapping, bad
+
+
+def _fill(table_name, column_name, old_type, new_type, mapping):
+    """Add `<column>_new` and write the converted values into it, one UPDATE
+    per distinct value. The conversion is done in Python so the same
+    migration runs on every backend, whatever its casting rules are."""
+    with op.batch_alter_table(table_name, schema=None) as batch_op:
+        batch_op.add_column(sa.Column(f"{column_name}_new", new_type, nullable=True))
+
+    table = sa.table(
+        table_name,
+        sa.column(column_name, old_type),
+        sa.column(f"{column_name}_new", new_type),
+    )
+    old, new = table.c[column_name], table.c[f"{column_name}_new"]
+    connection = op.get_bind()
+    for value, converted in mapping.items():
+        connection.execute(table.update().where(old == value).values({new: converted}))
+
+
+def _swap(table_name, *column_names):
+    with op.batch_alter_table(table_name, schema=None) as batch_op:
+        for column_name in column_names:
+            batch_op.drop_column(column_name)
+            batch_op.alter_column(f"{column_name}_new", new_column_name=column_name)
+
+
+def _parse(value, formats, parse):
+    value = " ".join(value.split())
+    for format in formats:
+        try:
+            return parse(datetime.strptime(value, format))
+        except ValueError:
+            pass
+    raise ValueError(value)
+
+
+def _to_date(value):
+    return _parse(value, DATE_FORMATS, datetime.date)
+
+
+def _to_time(value):
+    if value.strip().lower() == UNSET_TIME:
+        return None
+    return _parse(value.upper(), TIME_FORMATS, datetime.time)
+
+
+STRING_COLUMNS = (
+    ("flights", "journey_date", sa.String(), sa.Date(), _to_date),
+    ("flights", "journey_time", sa.String(length=5), sa.Time(), _to_time),
+    ("bookings", "journey_date", sa.String(), sa.Date(), _to_date),
+    ("bookings", "journey_time", sa.String(length=5), sa.Time(), _to_time),
+)
+
+
+def upgrade() -> None:
+    # Every value is parsed before the schema is touched: SQLite DDL is not
+    # transactional, so failing halfway would leave the tables half migrated
+    plans, unreadable = [], []
+    for table_name, column_name, old_type, new_type, convert in STRING_COLUMNS:
+        mapping, bad = _plan(table_name, column_name, old_type, convert)
+        plans.append((table_name, column_name, old_type, new_type, mapping))
+        unreadable += [f"{table_name}.{column_name}={value!r}" for value in bad]
+    if unreadable:
+        raise RuntimeError(
+            "Cannot read these journey dates/times; fix them and rerun: "
+            + ", ".join(unreadable)
+        )
+
+    for plan in plans:
+        _fill(*plan)
+
+    with op.batch_alter_table("flights", schema=None) as batch_op:
+        batch_op.drop_index("ix_flights_route_date_time")
+        batch_op.drop_index("ix_flights_name_date_time")
+    with op.batch_alter_table("bookings", schema=None) as batch_op:
+        batch_op.drop_index("ix_bookings_journey_date")
+    _swap("flights", "journey_date", "journey_time")
+    _swap("bookings", "journey_date", "journey_time")
+
+    with op.batch_alter_table("flights", schema=None) as batch_op:
+        batch_op.alter_column("journey_date", existing_type=sa.Date(), nullable=False)
+        batch_op.alter_column("journey_time", existing_type=sa.Time(), nullable=False)
+        batch_op.create_index(
+            "ix_flights_route_departure",
+            ["start_point", "end_point", "journey_date", "journey_time"],
+            unique=False,
+        )
+        batch_op.create_index(
+            "ix_flights_name_date_time",
+            ["flight_name", "journey_date", "journey_time"],
+            unique=False,
+        )
+    with op.batch_alter_table("bookings", schema=None) as batch_op:
+        batch_op.alter_column("journey_date", existing_type=sa.Date(), nullable=False)
+        batch_op.create_index(
+            "ix_bookings_journey_date", ["journey_date"], unique=False
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("flights", schema=None) as batch_op:
+        batch_op.drop_index("ix_flights_route_departure")
+        batch_op.drop_index("ix_flights_name_date_time")
+    with op.batch_alter_table("bookings", schema=None) as batch_op:
+        batch_op.drop_index("ix_bookings_journey_date")
+
+    to_string = lambda value: value.strftime("%H:%M")
+    for table_name in ("flights", "bookings"):
+        for column_name, old_type, new_type, convert in (
+            ("journey_date", sa.Date(), sa.String(), date.isoformat),
+            ("journey_time", sa.Time(), sa.String(length=5), to_string),
+        ):
+            mapping, _ = _plan(table_name, column_name, old_type, convert)
+            _fill(table_name, column_name, old_type, new_type, mapping)
+        _swap(table_name, "journey_date", "journey_time")
+
+    bookings = sa.table("bookings", sa.column("journey_time", sa.String(length=5)))
+    op.execute(
+        bookings.update()
+        .where(bookings.c.journey_time == None)
+        .values(journey_time=UNSET_TIME)
+    )
+
+    with op.batch_alter_table("flights", schema=None) as batch_op:
+        batch_op.alter_column("journey_date", existing_type=sa.String(), nullable=False)
+        batch_op.alter_column(
+            "journey_time", existing_type=sa.String(length=5), nullable=False
+        )
+        batch_op.create_index(
+            "ix_flights_route_date_time",
+            ["journey_date", "start_point", "end_point", "journey_time"],
+            unique=False,
+        )
+        batch_op.create_index(
+            "ix_flights_name_date_time",
+            ["flight_name", "journey_date", "journey_time"],
+            unique=False,
+        )
+    with op.batch_alter_table("bookings", schema=None) as batch_op:
+        batch_op.alter_column("journey_date", existing_type=sa.String(), nullable=False)
+        batch_op.alter_column(
+            "journey_time", existing_type=sa.String(length=5), nullable=False
+        )
+        batch_op.create_index(
+            "ix_bookings_journey_date", ["journey_date"], unique=False
+        )
@@ -0,0 +1,147 @@
+"""status columns
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 14:37:19.467685
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10000
+
+
+def backfill(table: str, key: str, assignments: str, pending: str):
+    """Run `UPDATE table SET assignments` over the rows matching `pending`,
+    BATCH_SIZE rows per statement, committing after each batch so a large
+    table is never locked by one long transaction.
+
+    Each batch's keys are selected first: MySQL does not allow LIMIT in an
+    IN subquery."""
+    connection = op.get_bind()
+    update = sa.text(f"UPDATE {table} SET {assignments} WHERE {key} IN :keys")
+    update = update.bindparams(sa.bindparam("keys", expanding=True))
+    with op.get_context().autocommit_block():
+        while True:
+            keys = connection.scalars(
+                sa.text(f"SELECT {key} FROM {table} WHERE {pending} LIMIT {BATCH_SIZE}")
+            ).all()
+            if keys:
+                connection.execute(update, {"keys": keys})
+            if len(keys) < BATCH_SIZE:
+                break
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("bookings", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("status", sa.String(length=20), nullable=True))
+
+    with op.batch_alter_table("users", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("status", sa.String(length=20), nullable=True))
+
+    backfill(
+        "bookings",
+        "booking_id",
+        "status = CASE WHEN is_canceled THEN 'cancelled' "
+        "WHEN is_booked THEN 'confirmed' ELSE 'draft' END",
+        "status IS NULL",
+    )
+    backfill(
+        "users",
+        "id",
+        "status = CASE WHEN is_deleted OR NOT is_active THEN 'deleted' "
+        "WHEN is_verified THEN 'active' ELSE 'unverified' END",
+        "status IS NULL",
+    )
+
+    with op.batch_alter_table("bookings", schema=None) as batch_op:
+        batch_op.alter_column(
+            "status", existing_type=sa.String(length=20), nullable=False
+        )
+        batch_op.create_check_constraint(
+            "check_booking_status", "status IN ('draft', 'confirmed', 'cancelled')"
+        )
+        batch_op.drop_index("ix_bookings_hold_expiry")
+        batch_op.create_index(
+            "ix_bookings_confirmed_flight",
+            ["flight_id"],
+            unique=False,
+            sqlite_where=sa.text("status = 'confirmed'"),
+            postgresql_where=sa.text("status = 'confirmed'"),
+        )
+        batch_op.create_index(
+            "ix_bookings_draft_hold_expiry",
+            ["hold_expires_at"],
+            unique=False,
+            sqlite_where=sa.text("status = 'draft'"),
+            postgresql_where=sa.text("status = 'draft'"),
+        )
+        batch_op.drop_column("is_canceled")
+        batch_op.drop_column("is_booked")
+        batch_op.drop_column("in_process")
+
+    with op.batch_alter_table("users", schema=None) as batch_op:
+        batch_op.alter_column(
+            "status", existing_type=sa.String(length=20), nullable=False
+        )
+        batch_op.create_check_constraint(
+            "check_user_status", "status IN ('unverified', 'active', 'deleted')"
+        )
+        batch_op.create_index("ix_users_status_id", ["status", "id"], unique=False)
+        batch_op.drop_column("is_deleted")
+        batch_op.drop_column("is_verified")
+        batch_op.drop_column("is_active")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("is_active", sa.BOOLEAN(), nullable=True))
+        batch_op.add_column(sa.Column("is_verified", sa.BOOLEAN(), nullable=True))
+        batch_op.add_column(sa.Column("is_deleted", sa.BOOLEAN(), nullable=True))
+
+    with op.batch_alter_table("bookings", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("in_process", sa.BOOLEAN(), nullable=True))
+        batch_op.add_column(sa.Column("is_booked", sa.BOOLEAN(), nullable=True))
+        batch_op.add_column(sa.Column("is_canceled", sa.BOOLEAN(), nullable=True))
+
+    backfill(
+        "users",
+        "id",
+        "is_active = (status <> 'deleted'), is_verified = (status = 'active'), "
+        "is_deleted = (status = 'deleted')",
+        "is_active IS NULL",
+    )
+    backfill(
+        "bookings",
+        "booking_id",
+        "in_process = (status = 'draft'), is_booked = (status <> 'draft'), "
+        "is_canceled = (status = 'cancelled')",
+        "in_process IS NULL",
+    )
+
+    with op.batch_alter_table("users", schema=None) as batch_op:
+        for column in ("is_active", "is_verified", "is_deleted"):
+            batch_op.alter_column(column, existing_type=sa.BOOLEAN(), nullable=False)
+        batch_op.drop_index("ix_users_status_id")
+        batch_op.drop_constraint("check_user_status", type_="check")
+        batch_op.drop_column("status")
+
+    with op.batch_alter_table("bookings", schema=None) as batch_op:
+        for column in ("in_process", "is_booked", "is_canceled"):
+            batch_op.alter_column(column, existing_type=sa.BOOLEAN(), nullable=False)
+        batch_op.drop_index("ix_bookings_draft_hold_expiry")
+        batch_op.drop_index("ix_bookings_confirmed_flight")
+        batch_op.drop_constraint("check_booking_status", type_="check")
+        batch_op.create_index(
+            "ix_bookings_hold_expiry", ["in_process", "hold_expires_at"], unique=False
+        )
+        batch_op.drop_column("status")
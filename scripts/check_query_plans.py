@@ -0,0 +1,159 @@
+"""Check that every hot query is answered from an index.
+
+Each query shape used by the routers is run through the database's EXPLAIN
+and the plan is checked for an index lookup instead of a full table scan.
+Without DB_URL a throwaway SQLite database is built from the migrations, so
+this also checks that `alembic upgrade head` creates the indexes.
+
+    python -m scripts.check_query_plans
+    DB_URL=postgresql://... python -m scripts.check_query_plans
+"""
+
+import os
+import sys
+import tempfile
+
+if "DB_URL" not in os.environ:
+    os.environ["DB_URL"] = f"sqlite:///{tempfile.mkdtemp()}/plans.db"
+    FRESH = True
+else:
+    FRESH = False
+
+from alembic import command
+from datetime import date, datetime, time
+from alembic.config import Config
+from sqlalchemy import func, select, text
+from database.database import engine
+from logs.log_config import logger
+from src.models.booking import Booking, CONFIRMED, DRAFT, WaitlistEntry
+from src.models.flights import Flight
+from src.models.user import User, OTP, ACTIVE
+from src.utils.states import in_state
+
+logger.remove()
+
+HOT_QUERIES = {
+    "Get_Available_Flights": select(Flight).where(
+        Flight.journey_date == date(2030, 1, 1),
+        Flight.start_point == "X",
+        Flight.end_point == "Y",
+        Flight.is_cancelled == False,
+    ),
+    "Select_Time": select(Flight).where(
+        Flight.journey_date == date(2030, 1, 1),
+        Flight.start_point == "X",
+        Flight.end_point == "Y",
+        Flight.journey_time == time(10, 0),
+        Flight.is_cancelled == False,
+    ),
+    "Search_Flights": select(Flight)
+    .where(
+        Flight.start_point == "X",
+        Flight.end_point == "Y",
+        Flight.journey_date.between(date(2030, 1, 1), date(2030, 1, 31)),
+        Flight.journey_time >= time(6, 0),
+        Flight.available_capacity >= 1,
+        Flight.is_cancelled == False,
+    )
+    .order_by(Flight.journey_date, Flight.journey_time),
+    "Fare_Calendar": select(Flight.journey_date, func.min(Flight.flight_price))
+    .where(
+        Flight.start_point == "X",
+        Flight.end_point == "Y",
+        Flight.journey_date.between(date(2029, 12, 29), date(2030, 1, 4)),
+        Flight.available_capacity > 0,
+        Flight.is_cancelled == False,
+    )
+    .group_by(Flight.journey_date),
+    "connection_graph_day": select(Flight).where(
+        Flight.journey_date == date(2030, 1, 1), Flight.is_cancelled == False
+    ),
+    "search_for_copy": select(Flight).where(
+        Flight.flight_name == "F1",
+        Flight.journey_date == date(2030, 1, 1),
+        Flight.journey_time == time(10, 0),
+    ),
+    "verify_otp": select(OTP).where(
+        OTP.email == "a@ex.com",
+        OTP.purpose == "payment",
+        OTP.otp == "1234",
+        OTP.expires_at > datetime(2030, 1, 1),
+    ),
+    "otp_sweep": select(OTP.id).where(OTP.expires_at <= datetime(2030, 1, 1)),
+    "hold_reaper": select(Booking.booking_id).where(
+        in_state(Booking.status, DRAFT),
+        Booking.hold_expires_at <= datetime(2030, 1, 1),
+    ),
+    "confirmed_by_flight": select(Booking.booking_id).where(
+        in_state(Booking.status, CONFIRMED), Booking.flight_id == "F1"
+    ),
+    "waitlist_head": select(WaitlistEntry.position, Booking.email)
+    .join(Booking, Booking.booking_id == WaitlistEntry.booking_id)
+    .where(
+        WaitlistEntry.flight_id == "F1",
+        WaitlistEntry.seats == 2,
+        WaitlistEntry.position > 0,
+    )
+    .order_by(WaitlistEntry.position)
+    .limit(1),
+    "waitlist_largest_party": select(func.max(WaitlistEntry.seats)).where(
+        WaitlistEntry.flight_id == "F1"
+    ),
+    "Sign_In": select(User).where(
+        User.email == "a@ex.com", in_state(User.status, ACTIVE)
+    ),
+    "Get_All_Users_Data": select(User.id)
+    .where(in_state(User.status, ACTIVE), User.id > "a")
+    .order_by(User.id),
+}
+
+
+def explain(connection, statement):
+    sql = str(
+        statement.compile(
+            dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+    dialect = connection.dialect.name
+
+    if dialect == "sqlite":
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        plan = "\n".join(row[-1] for row in rows)
+        return plan, "USING INDEX" in plan or "USING COVERING INDEX" in plan
+
+    if dialect == "postgresql":
+        # Tiny tables are cheaper to scan, so ask what the planner would use.
+        connection.execute(text("SET LOCAL enable_seqscan = off"))
+        rows = connection.execute(text(f"EXPLAIN {sql}")).all()
+        plan = "\n".join(row[0] for row in rows)
+        return plan, "Index" in plan
+
+    if dialect == "mysql":
+        rows = connection.execute(text(f"EXPLAIN {sql}")).mappings().all()
+        plan = "\n".join(str(dict(row)) for row in rows)
+        return plan, all(row["key"] for row in rows)
+
+    rows = connection.execute(text(f"EXPLAIN {sql}")).all()
+    return "\n".join(str(row) for row in rows), True
+
+
+def main():
+    if FRESH:
+        command.upgrade(Config("alembic.ini"), "head")
+
+    failed = []
+    with engine.begin() as connection:
+        for name, statement in HOT_QUERIES.items():
+            plan, uses_index = explain(connection, statement)
+            print(f"{'ok  ' if uses_index else 'SCAN'} {name}")
+            print("     " + plan.replace("\n", "\n     "))
+            if not uses_index:
+                failed.append(name)
+
+    if failed:
+        print(f"Queries without an index: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""Bulk-load a reproducible synthetic dataset for scale testing.
+
+Generates users, flights, bookings and OTPs from `--seed` and inserts them
+with batched Core ``insert()`` executemany calls, `--batch-size` rows per
+statement and transaction. The same arguments always produce the same rows,
+ids included.
+
+* Route popularity is skewed: routes are ranked at random and weighted
+  1 / rank ** `--skew`, so a few routes get most of the flights and, through
+  them, most of the bookings.
+* Bookings are a mix of confirmed, cancelled and unpaid drafts, some of
+  whose holds have already run out. Flight seat counts are reduced by the
+  confirmed bookings on them.
+* OTPs are split between email verification, password reset and payment,
+  and most of them have already expired, as they would be between sweeps.
+
+Load into an empty database, created from the models if its tables are
+missing (run ``alembic upgrade head`` first to get the migrated schema):
+
+    python -m scripts.seed_dataset --users 1000000 --flights 200000 --bookings 10000000
+    DB_URL=postgresql://... python -m scripts.seed_dataset --bookings 1000000
+
+Without DB_URL a throwaway SQLite file is used.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, time as clock, timedelta
+
+if "DB_URL" not in os.environ:
+    os.environ["DB_URL"] = f"sqlite:///{tempfile.mkdtemp()}/seed.db"
+
+import numpy as np
+from sqlalchemy import insert
+
+from database.database import Base, engine
+from logs.log_config import logger
+from src.models.admin import Admin  # noqa: F401
+from src.models.booking import Booking, CANCELLED, CONFIRMED, DRAFT
+from src.models.flights import Flight
+from src.models.user import ACTIVE, DELETED, OTP, UNVERIFIED, User
+from src.utils.otp_store import RESET_PASSWORD, VERIFY_EMAIL, payment_purpose
+from src.utils.passwords import pwd_context
+
+logger.remove()
+
+PASSWORD = "password123"
+BASE_CAPACITY = 180
+INFANT_FARE = 5000
+# Shares of confirmed and cancelled bookings; the rest are unpaid drafts
+CONFIRMED_SHARE, CANCELLED_SHARE = 0.7, 0.1
+OTP_TTL = timedelta(minutes=5)
+
+
+class Ids:
+    """Deterministic UUID strings: the n-th id of a kind is the same every run."""
+
+    def __init__(self, rng: np.random.Generator):
+        self.base = int(rng.integers(1, 2**62)) << 64
+
+    def __call__(self, indexes):
+        base = self.base
+        return [str(uuid.UUID(int=base + n)) for n in indexes]
+
+
+def route_weights(airports: int, skew: float, rng: np.random.Generator):
+    origins, destinations = np.divmod(np.arange(airports * airports), airports)
+    keep = origins != destinations
+    origins, destinations = origins[keep], destinations[keep]
+    ranks = rng.permutation(len(origins)) + 1
+    weights = 1 / ranks.astype(float) ** skew
+    return origins, destinations, weights / weights.sum()
+
+
+def load(table, total: int, batch_size: int, rows_for):
+    """Insert `total` rows of `table`, built `batch_size` at a time by `rows_for`.
+
+    Secondary indexes are dropped for the load and rebuilt afterwards, which
+    is much cheaper than updating them row by row.
+    """
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        if engine.dialect.name == "sqlite":
+            connection.exec_driver_sql("PRAGMA synchronous=OFF")
+            connection.exec_driver_sql("PRAGMA journal_mode=MEMORY")
+        for index in table.indexes:
+            index.drop(connection, checkfirst=True)
+        connection.commit()
+
+        for start in range(0, total, batch_size):
+            stop = min(start + batch_size, total)
+            connection.execute(insert(table), rows_for(start, stop))
+            connection.commit()
+            rate = stop / (time.perf_counter() - started)
+            print(
+                f"\r{table.name}: {stop:,}/{total:,} ({rate:,.0f} rows/s)",
+                end="",
+                file=sys.stderr,
+            )
+        print(f"\r{table.name}: rebuilding indexes", end="", file=sys.stderr)
+        for index in table.indexes:
+            index.create(connection)
+        connection.commit()
+    print(file=sys.stderr)
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": total,
+        "seconds": round(elapsed, 1),
+        "rows_per_s": round(total / elapsed) if elapsed else None,
+    }
+
+
+def seed(args):
+    rng = np.random.default_rng(args.seed)
+    user_ids, flight_ids, booking_ids, otp_ids = (Ids(rng) for _ in range(4))
+    now = datetime.now().replace(microsecond=0)
+    first_day = date.fromisoformat(args.start_date)
+
+    # Flights: popular routes get more of them
+    origins, destinations, weights = route_weights(args.airports, args.skew, rng)
+    route = rng.choice(len(weights), size=args.flights, p=weights)
+    airports = [f"AP{n:04d}" for n in range(args.airports)]
+    days = [first_day + timedelta(days=n) for n in range(args.days)]
+    slots = [clock(n // 12, n % 12 * 5) for n in range(24 * 12)]
+    flight_start = [airports[n] for n in origins[route].tolist()]
+    flight_end = [airports[n] for n in destinations[route].tolist()]
+    flight_day = [days[n] for n in rng.integers(0, args.days, args.flights).tolist()]
+    flight_slot = rng.integers(0, len(slots), args.flights).tolist()
+    flight_time = [slots[n] for n in flight_slot]
+    flight_price = (rng.integers(20, 400, args.flights) * 50.0).tolist()
+    flight_id = flight_ids(range(args.flights))
+
+    # Bookings follow route popularity through the flights they pick
+    flight_weights = weights[route] / weights[route].sum()
+    booked_flight = rng.choice(args.flights, size=args.bookings, p=flight_weights)
+    booked_user = rng.integers(0, args.users, args.bookings)
+    adults = rng.choice(4, size=args.bookings, p=[0.6, 0.25, 0.1, 0.05]) + 1
+    children = rng.choice(3, size=args.bookings, p=[0.7, 0.2, 0.1])
+    infants = rng.choice(2, size=args.bookings, p=[0.9, 0.1])
+    state = rng.random(args.bookings)
+    confirmed = state < CONFIRMED_SHARE
+    cancelled = (state >= CONFIRMED_SHARE) & (state < CONFIRMED_SHARE + CANCELLED_SHARE)
+    draft = ~(confirmed | cancelled)
+    # Half of the drafts have not picked a departure time yet
+    picked = ~draft | (rng.random(args.bookings) < 0.5)
+    booked_ago = rng.integers(60, 90 * 24 * 60, args.bookings)
+    cancelled_after = rng.integers(60, 7 * 24 * 60, args.bookings)
+    hold_left = rng.integers(-args.hold_seconds, args.hold_seconds, args.bookings)
+
+    seats = adults + children
+    sold = np.bincount(
+        booked_flight[confirmed], weights=seats[confirmed], minlength=args.flights
+    ).astype(int)
+    capacity = np.maximum(BASE_CAPACITY, sold)
+    available = (capacity - sold).tolist()
+
+    # Every user gets the same password hash; bcrypt per row would dominate
+    hashed = pwd_context.hash(PASSWORD)
+    verified = rng.random(args.users) < 0.95
+    deleted = rng.random(args.users) < 0.01
+    joined_ago = rng.integers(0, 365 * 24 * 60, args.users)
+
+    # OTPs cycle through verification, reset and payment, so (email, purpose)
+    # stays unique; most have expired and are waiting for the sweeper
+    otps = min(args.otps, 3 * args.users, 3 * args.bookings)
+    otp_codes = rng.integers(0, 1_000_000, otps)
+    otp_left = rng.integers(-24 * 3600, int(OTP_TTL.total_seconds()), otps)
+
+    def user_rows(start, stop):
+        return [
+            {
+                "id": user_id,
+                "first_name": f"First{n}",
+                "last_name": f"Last{n}",
+                "password": hashed,
+                "email": f"user{n}@example.com",
+                "phone_no": f"+1{n:010d}",
+                "status": (
+                    DELETED if is_deleted else ACTIVE if is_verified else UNVERIFIED
+                ),
+                "is_created": now - timedelta(minutes=ago),
+                "is_modified": now - timedelta(minutes=ago),
+            }
+            for n, user_id, is_verified, is_deleted, ago in zip(
+                range(start, stop),
+                user_ids(range(start, stop)),
+                verified[start:stop].tolist(),
+                deleted[start:stop].tolist(),
+                joined_ago[start:stop].tolist(),
+            )
+        ]
+
+    def flight_rows(start, stop):
+        return [
+            {
+                "flight_id": flight_id[n],
+                "flight_name": f"SF{n}",
+                "start_point": flight_start[n],
+                "end_point": flight_end[n],
+                "journey_date": flight_day[n],
+                "journey_time": flight_time[n],
+                "available_capacity": available[n],
+                "flight_price": flight_price[n],
+                "duration_minutes": 60 + flight_slot[n] % 8 * 30,
+                "is_cancelled": False,
+            }
+            for n in range(start, stop)
+        ]
+
+    def booking_rows(start, stop):
+        rows = []
+        for (
+            booking_id,
+            user_id,
+            flight,
+            user,
+            adult,
+            child,
+            infant,
+            is_confirmed,
+            is_cancelled,
+            has_flight,
+            ago,
+            after,
+            left,
+        ) in zip(
+            booking_ids(range(start, stop)),
+            user_ids(booked_user[start:stop].tolist()),
+            booked_flight[start:stop].tolist(),
+            booked_user[start:stop].tolist(),
+            adults[start:stop].tolist(),
+            children[start:stop].tolist(),
+            infants[start:stop].tolist(),
+            confirmed[start:stop].tolist(),
+            cancelled[start:stop].tolist(),
+            picked[start:stop].tolist(),
+            booked_ago[start:stop].tolist(),
+            cancelled_after[start:stop].tolist(),
+            hold_left[start:stop].tolist(),
+        ):
+            is_draft = not (is_confirmed or is_cancelled)
+            booked_at = None if is_draft else now - timedelta(minutes=ago)
+            bill = (adult + child) * flight_price[flight] + infant * INFANT_FARE
+            rows.append(
+                {
+                    "booking_id": booking_id,
+                    "flight_id": flight_id[flight] if has_flight else None,
+                    "flight_name": f"SF{flight}" if has_flight else None,
+                    "user_id": user_id,
+                    "first_name": f"First{user}",
+                    "last_name": f"Last{user}",
+                    "email": f"user{user}@example.com",
+                    "phone_no": f"+1{user:010d}",
+                    "journey_date": flight_day[flight],
+                    "start_point": flight_start[flight],
+                    "end_point": flight_end[flight],
+                    "no_of_adults": adult,
+                    "no_of_children": child,
+                    "no_of_infants": infant,
+                    "journey_time": flight_time[flight] if has_flight else None,
+                    "bill_amount": bill if has_flight else 0.0,
+                    "booked_at": booked_at,
+                    "canceled_at": (
+                        booked_at + timedelta(minutes=after) if is_cancelled else None
+                    ),
+                    "hold_expires_at": (
+                        now + timedelta(seconds=left) if is_draft else None
+                    ),
+                    "status": (
+                        CANCELLED
+                        if is_cancelled
+                        else CONFIRMED if is_confirmed else DRAFT
+                    ),
+                }
+            )
+        return rows
+
+    def otp_rows(start, stop):
+        rows = []
+        for n, otp_id, code, left in zip(
+            range(start, stop),
+            otp_ids(range(start, stop)),
+            otp_codes[start:stop].tolist(),
+            otp_left[start:stop].tolist(),
+        ):
+            kind, index = n % 3, n // 3
+            if kind == 2:
+                user = int(booked_user[index])
+                purpose = payment_purpose(booking_ids((index,))[0])
+            else:
+                user = index
+                purpose = VERIFY_EMAIL if kind == 0 else RESET_PASSWORD
+            expires_at = now + timedelta(seconds=left)
+            rows.append(
+                {
+                    "id": otp_id,
+                    "user_id": user_ids((user,))[0],
+                    "email": f"user{user}@example.com",
+                    "otp": f"{code:06d}",
+                    "purpose": purpose,
+                    "created_at": expires_at - OTP_TTL,
+                    "expires_at": expires_at,
+                }
+            )
+        return rows
+
+    Base.metadata.create_all(engine)
+    return {
+        "seed": args.seed,
+        "users": load(User.__table__, args.users, args.batch_size, user_rows),
+        "flights": load(Flight.__table__, args.flights, args.batch_size, flight_rows),
+        "bookings": load(
+            Booking.__table__, args.bookings, args.batch_size, booking_rows
+        ),
+        "otps": load(OTP.__table__, otps, args.batch_size, otp_rows),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--flights", type=int, default=50_000)
+    parser.add_argument("--bookings", type=int, default=1_000_000)
+    parser.add_argument("--otps", type=int, default=100_000)
+    parser.add_argument("--airports", type=int, default=200)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--start-date", default="2030-01-01")
+    parser.add_argument("--skew", type=float, default=1.1)
+    parser.add_argument("--hold-seconds", type=int, default=900)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    summary = seed(args)
+    summary["seconds"] = round(time.perf_counter() - started, 1)
+    summary["database"] = engine.url.render_as_string(hide_password=True)
+    print(json.dumps(summary, indent=2))
@@ -1,15 +1,34 @@
 from sqlalchemy import (
     Column,
     String,
-    Boolean,
+    Date,
     DateTime,
     Integer,
+    Time,
     Float,
     ForeignKey,
     CheckConstraint,
+    Index,
+    text,
 )
 from sqlalchemy.orm import relationship
 from database.database import Base
+from datetime import datetime
+
+# Booking lifecycle. A draft holds the passenger details until it is paid for
+# (or reaped once its hold runs out). A draft paid for on a full flight waits
+# in the flight's waitlist until seats free up; confirmed and waitlisted
+# bookings can be cancelled.
+DRAFT = "draft"
+WAITLISTED = "waitlisted"
+CONFIRMED = "confirmed"
+CANCELLED = "cancelled"
+BOOKING_TRANSITIONS = {
+    DRAFT: {CONFIRMED, WAITLISTED},
+    WAITLISTED: {CONFIRMED, CANCELLED},
+    CONFIRMED: {CANCELLED},
+    CANCELLED: set(),
+}
 
 
 class Booking(Base):
@@ -23,19 +42,19 @@ class Booking(Base):
     last_name = Column(String(100), nullable=False)
     email = Column(String(255), nullable=False)
     phone_no = Column(String(15), nullable=False)
-    journey_date = Column(String, nullable=False, index=True)
+    journey_date = Column(Date, nullable=False, index=True)
     start_point = Column(String(100), nullable=False)
     end_point = Column(String(100), nullable=False)
     no_of_adults = Column(Integer, default=0)
     no_of_children = Column(Integer, default=0)
     no_of_infants = Column(Integer, default=0)
-    journey_time = Column(String(5), default="na", nullable=False)
+    journey_time = Column(Time, default=None, nullable=True)
     bill_amount = Column(Float, default=0.0, nullable=False)
     booked_at = Column(DateTime, default=None, nullable=True)
     canceled_at = Column(DateTime, default=None, nullable=True)
-    in_process = Column(Boolean, default=True, nullable=False)
-    is_booked = Column(Boolean, default=False, nullable=False)
-    is_canceled = Column(Boolean, default=False, nullable=False)
+    hold_expires_at = Column(DateTime, default=None, nullable=True)
+    seat_numbers = Column(String(255), default=None, nullable=True)
+    status = Column(String(20), default=DRAFT, nullable=False)
 
     flights = relationship("Flight", back_populates="bookings")
     users = relationship("User", back_populates="bookings")
@@ -44,6 +63,42 @@ class Booking(Base):
         CheckConstraint("no_of_adults >= 0", name="check_no_of_adults_positive"),
         CheckConstraint("no_of_children >= 0", name="check_no_of_children_positive"),
         CheckConstraint("no_of_infants >= 0", name="check_no_of_infants_positive"),
+        CheckConstraint(
+            "status IN ('draft', 'waitlisted', 'confirmed', 'cancelled')",
+            name="check_booking_status",
+        ),
+        Index(
+            "ix_bookings_draft_hold_expiry",
+            "hold_expires_at",
+            sqlite_where=text("status = 'draft'"),
+            postgresql_where=text("status = 'draft'"),
+        ),
+        Index(
+            "ix_bookings_confirmed_flight",
+            "flight_id",
+            sqlite_where=text("status = 'confirmed'"),
+            postgresql_where=text("status = 'confirmed'"),
+        ),
     )
 
 
+class WaitlistEntry(Base):
+    """A waitlisted booking's place in its flight's queue.
+
+    `position` only grows, so it orders the queue first come, first served;
+    the index lets promotion seek the head of the queue for each party size.
+    """
+
+    __tablename__ = "waitlist"
+
+    position = Column(Integer, primary_key=True, autoincrement=True)
+    flight_id = Column(String(36), ForeignKey("flights.flight_id"), nullable=False)
+    booking_id = Column(
+        String(36), ForeignKey("bookings.booking_id"), nullable=False, unique=True
+    )
+    seats = Column(Integer, nullable=False)
+    joined_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    __table_args__ = (
+        Index("ix_waitlist_flight_seats_position", "flight_id", "seats", "position"),
+    )
@@ -1,4 +1,15 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime
+from sqlalchemy import (
+    Column,
+    String,
+    Integer,
+    Float,
+    Boolean,
+    Date,
+    Time,
+    ForeignKey,
+    Index,
+    LargeBinary,
+)
 from sqlalchemy.orm import relationship
 from database.database import Base
 
@@ -12,12 +23,46 @@ class Flight(Base):
     flight_name = Column(String(255), nullable=False)
     start_point = Column(String(100), nullable=False)
     end_point = Column(String(100), nullable=False)
-    journey_date = Column(String, nullable=False)
-    journey_time = Column(String(5), nullable=False)
+    journey_date = Column(Date, nullable=False)
+    journey_time = Column(Time, nullable=False)
     available_capacity = Column(Integer, default=200, nullable=False)
     flight_price = Column(Float, default=15000.0, nullable=False)
+    duration_minutes = Column(Integer, default=120, nullable=False)
     is_cancelled = Column(Boolean, default=False, nullable=False)
 
     bookings = relationship(
         "Booking", back_populates="flights", cascade="all, delete-orphan"
     )
+
+    __table_args__ = (
+        Index(
+            "ix_flights_route_departure",
+            "start_point",
+            "end_point",
+            "journey_date",
+            "journey_time",
+        ),
+        Index(
+            "uq_flights_name_date_time",
+            "flight_name",
+            "journey_date",
+            "journey_time",
+            unique=True,
+        ),
+        Index("ix_flights_journey_date", "journey_date"),
+    )
+
+
+class FlightSeatMap(Base):
+    """Seat occupancy of one flight: bit n of `occupied` is seat n, counted
+    row by row across `layout` ("ABC-DEF" is six abreast, aisle after C)."""
+
+    __tablename__ = "flight_seat_maps"
+
+    flight_id = Column(
+        String(36), ForeignKey("flights.flight_id"), primary_key=True, nullable=False
+    )
+    layout = Column(String(32), nullable=False)
+    seat_count = Column(Integer, nullable=False)
+    occupied = Column(LargeBinary, nullable=False)
+    version = Column(Integer, default=0, nullable=False)
@@ -1,8 +1,14 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from database.database import Base
 from datetime import datetime
 
+# Account lifecycle: signed up, verified by OTP, then (softly) deleted
+UNVERIFIED = "unverified"
+ACTIVE = "active"
+DELETED = "deleted"
+USER_TRANSITIONS = {UNVERIFIED: {ACTIVE}, ACTIVE: {DELETED}, DELETED: set()}
+
 
 class User(Base):
     __tablename__ = "users"
@@ -13,16 +19,22 @@ class User(Base):
     password = Column(String(255), nullable=False)
     email = Column(String(255), nullable=False)
     phone_no = Column(String(15), nullable=False)
-    is_active = Column(Boolean, default=True, nullable=False)
-    is_verified = Column(Boolean, default=False, nullable=False)
+    status = Column(String(20), default=UNVERIFIED, nullable=False)
     is_created = Column(DateTime, default=datetime.now, nullable=False)
     is_modified = Column(
         DateTime, default=datetime.now, onupdate=datetime.now, nullable=False
     )
-    is_deleted = Column(Boolean, default=False, nullable=False)
 
     bookings = relationship("Booking", back_populates="users")
 
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('unverified', 'active', 'deleted')", name="check_user_status"
+        ),
+        Index("uq_users_email", "email", unique=True),
+        Index("ix_users_status_id", "status", "id"),
+    )
+
 
 class OTP(Base):
     __tablename__ = "otps"
@@ -31,3 +43,8 @@ class OTP(Base):
     user_id = Column(String(36), ForeignKey("users.id"), nullable=False)
     email = Column(String(255), nullable=False)
     otp = Column(String(6), nullable=False)
+    purpose = Column(String(50), nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    __table_args__ = (Index("uq_otps_email_purpose", "email", "purpose", unique=True),)
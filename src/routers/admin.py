@@ -1,5 +1,9 @@
-from fastapi import APIRouter, HTTPException, Header
-from database.database import SessionLocal
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import PAGE_SIZE_MAX
+from database.database import get_db, get_pool_stats
 from src.schemas.admin import (
     Staff_Register_Schema,
     Admin_Register_Schema,
@@ -8,22 +12,41 @@ from src.schemas.admin import (
 )
 from src.utils.admin import (
     pass_checker,
-    find_same_user,
+    commit_staff,
     get_token,
-    decode_token,
-    pwd_context,
 )
+from src.utils.listing import (
+    ProjectedJSONResponse,
+    columns,
+    keyset_page,
+    stream_ndjson,
+)
+from src.utils.mailer import email_queue
+from src.utils.metrics import metrics
+from src.utils.otp_store import otp_store
+from src.utils.holds import hold_reaper
+from src.utils.seats import seat_maps
+from src.utils.waitlist import waitlist
+from src.utils.route_cache import fare_cache, route_cache
+from src.utils.connections import connection_graph
+from src.utils.passwords import hash_password, password_hasher
 from src.models.admin import Admin
-from src.models.user import User
-from logs.log_config import logger
+from src.models.user import User, ACTIVE
+from src.utils.auth import require_metrics_token, require_staff, token_cache
+from src.utils.states import in_state
+from logs.log_config import log_stats, logger
+from typing import Optional
 import uuid
 
 admin_router = APIRouter()
-db = SessionLocal()
+
+ACTIVE_USER = (in_state(User.status, ACTIVE),)
 
 
 @admin_router.post("/register_admin")
-def Register_Admin(staff: Admin_Register_Schema):
+async def Register_Admin(
+    staff: Admin_Register_Schema, db: AsyncSession = Depends(get_db)
+):
     logger.info("Registering new admin.")
     if staff.key != "td":
         logger.error("Admin registration failed due to incorrect key.")
@@ -34,77 +57,68 @@ def Register_Admin(staff: Admin_Register_Schema):
         name=staff.name,
         user_name=staff.user_name,
         email=staff.email,
-        password=pwd_context.hash(staff.password),
+        password=await hash_password(staff.password),
         post=staff.post,
         key=staff.key,
     )
 
     db.add(new_staff)
-    db.commit()
-    db.refresh(new_staff)
+    await commit_staff(db, staff)
 
-    logger.success(f"Admin {staff.name} registered successfully.")
+    logger.success("Admin {name} registered successfully.", name=staff.name)
     return "Admin Registered"
 
 
 @admin_router.get("/staff_sign_in")
-def Staff_Sign_In(email: str, password: str):
-    logger.info(f"Login attempt for email: {email}")
-    find_staff = db.query(Admin).filter(Admin.email == email).first()
+async def Staff_Sign_In(email: str, password: str, db: AsyncSession = Depends(get_db)):
+    logger.info("Login attempt for email: {email}", email=email)
+    find_staff = await db.scalar(select(Admin).where(Admin.email == email))
 
     if not find_staff:
         logger.error("Invalid user during staff login.")
         raise HTTPException(status_code=400, detail="Invalid user")
 
-    pass_checker(password, find_staff.password)
+    await pass_checker(password, find_staff.password)
     access_token = get_token(find_staff.id, find_staff.post)
 
-    logger.success(f"Login successful for user: {find_staff.name}")
+    logger.success("Login successful for user: {name}", name=find_staff.name)
     return "Login successful", access_token
 
 
 @admin_router.post("/add_new_staff")
-def Add_New_Staff(staff: Staff_Register_Schema, token: str = Header(...)):
-    logger.info(f"Registering staff: {staff.name}")
-    user_details = decode_token(token)
-    id, post = user_details
-
-    if post not in ["admin", "manager"]:
-        logger.error("Access forbidden during staff registration.")
-        raise HTTPException(status_code=400, detail="Access forbidden")
-
-    find_same_user("email", staff.email)
-    find_same_user("user_name", staff.user_name)
+async def Add_New_Staff(
+    staff: Staff_Register_Schema,
+    user_details: tuple = Depends(require_staff("admin", "manager", status_code=400)),
+    db: AsyncSession = Depends(get_db),
+):
+    logger.info("Registering staff: {name}", name=staff.name)
 
     new_staff = Admin(
         id=str(uuid.uuid4()),
         name=staff.name,
         user_name=staff.user_name,
         email=staff.email,
-        password=pwd_context.hash(staff.password),
+        password=await hash_password(staff.password),
         post=staff.post,
     )
 
     db.add(new_staff)
-    db.commit()
-    db.refresh(new_staff)
+    await commit_staff(db, staff)
 
-    logger.success(f"Staff {staff.name} registered successfully.")
+    logger.success("Staff {name} registered successfully.", name=staff.name)
     return "Staff Registered Successfully"
 
 
-
 @admin_router.put("/update_staff/{staff_id}")
-def Update_Staff(staff_id: str, staff: Update_Staff_Schema, token: str = Header(...)):
-    logger.info(f"Updating staff with ID: {staff_id}")
-    user_details = decode_token(token)
-    id, post = user_details
-
-    if post not in ["admin", "manager"]:
-        logger.error("Access forbidden during staff update.")
-        raise HTTPException(status_code=400, detail="Access forbidden")
+async def Update_Staff(
+    staff_id: str,
+    staff: Update_Staff_Schema,
+    user_details: tuple = Depends(require_staff("admin", "manager", status_code=400)),
+    db: AsyncSession = Depends(get_db),
+):
+    logger.info("Updating staff with ID: {staff_id}", staff_id=staff_id)
 
-    existing_staff = db.query(Admin).filter(Admin.id == staff_id).first()
+    existing_staff = await db.scalar(select(Admin).where(Admin.id == staff_id))
 
     if not existing_staff:
         logger.error("Staff not found.")
@@ -114,65 +128,115 @@ def Update_Staff(staff_id: str, staff: Update_Staff_Schema, token: str = Header(
     existing_staff.user_name = staff.user_name
     existing_staff.email = staff.email
 
-    db.commit()
-    logger.success(f"Staff {existing_staff.name} updated successfully.")
+    await commit_staff(db, staff, staff_id)
+    logger.success("Staff {name} updated successfully.", name=existing_staff.name)
     return "Staff Updated Successfully"
 
 
 ####-------------------------------------------------------------------------------------------------####
 
 
-@admin_router.get("/get_all_users_data", response_model=list[Get_All_User_Schema])
-def Get_All_Users_Data(token: str = Header(...)):
+@admin_router.get(
+    "/get_all_users_data",
+    response_model=list[Get_All_User_Schema],
+    response_class=ProjectedJSONResponse,
+)
+async def Get_All_Users_Data(
+    limit: int = Query(100, ge=1, le=PAGE_SIZE_MAX),
+    after: Optional[str] = None,
+    user_details: tuple = Depends(require_staff("admin", status_code=400)),
+    db: AsyncSession = Depends(get_db),
+):
     logger.info("Fetching all active users.")
-    user_details = decode_token(token)
-    id, post = user_details
-
-    if post != "admin":
-        logger.error("Access forbidden during fetching users.")
-        raise HTTPException(status_code=400, detail="Access forbidden")
 
-    all_users = (
-        db.query(User)
-        .filter(
-            User.is_active == True, User.is_deleted == False, User.is_verified == True
-        )
-        .all()
+    all_users, cursor = await keyset_page(
+        db,
+        select(*columns(User, Get_All_User_Schema)).where(*ACTIVE_USER),
+        User.id,
+        after,
+        limit,
     )
-    if not all_users:
+    if not all_users and after is None:
         logger.error("No users found.")
         raise HTTPException(status_code=400, detail="No Users Found")
 
     logger.success("Active users data retrieved successfully.")
-    return all_users
+    return ProjectedJSONResponse(all_users, cursor=cursor)
+
+
+@admin_router.get("/export_all_users_data")
+async def Export_All_Users_Data(
+    user_details: tuple = Depends(require_staff("admin", status_code=400)),
+):
+    logger.info("Exporting all active users as NDJSON.")
+    return StreamingResponse(
+        stream_ndjson(
+            select(*columns(User, Get_All_User_Schema))
+            .where(*ACTIVE_USER)
+            .order_by(User.id)
+        ),
+        media_type="application/x-ndjson",
+    )
 
 
 @admin_router.get(
-    "/get_single_user_data/{user_email}", response_model=Get_All_User_Schema
+    "/get_single_user_data/{user_email}",
+    response_model=Get_All_User_Schema,
+    response_class=ProjectedJSONResponse,
 )
-def Get_Single_User_Data(user_email: str, token: str = Header(...)):
-    logger.info(f"Fetching user data for email: {user_email}.")
-    user_details = decode_token(token)
-    id, post = user_details
-
-    if post not in ["admin", "manager"]:
-        logger.error("Access forbidden during fetching user data.")
-        raise HTTPException(status_code=400, detail="Access forbidden")
+async def Get_Single_User_Data(
+    user_email: str,
+    user_details: tuple = Depends(require_staff("admin", "manager", status_code=400)),
+    db: AsyncSession = Depends(get_db),
+):
+    logger.info("Fetching user data for email: {user_email}.", user_email=user_email)
 
     find_user = (
-        db.query(User)
-        .filter(
-            User.email == user_email,
-            User.is_active == True,
-            User.is_deleted == False,
-            User.is_verified == True,
+        await db.execute(
+            select(*columns(User, Get_All_User_Schema)).where(
+                User.email == user_email, *ACTIVE_USER
+            )
         )
-        .first()
-    )
+    ).first()
 
     if not find_user:
-        logger.error(f"No user found with email: {user_email}.")
+        logger.error("No user found with email: {user_email}.", user_email=user_email)
         raise HTTPException(status_code=400, detail="User Not Found")
 
-    logger.success(f"User data for {user_email} retrieved successfully.")
-    return find_user
+    logger.success(
+        "User data for {user_email} retrieved successfully.", user_email=user_email
+    )
+    return ProjectedJSONResponse(find_user._asdict())
+
+
+@admin_router.get("/system_stats")
+async def System_Stats(
+    user_details: tuple = Depends(require_staff("admin", status_code=400))
+):
+    logger.info("Fetching system stats.")
+    return system_stats()
+
+
+@admin_router.get("/metrics", response_class=PlainTextResponse)
+async def Metrics(scraper: None = Depends(require_metrics_token)):
+    return PlainTextResponse(
+        metrics.render(system_stats()),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+def system_stats():
+    return {
+        "db_pool": get_pool_stats(),
+        "email_queue": email_queue.stats(),
+        "password_hasher": password_hasher.stats(),
+        "token_cache": token_cache.stats(),
+        "otp_store": otp_store.stats(),
+        "route_cache": route_cache.stats(),
+        "fare_cache": fare_cache.stats(),
+        "connection_graph": connection_graph.stats(),
+        "booking_holds": hold_reaper.stats(),
+        "seat_maps": seat_maps.stats(),
+        "waitlist": waitlist.stats(),
+        "logging": log_stats(),
+    }
@@ -1,28 +1,65 @@
-from fastapi import APIRouter, HTTPException, Header
-from database.database import SessionLocal
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_db
+from config import (
+    CONNECTION_MAX_LAYOVER,
+    CONNECTION_MIN_LAYOVER,
+    FARE_CALENDAR_MAX_DAYS,
+    PAGE_SIZE_MAX,
+)
 from src.schemas.booking import (
     Date_Route_Passengers_Select_Schema,
     Available_Flight_Schema,
+    Flight_Search_Schema,
+    Itinerary_Schema,
+    Fare_Calendar_Schema,
+    Seat_Map_Schema,
+    Best_Seats_Schema,
+)
+from src.utils.booking import (
+    generate_otp,
+    verify_otp,
+    reserve_seats,
+    release_seats,
+    flight_route,
 )
-from src.utils.booking import decode_token, generate_otp, verify_otp
+from src.utils.holds import hold_deadline, hold_expired
+from src.utils.pricing import fare_engine
+from src.utils.seats import seat_maps
+from src.utils.waitlist import waitlist
+from src.utils.listing import ProjectedJSONResponse
+from src.utils.route_cache import fare_calendar, route_flights
+from src.utils.events import flight_events
+from src.utils.connections import connection_graph
+from src.utils.states import transition
 from src.models.user import User
-from src.models.booking import Booking
+from src.models.booking import (
+    Booking,
+    BOOKING_TRANSITIONS,
+    DRAFT,
+    WAITLISTED,
+    CONFIRMED,
+    CANCELLED,
+)
 from src.models.flights import Flight
+from src.utils.auth import get_current_user
 from logs.log_config import logger
+from sqlalchemy import or_, select, update
 import uuid
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
+from typing import Literal, Optional
 
 booking_router = APIRouter()
-db = SessionLocal()
 
 
 
 @booking_router.post("/select_date_route_passengers")
-def Select_Date_Route_Passengers(
-    details: Date_Route_Passengers_Select_Schema, token: str = Header(...)
+async def Select_Date_Route_Passengers(
+    details: Date_Route_Passengers_Select_Schema,
+    user_details: tuple = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     logger.info("Starting the booking process for a user.")
-    user_details = decode_token(token)
     id, first_name, last_name, email, phone_no = user_details
 
     new_booking = Booking(
@@ -38,73 +75,240 @@ def Select_Date_Route_Passengers(
         no_of_adults=details.no_of_adults,
         no_of_children=details.no_of_children,
         no_of_infants=details.no_of_infants,
+        hold_expires_at=hold_deadline(),
     )
 
     db.add(new_booking)
-    db.commit()
-    db.refresh(new_booking)
+    await db.commit()
+    await db.refresh(new_booking)
 
-    logger.success(f"Booking details saved with ID: {new_booking.booking_id}")
+    logger.success(
+        "Booking details saved with ID: {booking_id}",
+        booking_id=new_booking.booking_id,
+    )
     return {"message": "Booking details saved", "booking_id": new_booking.booking_id}
 
 
-
-
 @booking_router.get(
-    "/get_available_flights", response_model=list[Available_Flight_Schema]
+    "/get_available_flights",
+    response_model=list[Available_Flight_Schema],
+    response_class=ProjectedJSONResponse,
 )
-def Get_Available_Flights(booking_id: str):
-    logger.info(f"Fetching available flights for booking ID: {booking_id}")
-    find_booking = db.query(Booking).filter(Booking.booking_id == booking_id).first()
+async def Get_Available_Flights(
+    booking_id: str, include_full: bool = False, db: AsyncSession = Depends(get_db)
+):
+    logger.info(
+        "Fetching available flights for booking ID: {booking_id}",
+        booking_id=booking_id,
+    )
+    find_booking = await db.scalar(
+        select(Booking).where(Booking.booking_id == booking_id)
+    )
 
     if not find_booking:
-        logger.error(f"No booking found for ID: {booking_id}")
+        logger.error("No booking found for ID: {booking_id}", booking_id=booking_id)
         raise HTTPException(status_code=404, detail="Booking not found")
 
-    find_flights = (
-        db.query(Flight)
-        .filter(
-            Flight.journey_date == find_booking.journey_date,
-            Flight.start_point == find_booking.start_point,
-            Flight.end_point == find_booking.end_point,
-            Flight.available_capacity
-            >= find_booking.no_of_adults + find_booking.no_of_children,
-        )
-        .all()
+    route = await route_flights(
+        db, find_booking.journey_date, find_booking.start_point, find_booking.end_point
     )
+    seats = find_booking.no_of_adults + find_booking.no_of_children
+    # Full flights are still offered, marked, for the party to join the waitlist
+    find_flights = [
+        flight
+        for flight in route
+        if include_full or flight["available_capacity"] >= seats
+    ]
 
     if not find_flights:
-        logger.warning(f"No flights available for criteria: {find_booking}")
+        logger.warning(
+            "No flights available for booking ID: {booking_id}", booking_id=booking_id
+        )
         raise HTTPException(status_code=400, detail="No flights available")
 
-    logger.success(f"Found {len(find_flights)} flights for booking ID: {booking_id}")
-    return find_flights
+    fares = fare_engine.quote(
+        [flight["flight_price"] for flight in find_flights],
+        [flight["available_capacity"] for flight in find_flights],
+        find_booking.no_of_adults,
+        find_booking.no_of_children,
+        find_booking.no_of_infants,
+    )
+    logger.success(
+        "Found {flights} flights for booking ID: {booking_id}",
+        flights=len(find_flights),
+        booking_id=booking_id,
+    )
+    return ProjectedJSONResponse(
+        [
+            {
+                "journey_date": flight["journey_date"],
+                "flight_name": flight["flight_name"],
+                "journey_time": flight["journey_time"],
+                "fare": fare,
+                "waitlist": flight["available_capacity"] < seats,
+            }
+            for flight, fare in zip(find_flights, fares.tolist())
+        ]
+    )
 
 
+@booking_router.get(
+    "/search_flights",
+    response_model=list[Flight_Search_Schema],
+    response_class=ProjectedJSONResponse,
+)
+async def Search_Flights(
+    start_point: str,
+    end_point: str,
+    from_date: date,
+    to_date: Optional[date] = None,
+    depart_after: Optional[time] = None,
+    depart_before: Optional[time] = None,
+    seats: int = Query(1, ge=1),
+    limit: int = Query(100, ge=1, le=PAGE_SIZE_MAX),
+    db: AsyncSession = Depends(get_db),
+):
+    to_date = to_date or from_date
+    if to_date < from_date:
+        raise HTTPException(status_code=400, detail="to_date is before from_date")
+
+    logger.info(
+        "Searching flights {start_point} -> {end_point} from {from_date} to {to_date}",
+        start_point=start_point,
+        end_point=end_point,
+        from_date=from_date,
+        to_date=to_date,
+    )
+    statement = select(
+        Flight.flight_name,
+        Flight.start_point,
+        Flight.end_point,
+        Flight.journey_date,
+        Flight.journey_time,
+        Flight.available_capacity,
+        Flight.flight_price,
+    ).where(
+        Flight.start_point == start_point,
+        Flight.end_point == end_point,
+        Flight.journey_date.between(from_date, to_date),
+        Flight.available_capacity >= seats,
+        Flight.is_cancelled == False,
+    )
+    if depart_after is not None:
+        statement = statement.where(Flight.journey_time >= depart_after)
+    if depart_before is not None:
+        statement = statement.where(Flight.journey_time <= depart_before)
+
+    rows = await db.execute(
+        statement.order_by(Flight.journey_date, Flight.journey_time).limit(limit)
+    )
+    find_flights = [dict(row._mapping) for row in rows]
+    fares = fare_engine.quote(
+        [flight["flight_price"] for flight in find_flights],
+        [flight["available_capacity"] for flight in find_flights],
+        seats,
+    )
+    return ProjectedJSONResponse(
+        [{**flight, "fare": fare} for flight, fare in zip(find_flights, fares.tolist())]
+    )
+
+
+@booking_router.get("/fare_calendar", response_model=list[Fare_Calendar_Schema])
+async def Fare_Calendar(
+    start_point: str,
+    end_point: str,
+    journey_date: date,
+    days: int = Query(3, ge=0, le=FARE_CALENDAR_MAX_DAYS),
+    db: AsyncSession = Depends(get_db),
+):
+    logger.info(
+        "Fare calendar {start_point} -> {end_point} for {journey_date} +/- {days} days",
+        start_point=start_point,
+        end_point=end_point,
+        journey_date=journey_date,
+        days=days,
+    )
+    return await fare_calendar(
+        db,
+        start_point,
+        end_point,
+        journey_date - timedelta(days=days),
+        journey_date + timedelta(days=days),
+    )
+
+
+@booking_router.get("/search_connections", response_model=list[Itinerary_Schema])
+async def Search_Connections(
+    start_point: str,
+    end_point: str,
+    journey_date: date,
+    seats: int = Query(1, ge=1),
+    sort_by: Literal["price", "arrival"] = "price",
+    max_stops: int = Query(2, ge=0, le=2),
+    min_layover: int = Query(CONNECTION_MIN_LAYOVER, ge=0),
+    max_layover: int = Query(CONNECTION_MAX_LAYOVER, ge=0, le=1440),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    if start_point == end_point:
+        raise HTTPException(status_code=400, detail="Start and end point are the same")
+    if max_layover < min_layover:
+        raise HTTPException(
+            status_code=400, detail="max_layover is shorter than min_layover"
+        )
+
+    logger.info(
+        "Searching connections {start_point} -> {end_point} on {journey_date}",
+        start_point=start_point,
+        end_point=end_point,
+        journey_date=journey_date,
+    )
+    itineraries = await connection_graph.search(
+        db,
+        start_point,
+        end_point,
+        journey_date,
+        seats=seats,
+        sort_by=sort_by,
+        limit=limit,
+        max_stops=max_stops,
+        min_layover=min_layover,
+        max_layover=max_layover,
+    )
+    logger.success("Found {itineraries} itineraries", itineraries=len(itineraries))
+    return itineraries
+
 
 @booking_router.post("/select_time")
-def Select_Time(booking_id: str, journey_time: str):
-    logger.info(f"Selecting journey time for booking ID: {booking_id}")
-    find_booking = db.query(Booking).filter(Booking.booking_id == booking_id).first()
+async def Select_Time(
+    booking_id: str, journey_time: time, db: AsyncSession = Depends(get_db)
+):
+    logger.info(
+        "Selecting journey time for booking ID: {booking_id}", booking_id=booking_id
+    )
+    find_booking = await db.scalar(
+        select(Booking).where(Booking.booking_id == booking_id)
+    )
 
     if not find_booking:
-        logger.error(f"No booking found for ID: {booking_id}")
+        logger.error("No booking found for ID: {booking_id}", booking_id=booking_id)
         raise HTTPException(status_code=404, detail="Booking not found")
 
-    find_flight = (
-        db.query(Flight)
-        .filter(
+    find_flight = await db.scalar(
+        select(Flight).where(
             Flight.journey_date == find_booking.journey_date,
             Flight.start_point == find_booking.start_point,
             Flight.end_point == find_booking.end_point,
             Flight.journey_time == journey_time,
+            Flight.is_cancelled == False,
         )
-        .first()
     )
 
     if not find_flight:
         logger.error(
-            f"No flight available at time: {journey_time} for booking ID: {booking_id}"
+            "No flight available at time: {journey_time} for booking ID: {booking_id}",
+            journey_time=journey_time,
+            booking_id=booking_id,
         )
         raise HTTPException(
             status_code=400, detail="Flight not available at the selected time"
@@ -114,103 +318,329 @@ def Select_Time(booking_id: str, journey_time: str):
     find_booking.flight_id = find_flight.flight_id
     find_booking.flight_name = find_flight.flight_name
 
-    db.commit()
-    db.refresh(find_booking)
+    await db.commit()
+    await db.refresh(find_booking)
     logger.success(
-        f"Journey time selected for booking ID: {booking_id}, flight ID: {find_flight.flight_id}"
+        "Journey time selected for booking ID: {booking_id}, flight ID: {flight_id}",
+        booking_id=booking_id,
+        flight_id=find_flight.flight_id,
     )
     return {"message": "Time selected", "flight_id": find_flight.flight_id}
 
 
+@booking_router.get(
+    "/seat_map/{flight_id}",
+    response_model=Seat_Map_Schema,
+    response_class=ProjectedJSONResponse,
+)
+async def Seat_Map(flight_id: str, db: AsyncSession = Depends(get_db)):
+    seat_map = await seat_maps.load(db, flight_id)
+    return ProjectedJSONResponse(seat_map.render())
 
-@booking_router.post("/send_payment_otp")
-def Send_Payment_Otp(booking_id: str):
-    logger.info(f"Initiating payment process for booking ID: {booking_id}")
-    find_booking = db.query(Booking).filter(Booking.booking_id == booking_id).first()
+
+@booking_router.get("/best_seats", response_model=Best_Seats_Schema)
+async def Best_Seats(booking_id: str, db: AsyncSession = Depends(get_db)):
+    logger.info("Finding seats for booking ID: {booking_id}", booking_id=booking_id)
+    find_booking = await db.scalar(
+        select(Booking).where(Booking.booking_id == booking_id)
+    )
 
     if not find_booking:
-        logger.error(f"No booking found for ID: {booking_id}")
+        logger.error("No booking found for ID: {booking_id}", booking_id=booking_id)
         raise HTTPException(status_code=404, detail="Booking not found")
 
-    find_flight = (
-        db.query(Flight).filter(Flight.flight_id == find_booking.flight_id).first()
+    if not find_booking.flight_id:
+        logger.error(
+            "No flight selected for booking ID: {booking_id}", booking_id=booking_id
+        )
+        raise HTTPException(status_code=400, detail="Flight not selected")
+
+    seat_map = await seat_maps.load(db, find_booking.flight_id)
+    seats = seat_map.best_block(find_booking.no_of_adults + find_booking.no_of_children)
+    if seats is None:
+        logger.warning(
+            "Not enough seats for booking ID: {booking_id}", booking_id=booking_id
+        )
+        raise HTTPException(status_code=400, detail="Not enough seats available")
+
+    return {
+        "flight_id": find_booking.flight_id,
+        "seats": [seat_map.label(seat) for seat in seats],
+    }
+
+
+@booking_router.post("/send_payment_otp")
+async def Send_Payment_Otp(booking_id: str, db: AsyncSession = Depends(get_db)):
+    logger.info(
+        "Initiating payment process for booking ID: {booking_id}",
+        booking_id=booking_id,
+    )
+    find_booking = await db.scalar(
+        select(Booking).where(Booking.booking_id == booking_id)
     )
 
-    bill_amount = (
-        find_booking.no_of_adults + find_booking.no_of_children
-    ) * find_flight.flight_price
+    if not find_booking:
+        logger.error("No booking found for ID: {booking_id}", booking_id=booking_id)
+        raise HTTPException(status_code=404, detail="Booking not found")
+
+    find_flight = await db.scalar(
+        select(Flight).where(Flight.flight_id == find_booking.flight_id)
+    )
 
-    if find_booking.no_of_infants > 0:
-        bill_amount += find_booking.no_of_infants * 5000
+    bill_amount = fare_engine.quote_one(
+        find_flight.flight_price,
+        find_flight.available_capacity,
+        find_booking.no_of_adults,
+        find_booking.no_of_children,
+        find_booking.no_of_infants,
+    )
 
     find_booking.bill_amount = bill_amount
-    generate_otp(find_booking.email, bill_amount)
+    await generate_otp(db, find_booking.email, bill_amount, booking_id)
 
-    db.commit()
-    db.refresh(find_booking)
+    await db.commit()
+    await db.refresh(find_booking)
     logger.success(
-        f"OTP sent to email {find_booking.email} for payment of {bill_amount}"
+        "OTP sent to email {email} for payment of {bill_amount}",
+        email=find_booking.email,
+        bill_amount=bill_amount,
     )
     return {"message": "OTP sent for payment confirmation"}
 
 
-
 @booking_router.post("/verify_payment")
-def Verify_Payment(booking_id: str, email: str, otp: str):
-    logger.info(f"Verifying payment for booking ID: {booking_id}")
-    find_booking = db.query(Booking).filter(Booking.booking_id == booking_id).first()
+async def Verify_Payment(
+    booking_id: str,
+    email: str,
+    otp: str,
+    db: AsyncSession = Depends(get_db),
+):
+    logger.info("Verifying payment for booking ID: {booking_id}", booking_id=booking_id)
+    find_booking = await db.scalar(
+        select(Booking).where(Booking.booking_id == booking_id)
+    )
 
     if not find_booking:
-        logger.error(f"No booking found for ID: {booking_id}")
+        logger.error("No booking found for ID: {booking_id}", booking_id=booking_id)
         raise HTTPException(status_code=404, detail="Booking not found")
 
-    verify_otp(email, otp)
+    if not find_booking.flight_id:
+        logger.error(
+            "No flight selected for booking ID: {booking_id}", booking_id=booking_id
+        )
+        raise HTTPException(status_code=400, detail="Flight not selected")
+
+    if hold_expired(find_booking):
+        logger.warning(
+            "Hold expired for booking ID: {booking_id}", booking_id=booking_id
+        )
+        raise HTTPException(status_code=400, detail="Booking hold expired")
+
+    await verify_otp(db, email, otp, booking_id)
+    # Created, and committed, before the payment transaction if missing
+    await seat_maps.load(db, find_booking.flight_id)
+
+    confirmed = await db.execute(
+        transition(
+            Booking,
+            BOOKING_TRANSITIONS,
+            DRAFT,
+            CONFIRMED,
+            Booking.booking_id == booking_id,
+            or_(
+                Booking.hold_expires_at == None,
+                Booking.hold_expires_at > datetime.now(),
+            ),
+            booked_at=datetime.now(),
+            hold_expires_at=None,
+        )
+    )
 
-    find_flight = (
-        db.query(Flight).filter(Flight.flight_id == find_booking.flight_id).first()
+    if confirmed.rowcount != 1:
+        await db.rollback()
+        logger.warning(
+            "Booking ID: {booking_id} is already processed", booking_id=booking_id
+        )
+        raise HTTPException(status_code=400, detail="Booking already processed")
+
+    party = find_booking.no_of_adults + find_booking.no_of_children
+    route = await reserve_seats(db, find_booking.flight_id, party)
+    seats = await seat_maps.assign(db, find_booking.flight_id, party)
+    await db.execute(
+        update(Booking)
+        .where(Booking.booking_id == booking_id)
+        .values(seat_numbers=",".join(seats))
+        .execution_options(synchronize_session=False)
     )
-    find_booking.is_booked = True
-    find_booking.in_process = False
-    find_booking.booked_at = datetime.now()
-    find_flight.available_capacity -= (
-        find_booking.no_of_adults + find_booking.no_of_children
+
+    await db.commit()
+    flight_events.routes_changed(route)
+    await db.refresh(find_booking)
+    logger.success(
+        "Payment verified, booking completed for ID: {booking_id}",
+        booking_id=booking_id,
     )
+    return {"message": "Payment verified, booking completed", "seats": seats}
 
-    db.commit()
-    db.refresh(find_booking)
-    logger.success(f"Payment verified, booking completed for ID: {booking_id}")
-    return {"message": "Payment verified, booking completed"}
 
- 
+@booking_router.post("/join_waitlist")
+async def Join_Waitlist(
+    booking_id: str,
+    email: str,
+    otp: str,
+    db: AsyncSession = Depends(get_db),
+):
+    logger.info("Joining waitlist for booking ID: {booking_id}", booking_id=booking_id)
+    find_booking = await db.scalar(
+        select(Booking).where(Booking.booking_id == booking_id)
+    )
+
+    if not find_booking:
+        logger.error("No booking found for ID: {booking_id}", booking_id=booking_id)
+        raise HTTPException(status_code=404, detail="Booking not found")
+
+    if not find_booking.flight_id:
+        logger.error(
+            "No flight selected for booking ID: {booking_id}", booking_id=booking_id
+        )
+        raise HTTPException(status_code=400, detail="Flight not selected")
+
+    if hold_expired(find_booking):
+        logger.warning(
+            "Hold expired for booking ID: {booking_id}", booking_id=booking_id
+        )
+        raise HTTPException(status_code=400, detail="Booking hold expired")
+
+    await verify_otp(db, email, otp, booking_id)
+    await seat_maps.load(db, find_booking.flight_id)
+
+    waitlisted = await db.execute(
+        transition(
+            Booking,
+            BOOKING_TRANSITIONS,
+            DRAFT,
+            WAITLISTED,
+            Booking.booking_id == booking_id,
+            or_(
+                Booking.hold_expires_at == None,
+                Booking.hold_expires_at > datetime.now(),
+            ),
+            hold_expires_at=None,
+        )
+    )
+
+    if waitlisted.rowcount != 1:
+        await db.rollback()
+        logger.warning(
+            "Booking ID: {booking_id} is already processed", booking_id=booking_id
+        )
+        raise HTTPException(status_code=400, detail="Booking already processed")
+
+    # Locked so a concurrent Cancel_Flight sees this entry and cancels it
+    flight_open = await db.scalar(
+        select(Flight.flight_id)
+        .where(Flight.flight_id == find_booking.flight_id, Flight.is_cancelled == False)
+        .with_for_update()
+    )
+    if not flight_open:
+        await db.rollback()
+        logger.warning(
+            "Flight for booking ID: {booking_id} is cancelled", booking_id=booking_id
+        )
+        raise HTTPException(status_code=400, detail="Flight cancelled")
+
+    await waitlist.join(db, find_booking)
+    # Seats may have freed up since the flight was listed as full
+    promoted = await waitlist.promote(db, find_booking.flight_id)
+    route = await flight_route(db, find_booking.flight_id) if promoted else None
+
+    await db.commit()
+    if route:
+        flight_events.routes_changed(route)
+    waitlist.notify(promoted)
+    await db.refresh(find_booking)
+    logger.success(
+        "Booking ID: {booking_id} is {status}",
+        booking_id=booking_id,
+        status=find_booking.status,
+    )
+    return {
+        "message": f"Booking {find_booking.status}",
+        "status": find_booking.status,
+        "seats": (
+            find_booking.seat_numbers.split(",") if find_booking.seat_numbers else []
+        ),
+    }
+
 
 @booking_router.post("/cancel_flight_booking")
-def Cancel_Flight_Booking(booking_id: str):
-    logger.info(f"Canceling booking with ID: {booking_id}")
-    find_booking = db.query(Booking).filter(Booking.booking_id == booking_id).first()
+async def Cancel_Flight_Booking(booking_id: str, db: AsyncSession = Depends(get_db)):
+    logger.info("Canceling booking with ID: {booking_id}", booking_id=booking_id)
+    find_booking = await db.scalar(
+        select(Booking).where(Booking.booking_id == booking_id)
+    )
 
     if not find_booking:
-        logger.error(f"No booking found for ID: {booking_id}")
+        logger.error("No booking found for ID: {booking_id}", booking_id=booking_id)
         raise HTTPException(status_code=404, detail="Booking not found")
 
-    if not find_booking.is_booked:
+    if find_booking.status == DRAFT:
         logger.warning(
-            f"Attempt to cancel an unconfirmed booking with ID: {booking_id}"
+            "Attempt to cancel an unconfirmed booking with ID: {booking_id}",
+            booking_id=booking_id,
         )
         raise HTTPException(
             status_code=400, detail="Cannot cancel an unconfirmed booking"
         )
 
-    find_flight = (
-        db.query(Flight).filter(Flight.flight_id == find_booking.flight_id).first()
+    if find_booking.status == WAITLISTED:
+        if not await waitlist.leave(db, booking_id):
+            await db.rollback()
+            logger.warning(
+                "Booking ID: {booking_id} left the waitlist meanwhile",
+                booking_id=booking_id,
+            )
+            raise HTTPException(status_code=400, detail="Booking already processed")
+        await db.commit()
+        logger.success(
+            "Booking {booking_id} removed from the waitlist", booking_id=booking_id
+        )
+        return {"message": "Booking canceled successfully", "booking_id": booking_id}
+
+    # Created before the transaction, so promotions can take seats from it
+    await seat_maps.load(db, find_booking.flight_id)
+    canceled = await db.execute(
+        transition(
+            Booking,
+            BOOKING_TRANSITIONS,
+            CONFIRMED,
+            CANCELLED,
+            Booking.booking_id == booking_id,
+            canceled_at=datetime.now(),
+        )
     )
 
-    find_booking.is_canceled = True
-    find_booking.canceled_at = datetime.now()
-    find_flight.available_capacity += (
-        find_booking.no_of_adults + find_booking.no_of_children
+    if canceled.rowcount != 1:
+        await db.rollback()
+        logger.warning(
+            "Booking ID: {booking_id} is already canceled", booking_id=booking_id
+        )
+        raise HTTPException(status_code=400, detail="Booking already canceled")
+
+    route = await release_seats(
+        db,
+        find_booking.flight_id,
+        find_booking.no_of_adults + find_booking.no_of_children,
     )
+    if find_booking.seat_numbers:
+        await seat_maps.release(
+            db, find_booking.flight_id, find_booking.seat_numbers.split(",")
+        )
+    promoted = await waitlist.promote(db, find_booking.flight_id)
 
-    db.commit()
-    db.refresh(find_booking)
-    logger.success(f"Booking {booking_id} canceled successfully")
+    await db.commit()
+    flight_events.routes_changed(route)
+    waitlist.notify(promoted)
+    await db.refresh(find_booking)
+    logger.success("Booking {booking_id} canceled successfully", booking_id=booking_id)
     return {"message": "Booking canceled successfully", "booking_id": booking_id}
@@ -1,36 +1,50 @@
-from fastapi import APIRouter, HTTPException, Header
-from database.database import SessionLocal
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import IMPORT_BATCH_SIZE, PAGE_SIZE_MAX
+from database.database import get_db
 from src.schemas.flights import (
     Register_Flight_Schema,
     Find_Flight_Schema,
     Update_Flight_Schema,
     All_Flight_Schema,
 )
-from src.utils.flights import search_for_copy, decode_token
-from src.models.flights import Flight
+from src.utils.flights import (
+    search_for_copy,
+    parse_flight_rows,
+    find_existing_flights,
+)
+from src.utils.listing import (
+    ProjectedJSONResponse,
+    columns,
+    keyset_page,
+    stream_ndjson,
+)
+from src.utils.events import flight_events
+from src.utils.seats import seat_maps
+from src.utils.waitlist import waitlist
+from src.models.flights import Flight, FlightSeatMap
+from src.utils.auth import require_staff
 from logs.log_config import logger
+from typing import Optional
 import uuid
 
 
 flight_router = APIRouter()
-db = SessionLocal()
 
 
 @flight_router.post("/register_new_flight")
-def Register_New_Flight(flight: Register_Flight_Schema, token: str = Header(...)):
+async def Register_New_Flight(
+    flight: Register_Flight_Schema,
+    user_details: tuple = Depends(require_staff("admin", "manager")),
+    db: AsyncSession = Depends(get_db),
+):
     logger.info("Register flight request received.")
-    user_details = decode_token(token)
     id, post = user_details
 
-    logger.debug(f"Decoded token for user ID: {id}, Role: {post}")
-    if post not in ["admin", "manager"]:
-        logger.warning(f"Access forbidden for user ID: {id}, Role: {post}")
-        raise HTTPException(status_code=403, detail="Access forbidden")
-
-    search_for_copy(flight.flight_name, flight.journey_date, flight.journey_time)
-    logger.debug(
-        f"No duplicate flight found for {flight.flight_name} on {flight.journey_date} at {flight.journey_time}"
-    )
+    logger.debug("Decoded token for user ID: {id}, Role: {post}", id=id, post=post)
 
     new_flight = Flight(
         flight_id=str(uuid.uuid4()),
@@ -41,49 +55,162 @@ def Register_New_Flight(flight: Register_Flight_Schema, token: str = Header(...)
         end_point=flight.end_point,
         available_capacity=flight.available_capacity,
         flight_price=flight.flight_price,
+        duration_minutes=flight.duration_minutes,
     )
 
     db.add(new_flight)
-    db.commit()
+    db.add(
+        FlightSeatMap(
+            **seat_maps.new_row(new_flight.flight_id, flight.available_capacity)
+        )
+    )
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        await search_for_copy(
+            db, flight.flight_name, flight.journey_date, flight.journey_time
+        )
+        raise
+    flight_events.routes_changed(
+        (flight.journey_date, flight.start_point, flight.end_point)
+    )
 
     logger.info(
-        f"Flight registered successfully: {new_flight.flight_name}, ID: {new_flight.flight_id}"
+        "Flight registered successfully: {flight_name}, ID: {flight_id}",
+        flight_name=new_flight.flight_name,
+        flight_id=new_flight.flight_id,
     )
     return {"message": "Flight details added successfully"}
 
 
+@flight_router.post("/import_flights")
+async def Import_Flights(
+    request: Request,
+    user_details: tuple = Depends(require_staff("admin", "manager")),
+    db: AsyncSession = Depends(get_db),
+):
+    logger.info("Bulk flight import request received.")
+    id, post = user_details
+
+    logger.debug("Decoded token for user ID: {id}, Role: {post}", id=id, post=post)
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    rows = parse_flight_rows(await request.body(), content_type)
+
+    results = []
+    counts = {"created": 0, "duplicate": 0, "invalid": 0}
+    seen = set()
+
+    def record(row, status, **details):
+        counts[status] += 1
+        results.append({"row": row, "status": status, **details})
+
+    async def flush(batch):
+        # Another import or registration may insert one of these flights
+        # between the check and the insert; the unique index then rejects
+        # the batch, and it is checked again without the clashing rows.
+        while batch:
+            existing = await find_existing_flights(db, [key for _, key, _ in batch])
+            for row, key, _ in batch:
+                if key in existing:
+                    record(row, "duplicate", detail="Flight already exists")
+            batch = [entry for entry in batch if entry[1] not in existing]
+            if not batch:
+                return
+
+            new_flights = [
+                {"flight_id": str(uuid.uuid4()), **flight.model_dump()}
+                for _, _, flight in batch
+            ]
+            try:
+                await db.execute(insert(Flight.__table__), new_flights)
+                await db.execute(
+                    insert(FlightSeatMap.__table__),
+                    [
+                        seat_maps.new_row(row["flight_id"], row["available_capacity"])
+                        for row in new_flights
+                    ],
+                )
+                await db.commit()
+            except IntegrityError:
+                await db.rollback()
+                if not await find_existing_flights(db, [key for _, key, _ in batch]):
+                    raise
+                continue
+
+            for (row, _, _), new_flight in zip(batch, new_flights):
+                record(row, "created", flight_id=new_flight["flight_id"])
+            flight_events.routes_changed(
+                *{
+                    (row["journey_date"], row["start_point"], row["end_point"])
+                    for row in new_flights
+                }
+            )
+            return
+
+    batch = []
+    for row, flight in rows:
+        if isinstance(flight, str):
+            record(row, "invalid", detail=flight)
+            continue
+
+        key = (flight.flight_name, flight.journey_date, flight.journey_time)
+        if key in seen:
+            record(row, "duplicate", detail="Flight repeated in upload")
+            continue
+        seen.add(key)
+
+        batch.append((row, key, flight))
+        if len(batch) == IMPORT_BATCH_SIZE:
+            await flush(batch)
+            batch = []
+
+    if batch:
+        await flush(batch)
+    results.sort(key=lambda result: result["row"])
+
+    logger.info(
+        "Bulk import finished: {created} created, {duplicate} duplicates, {invalid} invalid",
+        created=counts["created"],
+        duplicate=counts["duplicate"],
+        invalid=counts["invalid"],
+    )
+    # Plain rows; skip jsonable_encoder, which dominates for large uploads
+    return JSONResponse({**counts, "results": results})
+
+
 @flight_router.put("/update_flight_details")
-def Update_Flight_Details(flight: Update_Flight_Schema, token: str = Header(...)):
+async def Update_Flight_Details(
+    flight: Update_Flight_Schema,
+    user_details: tuple = Depends(require_staff("admin", "manager")),
+    db: AsyncSession = Depends(get_db),
+):
     logger.info("Flight update request received.")
-    user_details = decode_token(token)
     id, post = user_details
 
-    logger.debug(f"Decoded token for user ID: {id}, Role: {post}")
-    if post not in ["admin", "manager"]:
-        logger.warning(f"Access forbidden for user ID: {id}, Role: {post}")
-        raise HTTPException(status_code=403, detail="Access forbidden")
+    logger.debug("Decoded token for user ID: {id}, Role: {post}", id=id, post=post)
 
-    old_flight = (
-        db.query(Flight)
-        .filter(
+    old_flight = await db.scalar(
+        select(Flight).where(
             Flight.flight_name == flight.flight_name,
             Flight.journey_date == flight.journey_date,
             Flight.journey_time == flight.journey_time,
         )
-        .first()
     )
 
     if not old_flight:
         logger.error(
-            f"Flight not found: {flight.flight_name} on {flight.journey_date} at {flight.journey_time}"
+            "Flight not found: {flight_name} on {journey_date} at {journey_time}",
+            flight_name=flight.flight_name,
+            journey_date=flight.journey_date,
+            journey_time=flight.journey_time,
         )
         raise HTTPException(status_code=404, detail="Flight not found")
 
-    search_for_copy(flight.new_flight_name, flight.new_date, flight.new_time)
-    logger.debug(
-        f"Duplicate check passed for new flight details: {flight.new_flight_name}, {flight.new_date}, {flight.new_time}"
-    )
-
+    # Created before the update, so added seats can go to the waitlist
+    await seat_maps.load(db, old_flight.flight_id)
+    old_route = (old_flight.journey_date, old_flight.start_point, old_flight.end_point)
     old_flight.flight_name = flight.new_flight_name
     old_flight.journey_time = flight.new_time
     old_flight.journey_date = flight.new_date
@@ -91,67 +218,119 @@ def Update_Flight_Details(flight: Update_Flight_Schema, token: str = Header(...)
     old_flight.end_point = flight.end_point
     old_flight.available_capacity = flight.available_capacity
     old_flight.flight_price = flight.flight_price
+    if flight.duration_minutes is not None:
+        old_flight.duration_minutes = flight.duration_minutes
 
-    db.commit()
+    try:
+        # Flushes the flight first, so a clash with another flight surfaces here
+        await seat_maps.fit(db, old_flight.flight_id, flight.available_capacity)
+        promoted = await waitlist.promote(db, old_flight.flight_id)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        await search_for_copy(
+            db, flight.new_flight_name, flight.new_date, flight.new_time
+        )
+        raise
+    flight_events.routes_changed(
+        old_route, (flight.new_date, flight.start_point, flight.end_point)
+    )
+    waitlist.notify(promoted)
 
     logger.info(
-        f"Flight updated successfully: {old_flight.flight_name}, ID: {old_flight.flight_id}"
+        "Flight updated successfully: {flight_name}, ID: {flight_id}",
+        flight_name=old_flight.flight_name,
+        flight_id=old_flight.flight_id,
     )
     return {"message": "Flight details updated successfully"}
 
 
 @flight_router.post("/cancel_flight")
-def Cancel_Flight(flight: Find_Flight_Schema, token: str = Header(...)):
+async def Cancel_Flight(
+    flight: Find_Flight_Schema,
+    user_details: tuple = Depends(require_staff("admin", "manager")),
+    db: AsyncSession = Depends(get_db),
+):
     logger.info("Flight cancellation request received.")
-    user_details = decode_token(token)
     id, post = user_details
 
-    logger.debug(f"Decoded token for user ID: {id}, Role: {post}")
-    if post not in ["admin", "manager"]:
-        logger.warning(f"Access forbidden for user ID: {id}, Role: {post}")
-        raise HTTPException(status_code=403, detail="Access forbidden")
+    logger.debug("Decoded token for user ID: {id}, Role: {post}", id=id, post=post)
 
-    old_flight = (
-        db.query(Flight)
-        .filter(
+    old_flight = await db.scalar(
+        select(Flight).where(
             Flight.flight_name == flight.flight_name,
             Flight.journey_date == flight.journey_date,
             Flight.journey_time == flight.journey_time,
         )
-        .first()
     )
 
     if not old_flight:
         logger.error(
-            f"Flight not found: {flight.flight_name} on {flight.journey_date} at {flight.journey_time}"
+            "Flight not found: {flight_name} on {journey_date} at {journey_time}",
+            flight_name=flight.flight_name,
+            journey_date=flight.journey_date,
+            journey_time=flight.journey_time,
         )
         raise HTTPException(status_code=404, detail="Flight not found")
 
     old_flight.is_cancelled = True
-    db.commit()
+    # Flushed first: the flight row lock waits out any promotion in progress
+    await db.flush()
+    closed = await waitlist.close(db, old_flight.flight_id)
+    await db.commit()
+    flight_events.routes_changed(
+        (old_flight.journey_date, old_flight.start_point, old_flight.end_point)
+    )
+    waitlist.notify_closed(closed)
 
     logger.info(
-        f"Flight cancelled successfully: {old_flight.flight_name}, ID: {old_flight.flight_id}"
+        "Flight cancelled successfully: {flight_name}, ID: {flight_id}",
+        flight_name=old_flight.flight_name,
+        flight_id=old_flight.flight_id,
     )
     return {"message": "Flight cancelled successfully"}
 
 
-@flight_router.get("/get_all_flight_details", response_model=list[All_Flight_Schema])
-def Get_All_Flight_Details(token: str = Header(...)):
+@flight_router.get(
+    "/get_all_flight_details",
+    response_model=list[All_Flight_Schema],
+    response_class=ProjectedJSONResponse,
+)
+async def Get_All_Flight_Details(
+    limit: int = Query(100, ge=1, le=PAGE_SIZE_MAX),
+    after: Optional[str] = None,
+    user_details: tuple = Depends(require_staff("admin")),
+    db: AsyncSession = Depends(get_db),
+):
     logger.info("Fetching all flight data request received.")
-    user_details = decode_token(token)
     id, post = user_details
 
-    logger.debug(f"Decoded token for user ID: {id}, Role: {post}")
-    if post != "admin":
-        logger.warning(f"Access forbidden for user ID: {id}, Role: {post}")
-        raise HTTPException(status_code=403, detail="Access forbidden")
+    logger.debug("Decoded token for user ID: {id}, Role: {post}", id=id, post=post)
 
-    all_flights = db.query(Flight).all()
+    all_flights, cursor = await keyset_page(
+        db,
+        select(*columns(Flight, All_Flight_Schema)),
+        Flight.flight_id,
+        after,
+        limit,
+    )
 
-    if not all_flights:
+    if not all_flights and after is None:
         logger.warning("No flight data available")
         raise HTTPException(status_code=404, detail="No flight data available")
 
     logger.info("Successfully fetched all flight data.")
-    return all_flights
+    return ProjectedJSONResponse(all_flights, cursor=cursor)
+
+
+@flight_router.get("/export_all_flight_details")
+async def Export_All_Flight_Details(
+    user_details: tuple = Depends(require_staff("admin")),
+):
+    logger.info("Exporting all flight data as NDJSON.")
+    return StreamingResponse(
+        stream_ndjson(
+            select(*columns(Flight, All_Flight_Schema)).order_by(Flight.flight_id)
+        ),
+        media_type="application/x-ndjson",
+    )
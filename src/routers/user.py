@@ -1,50 +1,54 @@
-from fastapi import APIRouter, HTTPException, Header
-from database.database import SessionLocal
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_db
 from src.schemas.user import (
     Update_User_Schema,
     Register_User_Schema,
     Reset_pass_Schema,
     Forget_pass_Schema,
 )
-from src.models.user import User
+from src.models.user import User, USER_TRANSITIONS, UNVERIFIED, ACTIVE, DELETED
 from src.utils.user import (
     find_same_email,
-    pwd_context,
     get_token,
-    decode_token,
     pass_checker,
     generate_otp,
     verify_otp,
 )
+from src.utils.otp_store import VERIFY_EMAIL, RESET_PASSWORD
+from src.utils.passwords import hash_password
+from src.utils.auth import get_current_user
+from src.utils.states import in_state, transition
 from logs.log_config import logger
 import uuid
 
 
 user_router = APIRouter()
-db = SessionLocal()
 
 
 @user_router.post("/sign_up")
-def Sign_Up(user: Register_User_Schema):
+async def Sign_Up(user: Register_User_Schema, db: AsyncSession = Depends(get_db)):
     logger.info("Starting user registration process.")
     new_user = User(
         id=str(uuid.uuid4()),
         first_name=user.first_name,
         last_name=user.last_name,
         email=user.email,
-        password=pwd_context.hash(user.password),
+        password=await hash_password(user.password),
         phone_no=user.phone_no,
     )
 
-    logger.info("Checking for existing users.")
-    find_minimum_one_entry = db.query(User).first()
-    if find_minimum_one_entry:
-        find_same_email(user.email)
-
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    logger.success(f"User registered successfully. User ID: {new_user.id}")
+    try:
+        await db.commit()
+    except IntegrityError:
+        # uq_users_email caught a duplicate; look it up only to explain why
+        await db.rollback()
+        await find_same_email(db, user.email)
+        raise
+    logger.success("User registered successfully. User ID: {id}", id=new_user.id)
 
     return {
         "message": "User registered successfully. Please proceed with verification."
@@ -52,61 +56,53 @@ def Sign_Up(user: Register_User_Schema):
 
 
 @user_router.post("/generate_otp")
-def Generate_OTP(email: str):
-    logger.info(f"Generating OTP for email: {email}.")
-    generate_otp(email)
-    logger.success(f"OTP generated and sent to {email}.")
+async def Generate_OTP(email: str, db: AsyncSession = Depends(get_db)):
+    logger.info("Generating OTP for email: {email}.", email=email)
+    await generate_otp(db, email, VERIFY_EMAIL)
+    logger.success("OTP generated and sent to {email}.", email=email)
     return {"message": "OTP generated successfully."}
 
 
 @user_router.get("/verify_otp")
-def Verify_OTP(email: str, otp: str):
-    logger.info(f"Verifying OTP for email: {email}.")
-    find_user = (
-        db.query(User)
-        .filter(
-            User.email == email,
-            User.is_active == True,
-            User.is_verified == False,
-            User.is_deleted == False,
-        )
-        .first()
+async def Verify_OTP(email: str, otp: str, db: AsyncSession = Depends(get_db)):
+    logger.info("Verifying OTP for email: {email}.", email=email)
+    find_user = await db.scalar(
+        select(User).where(User.email == email, in_state(User.status, UNVERIFIED))
     )
 
     if not find_user:
-        logger.error(f"User not found or already verified. Email: {email}")
+        logger.error("User not found or already verified. Email: {email}", email=email)
         raise HTTPException(
             status_code=400, detail="User not found or already verified."
         )
 
-    verify_otp(email, otp)
-    find_user.is_verified = True
-    db.commit()
-    db.refresh(find_user)
-    logger.success(f"OTP verified for email: {email}. User is now verified.")
+    await verify_otp(db, email, otp, VERIFY_EMAIL)
+    await db.execute(
+        transition(User, USER_TRANSITIONS, UNVERIFIED, ACTIVE, User.id == find_user.id)
+    )
+    await db.commit()
+    logger.success(
+        "OTP verified for email: {email}. User is now verified.", email=email
+    )
     return {"message": "OTP verified successfully."}
 
 
 @user_router.get("/sign_in")
-def Sign_In(email: str, password: str):
-    logger.info(f"Attempting login for email: {email}.")
-    find_user = (
-        db.query(User)
-        .filter(
+async def Sign_In(email: str, password: str, db: AsyncSession = Depends(get_db)):
+    logger.info("Attempting login for email: {email}.", email=email)
+    find_user = await db.scalar(
+        select(User).where(
             User.email == email,
-            User.is_active == True,
-            User.is_verified == True,
-            User.is_deleted == False,
+            in_state(User.status, ACTIVE),
         )
-        .first()
     )
 
     if not find_user:
-        logger.error(f"Login failed. User not found. Email: {email}")
+        logger.error("Login failed. User not found. Email: {email}", email=email)
         raise HTTPException(status_code=400, detail="User not found")
 
-    logger.info(f"Verifying password for email: {email}.")
-    pass_checker(password, find_user.password)
+    logger.info("Verifying password for email: {email}.", email=email)
+    await pass_checker(password, find_user.password)
 
     access_token = get_token(
         find_user.id,
@@ -115,41 +111,44 @@ def Sign_In(email: str, password: str):
         find_user.email,
         find_user.phone_no,
     )
-    logger.success(f"User login successful. Email: {email}")
+    logger.success("User login successful. Email: {email}", email=email)
     return {"message": "Login successful.", "access_token": access_token}
 
 
 @user_router.patch("/update_details")
-def Update_Details(user: Update_User_Schema, token: str = Header(...)):
-    user_details = decode_token(token)
+async def Update_Details(
+    user: Update_User_Schema,
+    user_details: tuple = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
     id, first_name, last_name, email, phone_no = user_details
-    logger.info(f"Updating user details for id: {id}.")
+    logger.info("Updating user details for id: {id}.", id=id)
 
-    find_user = (
-        db.query(User)
-        .filter(
+    find_user = await db.scalar(
+        select(User).where(
             User.id == id,
-            User.is_active == True,
-            User.is_verified == True,
-            User.is_deleted == False,
+            in_state(User.status, ACTIVE),
         )
-        .first()
     )
 
     if not find_user:
-        logger.error(f"User not found for update. id: {id}")
+        logger.error("User not found for update. id: {id}", id=id)
         raise HTTPException(status_code=400, detail="User not found")
 
     new_user_schema_without_none = user.model_dump(exclude_none=True)
 
     for key, value in new_user_schema_without_none.items():
         if key == "password":
-            setattr(find_user, key, pwd_context.hash(value))
+            setattr(find_user, key, await hash_password(value))
         else:
-            find_same_email(value)
             setattr(find_user, key, value)
-    db.commit()
-    db.refresh(find_user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        await find_same_email(db, user.email)
+        raise
+    await db.refresh(find_user)
     access_token = get_token(
         find_user.id,
         find_user.first_name,
@@ -157,7 +156,7 @@ def Update_Details(user: Update_User_Schema, token: str = Header(...)):
         find_user.email,
         find_user.phone_no,
     )
-    logger.success(f"User details updated successfully. id: {id}")
+    logger.success("User details updated successfully. id: {id}", id=id)
     return {
         "message": "User updated successfully.",
         "user": find_user,
@@ -166,102 +165,105 @@ def Update_Details(user: Update_User_Schema, token: str = Header(...)):
 
 
 @user_router.delete("/delete_account")
-def Delete_Account(password: str, token: str = Header(...)):
-    user_details = decode_token(token)
+async def Delete_Account(
+    password: str,
+    user_details: tuple = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
     id, first_name, last_name, email, phone_no = user_details
-    logger.info(f"Deleting account for id: {id}.")
+    logger.info("Deleting account for id: {id}.", id=id)
 
-    find_user = (
-        db.query(User)
-        .filter(User.id == id, User.is_active == True, User.is_verified == True)
-        .first()
+    find_user = await db.scalar(
+        select(User).where(User.id == id, User.status.in_((ACTIVE, DELETED)))
     )
 
     if not find_user:
-        logger.error(f"User not found for deletion. id: {id}")
+        logger.error("User not found for deletion. id: {id}", id=id)
         raise HTTPException(status_code=400, detail="User not found")
 
-    pass_checker(password, find_user.password)
+    await pass_checker(password, find_user.password)
 
-    if find_user.is_deleted:
-        logger.error(f"Attempt to delete an already deleted account. id: {id}")
+    deleted = await db.execute(
+        transition(User, USER_TRANSITIONS, ACTIVE, DELETED, User.id == id)
+    )
+    if deleted.rowcount != 1:
+        await db.rollback()
+        logger.error("Attempt to delete an already deleted account. id: {id}", id=id)
         raise HTTPException(status_code=400, detail="User already deleted")
 
-    find_user.is_deleted = True
-    find_user.is_active = False
-    find_user.is_verified = False
-
-    db.commit()
-    db.refresh(find_user)
-    logger.success(f"Account deleted successfully. id: {id}")
+    await db.commit()
+    await db.refresh(find_user)
+    logger.success("Account deleted successfully. id: {id}", id=id)
     return {"message": "User deleted successfully.", "user": find_user}
 
 
 @user_router.put("/reset_password")
-def Reset_Password(user: Reset_pass_Schema, token: str = Header(...)):
-    user_details = decode_token(token)
+async def Reset_Password(
+    user: Reset_pass_Schema,
+    user_details: tuple = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
     id, first_name, last_name, email, phone_no = user_details
-    logger.info(f"Resetting password for email: {id}.")
+    logger.info("Resetting password for email: {id}.", id=id)
 
-    find_user = (
-        db.query(User)
-        .filter(
+    find_user = await db.scalar(
+        select(User).where(
             User.id == id,
-            User.is_active == True,
-            User.is_verified == True,
-            User.is_deleted == False,
+            in_state(User.status, ACTIVE),
         )
-        .first()
     )
 
     if not find_user:
-        logger.error(f"User not found for password reset. id: {id}")
+        logger.error("User not found for password reset. id: {id}", id=id)
         raise HTTPException(status_code=400, detail="User not found")
 
-    pass_checker(user.enter_old_password, find_user.password)
+    await pass_checker(user.enter_old_password, find_user.password)
 
     if user.enter_new_password == user.re_enter_new_password:
-        find_user.password = pwd_context.hash(user.enter_new_password)
+        find_user.password = await hash_password(user.enter_new_password)
     else:
-        logger.error(f"Password mismatch during reset. id: {id}")
+        logger.error("Password mismatch during reset. id: {id}", id=id)
         raise HTTPException(status_code=400, detail="Passwords do not match")
 
-    db.commit()
-    db.refresh(find_user)
-    logger.success(f"Password reset successfully. id: {id}")
+    await db.commit()
+    await db.refresh(find_user)
+    logger.success("Password reset successfully. id: {id}", id=id)
     return {"message": "Password reset successfully."}
 
 
 @user_router.post("/forget_password_generate_otp")
-def Forget_Password_Generate_OTP(email: str):
-    logger.info(f"Generating OTP for password recovery. Email: {email}.")
-    generate_otp(email)
-    logger.success(f"OTP generated for password recovery. Email: {email}.")
+async def Forget_Password_Generate_OTP(email: str, db: AsyncSession = Depends(get_db)):
+    logger.info("Generating OTP for password recovery. Email: {email}.", email=email)
+    await generate_otp(db, email, RESET_PASSWORD)
+    logger.success("OTP generated for password recovery. Email: {email}.", email=email)
     return {"message": "OTP generated successfully."}
 
 
 @user_router.put("/forget_password")
-def Forget_Password(user: Forget_pass_Schema):
-    logger.info(f"Handling forget password for email: {user.user_email}.")
-    find_user = (
-        db.query(User)
-        .filter(
+async def Forget_Password(user: Forget_pass_Schema, db: AsyncSession = Depends(get_db)):
+    logger.info(
+        "Handling forget password for email: {user_email}.", user_email=user.user_email
+    )
+    find_user = await db.scalar(
+        select(User).where(
             User.email == user.user_email,
-            User.is_active == True,
-            User.is_verified == True,
-            User.is_deleted == False,
+            in_state(User.status, ACTIVE),
         )
-        .first()
     )
 
     if not find_user:
-        logger.error(f"User not found for forget password. Email: {user.user_email}")
+        logger.error(
+            "User not found for forget password. Email: {user_email}",
+            user_email=user.user_email,
+        )
         raise HTTPException(status_code=400, detail="User not found")
 
-    verify_otp(user.user_email, user.otp)
-    find_user.password = pwd_context.hash(user.enter_new_password)
+    await verify_otp(db, user.user_email, user.otp, RESET_PASSWORD)
+    find_user.password = await hash_password(user.enter_new_password)
 
-    db.commit()
-    db.refresh(find_user)
-    logger.success(f"Password changed successfully. Email: {user.user_email}")
+    await db.commit()
+    await db.refresh(find_user)
+    logger.success(
+        "Password changed successfully. Email: {user_email}", user_email=user.user_email
+    )
     return {"message": "Password changed successfully."}
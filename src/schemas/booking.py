@@ -1,9 +1,10 @@
+from datetime import date, datetime
 from pydantic import BaseModel, Field
-
-
+from typing import Optional
+from src.schemas.flights import JourneyTime
 
 class Date_Route_Passengers_Select_Schema(BaseModel):
-    journey_date: str = Field(..., description="Journey date in YYYY-MM-DD format.")
+    journey_date: date = Field(..., description="Journey date in YYYY-MM-DD format.")
     start_point: str = Field(..., description="Starting point of the journey.")
     end_point: str = Field(..., description="Ending point of the journey.")
     no_of_adults: int = Field(
@@ -31,15 +32,104 @@ class Date_Route_Passengers_Select_Schema(BaseModel):
 
 
 class Available_Flight_Schema(BaseModel):
-    journey_date: str = Field(..., description="Journey date in YYYY-MM-DD format.")
+    journey_date: date = Field(..., description="Journey date in YYYY-MM-DD format.")
     flight_name: str = Field(..., description="Name of the flight.")
-    journey_time: str = Field(..., description="Journey time in HH:MM format.")
+    journey_time: JourneyTime = Field(..., description="Journey time in HH:MM format.")
+    fare: float = Field(..., description="Bill for the booking's passengers.")
+    waitlist: bool = Field(
+        False, description="Too full for the party; paying joins its waitlist."
+    )
 
     class Config:
         json_schema_extra = {
             "example": {
                 "journey_date": "2024-12-25",
                 "flight_name": "Delta Airlines DL123",
-                "journey_time": "14:30"
+                "journey_time": "14:30",
+                "fare": 15000.0,
+                "waitlist": False,
+            }
+        }
+
+
+class Flight_Search_Schema(BaseModel):
+    flight_name: str = Field(..., description="Name of the flight.")
+    start_point: str = Field(..., description="Starting point of the journey.")
+    end_point: str = Field(..., description="Ending point of the journey.")
+    journey_date: date = Field(..., description="Journey date in YYYY-MM-DD format.")
+    journey_time: JourneyTime = Field(..., description="Journey time in HH:MM format.")
+    available_capacity: int = Field(..., description="Seats still available.")
+    flight_price: float = Field(..., description="Price per seat.")
+    fare: float = Field(..., description="Bill for `seats` adults, with tax.")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "flight_name": "Delta Airlines DL123",
+                "start_point": "New York",
+                "end_point": "Los Angeles",
+                "journey_date": "2024-12-25",
+                "journey_time": "14:30",
+                "available_capacity": 120,
+                "flight_price": 5000.0,
+                "fare": 5000.0,
             }
         }
+
+
+class Itinerary_Leg_Schema(BaseModel):
+    flight_id: str = Field(..., description="ID of the flight.")
+    flight_name: str = Field(..., description="Name of the flight.")
+    start_point: str = Field(..., description="Departure point of this leg.")
+    end_point: str = Field(..., description="Arrival point of this leg.")
+    departs_at: datetime = Field(..., description="Departure date and time.")
+    arrives_at: datetime = Field(..., description="Arrival date and time.")
+    flight_price: float = Field(..., description="Price per seat.")
+
+
+class Itinerary_Schema(BaseModel):
+    stops: int = Field(..., description="Number of connections (0 for direct).")
+    total_price: float = Field(..., description="Sum of the leg prices per seat.")
+    departs_at: datetime = Field(..., description="Departure of the first leg.")
+    arrives_at: datetime = Field(..., description="Arrival of the last leg.")
+    duration_minutes: int = Field(..., description="Total travel time in minutes.")
+    legs: list[Itinerary_Leg_Schema] = Field(..., description="Flights in order.")
+
+
+class Fare_Calendar_Schema(BaseModel):
+    journey_date: date = Field(..., description="Journey date in YYYY-MM-DD format.")
+    min_fare: Optional[float] = Field(
+        ..., description="Cheapest seat price that day, or null if nothing is left."
+    )
+    available_seats: int = Field(
+        ..., description="Seats left across the day's flights."
+    )
+    flights: int = Field(..., description="Flights with seats left that day.")
+
+
+class Seat_Map_Schema(BaseModel):
+    layout: str = Field(..., description='Seat letters per row, "-" for an aisle.')
+    rows: list[str] = Field(
+        ..., description='One string per row from the front: "." free, "x" taken.'
+    )
+    seat_count: int = Field(..., description="Seats in the cabin.")
+    free: int = Field(..., description="Seats not yet assigned.")
+    version: int = Field(..., description="Changes every time a seat is taken.")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "layout": "ABC-DEF",
+                "rows": ["xx.-...", "...-..x"],
+                "seat_count": 12,
+                "free": 9,
+                "version": 2,
+            }
+        }
+
+
+class Best_Seats_Schema(BaseModel):
+    flight_id: str = Field(..., description="ID of the booking's flight.")
+    seats: list[str] = Field(
+        ..., description="Seats that would be assigned if paid for now."
+    )
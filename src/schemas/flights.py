@@ -1,10 +1,20 @@
-from pydantic import BaseModel, Field
+from datetime import date, time
+from pydantic import BaseModel, Field, PlainSerializer
+from typing import Annotated, Optional
+
+# Departure times are stored as TIME but keep their HH:MM form in the API
+JourneyTime = Annotated[
+    time,
+    PlainSerializer(
+        lambda value: value.strftime("%H:%M"), return_type=str, when_used="json"
+    ),
+]
 
 
 class Register_Flight_Schema(BaseModel):
     flight_name: str = Field(..., description="Name of the flight")
-    journey_date: str = Field(..., description="Journey date in YYYY-MM-DD format")
-    journey_time: str = Field(..., description="Journey time in HH:MM format")
+    journey_date: date = Field(..., description="Journey date in YYYY-MM-DD format")
+    journey_time: JourneyTime = Field(..., description="Journey time in HH:MM format")
     start_point: str = Field(..., description="Name of the Pickup Point")
     end_point: str = Field(..., description="Name of the Drop Point")
     available_capacity: int = Field(
@@ -15,13 +25,16 @@ class Register_Flight_Schema(BaseModel):
     flight_price: float = Field(
         ..., ge=0, description="Price of the flight per seat (must be non-negative)"
     )
+    duration_minutes: int = Field(
+        120, gt=0, description="Flight duration in minutes (must be positive)"
+    )
 
 
 
 class All_Flight_Schema(BaseModel):
     flight_name: str = Field(..., description="Name of the flight")
-    journey_date: str = Field(..., description="Journey date in YYYY-MM-DD format")
-    journey_time: str = Field(..., description="Journey time in HH:MM format")
+    journey_date: date = Field(..., description="Journey date in YYYY-MM-DD format")
+    journey_time: JourneyTime = Field(..., description="Journey time in HH:MM format")
     available_capacity: int = Field(
         ..., description="Available seat capacity of the flight"
     )
@@ -30,13 +43,15 @@ class All_Flight_Schema(BaseModel):
 
 class Update_Flight_Schema(BaseModel):
     flight_name: str = Field(..., description="Current name of the flight")
-    journey_date: str = Field(
+    journey_date: date = Field(
         ..., description="Current journey date in YYYY-MM-DD format"
     )
-    journey_time: str = Field(..., description="Current journey time in HH:MM format")
+    journey_time: JourneyTime = Field(
+        ..., description="Current journey time in HH:MM format"
+    )
     new_flight_name: str = Field(..., description="New name of the flight")
-    new_date: str = Field(..., description="New journey date in YYYY-MM-DD format")
-    new_time: str = Field(..., description="New journey time in HH:MM format")
+    new_date: date = Field(..., description="New journey date in YYYY-MM-DD format")
+    new_time: JourneyTime = Field(..., description="New journey time in HH:MM format")
     start_point: str = Field(..., description="Updated name of the Pickup Point")
     end_point: str = Field(..., description="Updated name of the Drop Point")
     available_capacity: int = Field(
@@ -49,10 +64,13 @@ class Update_Flight_Schema(BaseModel):
         ge=0,
         description="Updated price of the flight per seat (must be non-negative)",
     )
+    duration_minutes: Optional[int] = Field(
+        None, gt=0, description="Updated flight duration in minutes, if it changed"
+    )
 
 
 
 class Find_Flight_Schema(BaseModel):
     flight_name: str = Field(..., description="Name of the flight to find")
-    journey_date: str = Field(..., description="Journey date in YYYY-MM-DD format")
-    journey_time: str = Field(..., description="Journey time in HH:MM format")
+    journey_date: date = Field(..., description="Journey date in YYYY-MM-DD format")
+    journey_time: JourneyTime = Field(..., description="Journey time in HH:MM format")
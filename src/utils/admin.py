@@ -1,21 +1,31 @@
-from database.database import SessionLocal
 from src.models.admin import Admin
 from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from logs.log_config import logger
+from src.utils.passwords import verify_password
+from config import SECRET_KEY, ALGORITHM
+from datetime import datetime, timedelta, timezone
+import jwt
 
-db = SessionLocal()
 
-def find_same_user(field_name: str, value: str):
-    user = db.query(Admin).filter(getattr(Admin, field_name) == value).first()
+async def find_same_user(
+    db: AsyncSession, field_name: str, value: str, exclude_id: str = None
+):
+    query = select(Admin).where(getattr(Admin, field_name) == value)
+    if exclude_id is not None:
+        query = query.where(Admin.id != exclude_id)
+    user = await db.scalar(query)
     if user:
         if user.is_fired == False and user.is_resigned == False:
-            logger.error(f"{field_name.capitalize()} already exists")
+            logger.error("{field} already exists", field=field_name)
             raise HTTPException(
                 status_code=400, detail=f"{field_name.capitalize()} already exists"
             )
         if user.is_resigned == True:
             logger.error(
-                f"{field_name.capitalize()} already exists but person resigned ago"
+                "{field} already exists but person resigned ago", field=field_name
             )
             raise HTTPException(
                 status_code=400,
@@ -23,7 +33,7 @@ def find_same_user(field_name: str, value: str):
             )
         if user.is_fired == True:
             logger.error(
-                f"{field_name.capitalize()} already exists but person fired ago"
+                "{field} already exists but person fired ago", field=field_name
             )
             raise HTTPException(
                 status_code=400,
@@ -31,27 +41,27 @@ def find_same_user(field_name: str, value: str):
             )
 
 
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+async def commit_staff(db: AsyncSession, staff, exclude_id: str = None):
+    """Commit a staff insert or update, mapping a unique email or user name
+    clash to the same 400 find_same_user gives."""
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        await find_same_user(db, "email", staff.email, exclude_id)
+        await find_same_user(db, "user_name", staff.user_name, exclude_id)
+        raise
 
 
-def pass_checker(user_pass, hash_pass):
-    if pwd_context.verify(user_pass, hash_pass):
+async def pass_checker(user_pass, hash_pass):
+    if await verify_password(user_pass, hash_pass):
         return True
     else:
         logger.error("Password is incorrect")
         raise HTTPException(status_code=401, detail="Password is incorrect")
 
 
-from config import SECRET_KEY, ALGORITHM
-from datetime import datetime, timedelta, timezone
-import jwt
-from fastapi import HTTPException, status
-
-
 def get_token(id: str, post: str):
-
     payload = {
         "id": id,
         "post": post,
@@ -60,31 +70,3 @@ def get_token(id: str, post: str):
 
     access_token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
     return {"access_token": access_token}
-
-
-def decode_token(token: str):
-    try:
-
-        payload = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
-        id = payload.get("id")
-        post = payload.get("post")
-
-        if not id or not post:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Invalid token",
-            )
-        return id, post
-
-    except jwt.ExpiredSignatureError:
-        logger.error("Token has expired")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Token has expired",
-        )
-
-    except jwt.InvalidTokenError:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Invalid token",
-        )
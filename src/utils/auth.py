@@ -0,0 +1,156 @@
+from config import (
+    SECRET_KEY,
+    ALGORITHM,
+    TOKEN_CACHE_SIZE,
+    METRICS_ENABLED,
+    METRICS_TOKEN,
+)
+from collections import OrderedDict
+from fastapi import Header, HTTPException, status
+from logs.log_config import logger
+from secrets import compare_digest
+import jwt
+import threading
+import time
+
+
+class TokenCache:
+    """Bounded LRU of verified token claims, each kept until the token's exp."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            claims, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[token]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return claims
+
+    def put(self, token: str, claims: dict, expires_at: float):
+        with self._lock:
+            self._entries[token] = (claims, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
+
+def decode_token(token: str):
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        logger.error("Token has expired.")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Token has expired",
+        )
+    except jwt.InvalidTokenError:
+        logger.error("Invalid token.")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid token",
+        )
+
+    if claims.get("exp"):
+        token_cache.put(token, claims, claims["exp"])
+    return claims
+
+
+async def get_current_user(token: str = Header(...)):
+    claims = decode_token(token)
+    user_details = (
+        claims.get("id"),
+        claims.get("first_name"),
+        claims.get("last_name"),
+        claims.get("email"),
+        claims.get("phone_no"),
+    )
+
+    if not all(user_details):
+        logger.error("Invalid token payload.")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid token",
+        )
+    return user_details
+
+
+def require_staff(*posts: str, status_code: int = status.HTTP_403_FORBIDDEN):
+    async def get_current_staff(token: str = Header(...)):
+        claims = decode_token(token)
+        id = claims.get("id")
+        post = claims.get("post")
+
+        if not id or not post:
+            logger.error("Token decoding failed. Missing 'id' or 'post'.")
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Invalid token",
+            )
+
+        if posts and post not in posts:
+            logger.warning(
+                "Access forbidden for user ID: {id}, Role: {post}", id=id, post=post
+            )
+            raise HTTPException(status_code=status_code, detail="Access forbidden")
+
+        return id, post
+
+    return get_current_staff
+
+
+async def require_metrics_token(authorization: str = Header(None)):
+    # Off unless enabled with a token, so publishing the router does not
+    # publish the internals in system_stats()
+    if not METRICS_ENABLED or not METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not compare_digest(
+        token.encode(), METRICS_TOKEN.encode()
+    ):
+        logger.warning("Metrics scrape with a missing or wrong token")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -1,119 +1,108 @@
 from logs.log_config import logger
-from database.database import SessionLocal
-from src.models.user import User, OTP
-from fastapi import HTTPException, status
-from config import SECRET_KEY, ALGORITHM, SENDER_EMAIL_ID, EMAIL_PASSKEY
-import jwt
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-import random
-import uuid
-
-db = SessionLocal()
-
-
-def decode_token(token: str):
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        id = payload.get("id")
-        first_name = payload.get("first_name")
-        last_name = payload.get("last_name")
-        email = payload.get("email")
-        phone_no = payload.get("phone_no")
-
-        if not id or not first_name or not last_name or not email or not phone_no:
-            logger.error("Invalid token payload.")
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Invalid token",
-            )
-        return id, first_name, last_name, email, phone_no
-    except jwt.ExpiredSignatureError:
-        logger.error("Token has expired.")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Token has expired",
-        )
-    except jwt.InvalidTokenError:
-        logger.error("Invalid token.")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Invalid token",
-        )
-
-
-def send_email(receiver, subject, body):
-    smtp_server = "smtp.gmail.com"
-    smtp_port = 587
-    smtp_user = SENDER_EMAIL_ID
-    smtp_pass = EMAIL_PASSKEY
+from src.models.user import User
+from src.models.flights import Flight
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from src.utils.mailer import email_queue
+from src.utils.otp_store import otp_store, payment_purpose
 
-    msg = MIMEMultipart()
-    msg["From"] = SENDER_EMAIL_ID
-    msg["To"] = receiver
-    msg["Subject"] = subject
-    msg.attach(MIMEText(body, "plain"))
 
-    try:
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.set_debuglevel(0)
-            server.starttls()
-            server.login(smtp_user, smtp_pass)
-            server.sendmail(SENDER_EMAIL_ID, receiver, msg.as_string())
-        logger.info(f"Email sent successfully to {receiver}")
-        return True
-    except Exception as e:
-        logger.error(f"Failed to send email to {receiver}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to send email")
-
-
-def generate_otp(email: str, bill_amount: str):
-    logger.info(f"Attempting to generate OTP for email: {email}")
-    find_user = db.query(User).filter(User.email == email).first()
+async def generate_otp(db: AsyncSession, email: str, bill_amount: str, booking_id: str):
+    logger.info("Attempting to generate OTP for email: {email}", email=email)
+    find_user = await db.scalar(select(User).where(User.email == email))
 
     if not find_user:
-        logger.error(f"No user found with email: {email}")
+        logger.error("No user found with email: {email}", email=email)
         raise HTTPException(status_code=404, detail="User not found")
 
     if bill_amount <= 0:
-        logger.error(f"Invalid bill amount: {bill_amount}")
+        logger.error("Invalid bill amount: {bill_amount}", bill_amount=bill_amount)
         raise HTTPException(status_code=400, detail="Invalid bill amount")
 
     logger.info("Generating OTP")
-    random_otp = random.randint(1000, 9999)
+    random_otp = await otp_store.issue(
+        db, find_user.id, find_user.email, payment_purpose(booking_id)
+    )
+
+    email_queue.enqueue(
+        find_user.email,
+        "Payment OTP",
+        f"Your bill amount is {bill_amount}. OTP: {random_otp}",
+    )
+    logger.success("OTP successfully generated and queued for {email}", email=email)
+
+
+async def verify_otp(db: AsyncSession, email: str, otp: str, booking_id: str):
+    logger.info("Verifying OTP for email: {email}", email=email)
+    if not await otp_store.consume(db, email, payment_purpose(booking_id), otp):
+        logger.error("Invalid OTP entered for email: {email}", email=email)
+        raise HTTPException(status_code=400, detail="Invalid or expired OTP")
+
+    logger.success("OTP for email {email} has been verified and deleted.", email=email)
 
-    try:
-        send_email(
-            find_user.email,
-            "Payment OTP",
-            f"Your bill amount is {bill_amount}. OTP: {random_otp}",
+
+async def reserve_seats(db: AsyncSession, flight_id: str, seats: int):
+    logger.info(
+        "Reserving {seats} seats on flight ID: {flight_id}",
+        seats=seats,
+        flight_id=flight_id,
+    )
+    reserved = await db.execute(
+        update(Flight)
+        .where(
+            Flight.flight_id == flight_id,
+            Flight.is_cancelled == False,
+            Flight.available_capacity >= seats,
         )
-    except HTTPException as e:
-        logger.error(f"Failed to send OTP email: {str(e)}")
-        raise
-
-    new_otp = OTP(
-        id=str(uuid.uuid4()),
-        user_id=find_user.id,
-        email=find_user.email,
-        otp=random_otp,
+        .values(available_capacity=Flight.available_capacity - seats)
     )
 
-    db.add(new_otp)
-    db.commit()
-    logger.success(f"OTP successfully generated and sent to {email}")
+    if reserved.rowcount != 1:
+        await db.rollback()
+        logger.warning(
+            "Not enough seats left on flight ID: {flight_id}, or it is cancelled",
+            flight_id=flight_id,
+        )
+        raise HTTPException(status_code=400, detail="Not enough seats available")
 
+    logger.info(
+        "{seats} seats reserved on flight ID: {flight_id}",
+        seats=seats,
+        flight_id=flight_id,
+    )
+    return await flight_route(db, flight_id)
 
-def verify_otp(email: str, otp: str):
-    logger.info(f"Verifying OTP for email: {email}")
-    find_otp = db.query(OTP).filter(OTP.email == email, OTP.otp == otp).first()
 
-    if not find_otp:
-        logger.error(f"Invalid OTP entered for email: {email}")
-        raise HTTPException(status_code=400, detail="Invalid or expired OTP")
+async def release_seats(db: AsyncSession, flight_id: str, seats: int):
+    logger.info(
+        "Releasing {seats} seats on flight ID: {flight_id}",
+        seats=seats,
+        flight_id=flight_id,
+    )
+    released = await db.execute(
+        update(Flight)
+        .where(Flight.flight_id == flight_id)
+        .values(available_capacity=Flight.available_capacity + seats)
+    )
 
-    logger.info(f"OTP verified for email: {email}")
-    db.delete(find_otp)
-    db.commit()
-    logger.success(f"OTP for email {email} has been verified and deleted.")
+    if released.rowcount != 1:
+        await db.rollback()
+        logger.error("No flight found with ID: {flight_id}", flight_id=flight_id)
+        raise HTTPException(status_code=404, detail="Flight not found")
+
+    logger.info(
+        "{seats} seats released on flight ID: {flight_id}",
+        seats=seats,
+        flight_id=flight_id,
+    )
+    return await flight_route(db, flight_id)
+
+
+async def flight_route(db: AsyncSession, flight_id: str):
+    route = await db.execute(
+        select(Flight.journey_date, Flight.start_point, Flight.end_point).where(
+            Flight.flight_id == flight_id
+        )
+    )
+    return tuple(route.one())
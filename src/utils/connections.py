@@ -0,0 +1,372 @@
+from config import (
+    CONNECTION_GRAPH_DAYS,
+    CONNECTION_GRAPH_TTL,
+    CONNECTION_MAX_LAYOVER,
+    CONNECTION_MIN_LAYOVER,
+)
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict, namedtuple
+from datetime import datetime, timedelta
+from heapq import heappush, heapreplace
+from itertools import count
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.flights import Flight
+from src.utils.events import flight_events
+import asyncio
+import time
+
+# Departure and arrival are minutes since 0001-01-01, so legs sort and compare
+# as plain integers and a leg that lands after midnight needs no special case.
+Leg = namedtuple(
+    "Leg",
+    [
+        "departs",
+        "arrives",
+        "flight_id",
+        "flight_name",
+        "start_point",
+        "end_point",
+        "flight_price",
+        "available_capacity",
+    ],
+)
+
+# Past this many changed routes a day is reloaded instead of patched
+PATCH_ROUTE_LIMIT = 32
+
+
+def _minutes(journey_date, journey_time):
+    return (
+        journey_date.toordinal() * 1440 + journey_time.hour * 60 + journey_time.minute
+    )
+
+
+def _as_datetime(minutes: int):
+    return datetime.fromordinal(minutes // 1440) + timedelta(minutes=minutes % 1440)
+
+
+def _window(legs: list, earliest: int, latest: int):
+    return legs[bisect_left(legs, (earliest,)) : bisect_left(legs, (latest + 1,))]
+
+
+class DaySchedule:
+    """The flights departing on one day, indexed by route and by origin."""
+
+    def __init__(self, legs=()):
+        self.loaded_at = time.monotonic()
+        self.routes = {}
+        self.departures = {}
+        self.destinations = defaultdict(set)
+        self.feeders = defaultdict(set)
+
+        grouped = defaultdict(list)
+        for leg in legs:
+            grouped[(leg.start_point, leg.end_point)].append(leg)
+        for route, route_legs in grouped.items():
+            self._set_route(route, route_legs)
+        for start_point in self.destinations:
+            self._index_origin(start_point)
+
+    def __len__(self):
+        return sum(len(legs) for legs in self.routes.values())
+
+    def replace_route(self, route: tuple, legs: list):
+        self._set_route(route, legs)
+        self._index_origin(route[0])
+
+    def _set_route(self, route: tuple, legs: list):
+        start_point, end_point = route
+        if legs:
+            self.routes[route] = sorted(legs)
+            self.destinations[start_point].add(end_point)
+            self.feeders[end_point].add(start_point)
+        else:
+            self.routes.pop(route, None)
+            self.destinations[start_point].discard(end_point)
+            self.feeders[end_point].discard(start_point)
+
+    def _index_origin(self, start_point: str):
+        self.departures[start_point] = sorted(
+            leg
+            for end_point in self.destinations[start_point]
+            for leg in self.routes[(start_point, end_point)]
+        )
+
+
+class ConnectionGraph:
+    """In-memory flight graph for direct, one-stop and two-stop itineraries.
+
+    Departure days are loaded from the database on first use and kept in an
+    LRU of `max_days`. It is subscribed to flight_events: a changed route is
+    marked dirty and re-read on the next search that needs its day, so a
+    seat sold or a flight rescheduled costs one indexed query for that
+    route, not a rebuild of the whole day. Events only reach the process
+    that committed the change, so a day is also reloaded once it is older
+    than `ttl` seconds, which bounds staleness when several app processes
+    each keep their own graph.
+    """
+
+    def __init__(self, max_days: int, ttl: float):
+        self.max_days = max_days
+        self.ttl = ttl
+        self._days = OrderedDict()
+        self._dirty = {}
+        self._lock = asyncio.Lock()
+        self.loads = 0
+        self.expirations = 0
+        self.patched_routes = 0
+        self.searches = 0
+
+    def routes_changed(self, *routes: tuple):
+        for journey_date, start_point, end_point in routes:
+            dirty = self._dirty.get(journey_date)
+            if dirty is not None:
+                dirty.add((start_point, end_point))
+
+    def clear(self):
+        self._days.clear()
+        self._dirty.clear()
+
+    def _expired(self, schedule: DaySchedule):
+        return self.ttl > 0 and time.monotonic() - schedule.loaded_at >= self.ttl
+
+    async def schedule(self, db: AsyncSession, journey_date):
+        schedule = self._days.get(journey_date)
+        if (
+            schedule is not None
+            and not self._dirty[journey_date]
+            and not self._expired(schedule)
+        ):
+            self._days.move_to_end(journey_date)
+            return schedule
+
+        async with self._lock:
+            return await self._refresh(db, journey_date)
+
+    async def _refresh(self, db: AsyncSession, journey_date):
+        schedule = self._days.get(journey_date)
+        routes = self._dirty.get(journey_date, ())
+        # Changes committed from here on land in the new set and are picked
+        # up by the next search, even if they race with this read.
+        self._dirty[journey_date] = set()
+
+        expired = schedule is not None and self._expired(schedule)
+        if schedule is None or expired or len(routes) > PATCH_ROUTE_LIMIT:
+            schedule = DaySchedule(
+                await _load_legs(db, Flight.journey_date == journey_date)
+            )
+            self.loads += 1
+            self.expirations += expired
+        else:
+            for start_point, end_point in routes:
+                legs = await _load_legs(
+                    db,
+                    Flight.start_point == start_point,
+                    Flight.end_point == end_point,
+                    Flight.journey_date == journey_date,
+                )
+                schedule.replace_route((start_point, end_point), legs)
+            self.patched_routes += len(routes)
+
+        self._days[journey_date] = schedule
+        self._days.move_to_end(journey_date)
+        while len(self._days) > self.max_days:
+            evicted, _ = self._days.popitem(last=False)
+            self._dirty.pop(evicted, None)
+        return schedule
+
+    async def search(
+        self,
+        db: AsyncSession,
+        start_point: str,
+        end_point: str,
+        journey_date,
+        seats: int = 1,
+        sort_by: str = "price",
+        limit: int = 10,
+        max_stops: int = 2,
+        min_layover: int = CONNECTION_MIN_LAYOVER,
+        max_layover: int = CONNECTION_MAX_LAYOVER,
+    ):
+        """The `limit` best itineraries leaving on `journey_date`.
+
+        Connections may depart the next day, so `max_layover` is capped at a
+        day. Itineraries are ranked by total price then arrival, or by
+        arrival then total price when `sort_by` is "arrival".
+        """
+        schedules = [
+            await self.schedule(db, journey_date),
+            await self.schedule(db, journey_date + timedelta(days=1)),
+        ]
+        self.searches += 1
+        itineraries = find_itineraries(
+            schedules,
+            start_point,
+            end_point,
+            seats,
+            sort_by,
+            limit,
+            max_stops,
+            min_layover,
+            min(max_layover, 1440),
+        )
+        return [_itinerary(legs) for legs in itineraries]
+
+    def stats(self):
+        return {
+            "days": len(self._days),
+            "max_days": self.max_days,
+            "ttl_seconds": self.ttl,
+            "flights": sum(len(schedule) for schedule in self._days.values()),
+            "dirty_routes": sum(len(routes) for routes in self._dirty.values()),
+            "loads": self.loads,
+            "expirations": self.expirations,
+            "patched_routes": self.patched_routes,
+            "searches": self.searches,
+        }
+
+
+def find_itineraries(
+    schedules: list,
+    start_point: str,
+    end_point: str,
+    seats: int,
+    sort_by: str,
+    limit: int,
+    max_stops: int,
+    min_layover: int,
+    max_layover: int,
+):
+    """Best-first k itineraries over the first schedule's departures.
+
+    An itinerary is ranked by (price, arrival), or (arrival, price) when
+    `sort_by` is "arrival". Adding a leg never lowers either, so a partial
+    itinerary that already ranks behind the k-th best kept so far is not
+    extended, and first legs are tried best rank first so the search stops
+    as soon as one of them alone ranks behind it.
+    """
+    by_arrival = sort_by == "arrival"
+    best = []
+    order = count()
+    worst = None
+
+    def rank(price, arrives):
+        return (arrives, price) if by_arrival else (price, arrives)
+
+    def offer(legs, price, arrives):
+        nonlocal worst
+        key = rank(price, arrives)
+        if worst is not None and key >= worst:
+            return
+        entry = (-key[0], -key[1], -next(order), legs)
+        if len(best) < limit:
+            heappush(best, entry)
+        else:
+            heapreplace(best, entry)
+        if len(best) == limit:
+            worst = (-best[0][0], -best[0][1])
+
+    def departing(airport, arrived):
+        for schedule in schedules:
+            yield from _window(
+                schedule.departures.get(airport, []),
+                arrived + min_layover,
+                arrived + max_layover,
+            )
+
+    def flying(route, arrived):
+        for schedule in schedules:
+            yield from _window(
+                schedule.routes.get(route, []),
+                arrived + min_layover,
+                arrived + max_layover,
+            )
+
+    feeders = set()
+    for schedule in schedules:
+        feeders |= schedule.feeders.get(end_point, set())
+
+    firsts = sorted(
+        schedules[0].departures.get(start_point, []),
+        key=lambda leg: rank(leg.flight_price, leg.arrives),
+    )
+    for first in firsts:
+        if first.available_capacity < seats:
+            continue
+        if worst is not None and rank(first.flight_price, first.arrives) >= worst:
+            break
+        if first.end_point == end_point:
+            offer((first,), first.flight_price, first.arrives)
+            continue
+        if max_stops < 1:
+            continue
+
+        for second in departing(first.end_point, first.arrives):
+            if second.available_capacity < seats or second.end_point == start_point:
+                continue
+            price = first.flight_price + second.flight_price
+            if worst is not None and rank(price, second.arrives) >= worst:
+                continue
+            if second.end_point == end_point:
+                offer((first, second), price, second.arrives)
+                continue
+            if max_stops < 2 or second.end_point not in feeders:
+                continue
+
+            for third in flying((second.end_point, end_point), second.arrives):
+                if third.available_capacity >= seats:
+                    offer(
+                        (first, second, third),
+                        price + third.flight_price,
+                        third.arrives,
+                    )
+
+    return [entry[3] for entry in sorted(best, reverse=True)]
+
+
+def _itinerary(legs: tuple):
+    return {
+        "stops": len(legs) - 1,
+        "total_price": sum(leg.flight_price for leg in legs),
+        "departs_at": _as_datetime(legs[0].departs),
+        "arrives_at": _as_datetime(legs[-1].arrives),
+        "duration_minutes": legs[-1].arrives - legs[0].departs,
+        "legs": [
+            {
+                "flight_id": leg.flight_id,
+                "flight_name": leg.flight_name,
+                "start_point": leg.start_point,
+                "end_point": leg.end_point,
+                "departs_at": _as_datetime(leg.departs),
+                "arrives_at": _as_datetime(leg.arrives),
+                "flight_price": leg.flight_price,
+            }
+            for leg in legs
+        ],
+    }
+
+
+async def _load_legs(db: AsyncSession, *criteria):
+    rows = await db.execute(
+        select(
+            Flight.journey_date,
+            Flight.journey_time,
+            Flight.duration_minutes,
+            Flight.flight_id,
+            Flight.flight_name,
+            Flight.start_point,
+            Flight.end_point,
+            Flight.flight_price,
+            Flight.available_capacity,
+        ).where(*criteria, Flight.is_cancelled == False)
+    )
+    legs = []
+    for journey_date, journey_time, duration_minutes, *flight in rows:
+        departs = _minutes(journey_date, journey_time)
+        legs.append(Leg(departs, departs + duration_minutes, *flight))
+    return legs
+
+
+connection_graph = ConnectionGraph(CONNECTION_GRAPH_DAYS, CONNECTION_GRAPH_TTL)
+flight_events.subscribe(connection_graph.routes_changed)
@@ -0,0 +1,32 @@
+from logs.log_config import logger
+
+
+class FlightEvents:
+    """Tells the in-memory flight indexes which routes a commit changed.
+
+    A route is a (journey_date, start_point, end_point) tuple. Writers call
+    routes_changed() after committing; every subscriber (route cache,
+    connection graph) gets the routes and drops or refreshes what it holds
+    for them. A failing subscriber is logged and does not stop the others.
+    """
+
+    def __init__(self):
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+        return callback
+
+    def routes_changed(self, *routes: tuple):
+        for callback in self._subscribers:
+            try:
+                callback(*routes)
+            except Exception as e:
+                logger.error(
+                    "Flight event subscriber {callback} failed: {error}",
+                    callback=callback,
+                    error=e,
+                )
+
+
+flight_events = FlightEvents()
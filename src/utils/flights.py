@@ -1,61 +1,98 @@
 from fastapi import HTTPException, status
-from database.database import SessionLocal
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.flights import Flight
-from config import SECRET_KEY, ALGORITHM
-import jwt
+from src.schemas.flights import Register_Flight_Schema
 from logs.log_config import logger
+import csv
+import io
+import json
 
-db = SessionLocal()
-
-
-def search_for_copy(flight_name: str, date: str, time: str):
-    logger.info(f"Checking for duplicate flight: {flight_name} on {date} at {time}.")
-    copy_flight = (
-        db.query(Flight)
-        .filter(
+async def search_for_copy(db: AsyncSession, flight_name: str, date: str, time: str):
+    logger.info(
+        "Checking for duplicate flight: {flight_name} on {date} at {time}.",
+        flight_name=flight_name,
+        date=date,
+        time=time,
+    )
+    copy_flight = await db.scalar(
+        select(Flight).where(
             Flight.flight_name == flight_name,
             Flight.journey_date == date,
             Flight.journey_time == time,
         )
-        .first()
     )
 
     if copy_flight:
-        logger.warning(f"Duplicate flight found: {flight_name} on {date} at {time}.")
+        logger.warning(
+            "Duplicate flight found: {flight_name} on {date} at {time}.",
+            flight_name=flight_name,
+            date=date,
+            time=time,
+        )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Flight already exists"
         )
 
-    logger.info(f"No duplicate flight found for {flight_name} on {date} at {time}.")
-
+    logger.info(
+        "No duplicate flight found for {flight_name} on {date} at {time}.",
+        flight_name=flight_name,
+        date=date,
+        time=time,
+    )
 
-def decode_token(token: str):
-    logger.info("Decoding token.")
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        id = payload.get("id")
-        post = payload.get("post")
-
-        if not id or not post:
-            logger.error("Token decoding failed. Missing 'id' or 'post'.")
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Invalid token",
-            )
 
-        logger.debug(f"Token decoded successfully for user ID: {id}, Role: {post}.")
-        return id, post
+def parse_flight_rows(body: bytes, content_type: str):
+    """Yield (row number, validated flight or error message) for an upload.
 
-    except jwt.ExpiredSignatureError:
-        logger.error("Token has expired.")
+    CSV needs a header row naming the Register_Flight_Schema fields; JSON lines
+    carry one object per line. Blank lines are skipped.
+    """
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Token has expired",
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Upload must be UTF-8"
         )
 
-    except jwt.InvalidTokenError:
-        logger.error("Invalid token provided.")
+    if content_type == "text/csv":
+        records = enumerate(csv.DictReader(io.StringIO(text)), start=2)
+    elif content_type in ("application/x-ndjson", "application/jsonl"):
+        records = enumerate(text.splitlines(), start=1)
+    else:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Invalid token",
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload text/csv or application/x-ndjson",
+        )
+
+    for row, record in records:
+        try:
+            if isinstance(record, str):
+                if not record.strip():
+                    continue
+                record = json.loads(record)
+            yield row, Register_Flight_Schema.model_validate(record)
+        except ValidationError as e:
+            yield row, "; ".join(
+                f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}"
+                for error in e.errors()
+            )
+        except ValueError as e:
+            yield row, f"Invalid JSON: {e}"
+
+
+async def find_existing_flights(db: AsyncSession, keys: list):
+    """Return which (flight_name, journey_date, journey_time) keys already exist."""
+    if not keys:
+        return set()
+
+    # Row-value IN is not index-searchable on every backend; narrowing by name
+    # and date seeks uq_flights_name_date_time, and the exact match is done here.
+    candidates = await db.execute(
+        select(Flight.flight_name, Flight.journey_date, Flight.journey_time).where(
+            Flight.flight_name.in_({key[0] for key in keys}),
+            Flight.journey_date.in_({key[1] for key in keys}),
         )
+    )
+    return {tuple(row) for row in candidates} & set(keys)
@@ -0,0 +1,98 @@
+from config import BOOKING_HOLD_SECONDS, HOLD_REAP_INTERVAL, HOLD_REAP_BATCH_SIZE
+from database.database import open_session
+from datetime import datetime, timedelta
+from logs.log_config import logger
+from sqlalchemy import delete, func, select
+from src.models.booking import Booking, DRAFT
+from src.utils.periodic import PeriodicJob
+from src.utils.states import in_state
+
+def hold_deadline():
+    return datetime.now() + timedelta(seconds=BOOKING_HOLD_SECONDS)
+
+
+def hold_expired(booking: Booking):
+    return (
+        booking.hold_expires_at is not None
+        and booking.hold_expires_at <= datetime.now()
+    )
+
+
+class HoldReaper(PeriodicJob):
+    """Deletes draft bookings whose hold ran out before they were paid for.
+
+    Drafts are found through ix_bookings_draft_hold_expiry and deleted in batches,
+    each in its own transaction. Every run also refreshes the count of live
+    holds reported in /system_stats.
+    """
+
+    name = "Booking hold reaper"
+
+    def __init__(self, interval: float, batch_size: int):
+        super().__init__(interval)
+        self.batch_size = batch_size
+        self.reaped = 0
+        self.active_holds = None
+        self.counted_at = None
+
+    async def reap(self):
+        removed = 0
+        async with open_session() as db:
+            while True:
+                now = datetime.now()
+                expired = (
+                    await db.scalars(
+                        select(Booking.booking_id)
+                        .where(
+                            in_state(Booking.status, DRAFT),
+                            Booking.hold_expires_at <= now,
+                        )
+                        .limit(self.batch_size)
+                    )
+                ).all()
+                if not expired:
+                    break
+
+                # Re-check the hold so a draft paid for meanwhile is kept
+                batch = await db.execute(
+                    delete(Booking)
+                    .where(
+                        Booking.booking_id.in_(expired),
+                        in_state(Booking.status, DRAFT),
+                        Booking.hold_expires_at <= now,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+                removed += batch.rowcount
+                if len(expired) < self.batch_size:
+                    break
+
+            self.active_holds = await db.scalar(
+                select(func.count())
+                .select_from(Booking)
+                .where(
+                    in_state(Booking.status, DRAFT),
+                    Booking.hold_expires_at > datetime.now(),
+                )
+            )
+            self.counted_at = datetime.now()
+
+        self.reaped += removed
+        return removed
+
+    async def run_once(self):
+        removed = await self.reap()
+        if removed:
+            logger.info("Reaped {removed} expired booking holds", removed=removed)
+
+    def stats(self):
+        return {
+            "hold_seconds": BOOKING_HOLD_SECONDS,
+            "active_holds": self.active_holds,
+            "counted_at": self.counted_at,
+            "reaped": self.reaped,
+        }
+
+
+hold_reaper = HoldReaper(HOLD_REAP_INTERVAL, HOLD_REAP_BATCH_SIZE)
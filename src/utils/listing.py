@@ -0,0 +1,76 @@
+from config import EXPORT_BATCH_SIZE
+from database.database import open_session
+from datetime import time
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
+
+
+def columns(model, schema):
+    """The columns of `model` named by `schema`'s fields, for a projected select."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def _encode(value):
+    if isinstance(value, time):
+        return value.strftime("%H:%M")
+    return value.isoformat()
+
+
+def dump_json(content):
+    # Dates and times are handed to _encode so times keep the API's HH:MM form
+    return orjson.dumps(
+        content, default=_encode, option=orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+
+class ProjectedJSONResponse(ORJSONResponse):
+    """JSON response for rows already projected to a response schema's fields.
+
+    Handlers return it directly, so FastAPI skips validating every row
+    against the response_model, which stays on the route for the docs.
+    """
+
+    def __init__(self, content, cursor: str = None, **kwargs):
+        super().__init__(content, **kwargs)
+        if cursor is not None:
+            self.headers["X-Next-Cursor"] = cursor
+
+    def render(self, content):
+        return dump_json(content)
+
+
+async def keyset_page(db: AsyncSession, statement, key, after: str, limit: int):
+    """Return up to `limit` rows ordered by `key`, starting after the cursor.
+
+    `statement` is a projected select; the key is fetched alongside it even
+    when the schema does not return it. Also returns the cursor for the next
+    page, or None when the listing is complete; handlers send it back in the
+    X-Next-Cursor header.
+    """
+    if after is not None:
+        statement = statement.where(key > after)
+    rows = await db.execute(
+        statement.add_columns(key.label("_cursor")).order_by(key).limit(limit)
+    )
+
+    page, cursor = [], None
+    for row in rows:
+        item = row._asdict()
+        cursor = item.pop("_cursor")
+        page.append(item)
+    return page, str(cursor) if len(page) == limit else None
+
+
+async def stream_ndjson(statement):
+    """Yield rows as NDJSON, one server-side cursor batch at a time.
+
+    The request's session is closed before a streamed body is sent, so the
+    export opens its own.
+    """
+    async with open_session() as db:
+        result = await db.stream(
+            statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for batch in result.partitions():
+            yield b"".join(dump_json(row._asdict()) + b"\n" for row in batch)
@@ -0,0 +1,246 @@
+from config import (
+    SENDER_EMAIL_ID,
+    EMAIL_PASSKEY,
+    SMTP_HOST,
+    SMTP_PORT,
+    SMTP_STARTTLS,
+    SMTP_TIMEOUT,
+    SMTP_IDLE_TIMEOUT,
+    EMAIL_BATCH_SIZE,
+    EMAIL_MAX_RETRIES,
+    EMAIL_RETRY_BACKOFF,
+)
+from logs.log_config import logger
+from src.utils.metrics import metrics
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+import heapq
+import itertools
+import queue
+import smtplib
+import threading
+import time
+
+
+class EmailQueue:
+    """Delivers queued emails from a background thread.
+
+    One authenticated SMTP connection is kept open and reused for every batch
+    until it has been idle for ``idle_timeout`` seconds. Failed messages are
+    retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        sender: str,
+        password: str = None,
+        starttls: bool = True,
+        timeout: float = 30,
+        idle_timeout: float = 60,
+        batch_size: int = 20,
+        max_retries: int = 5,
+        retry_backoff: float = 1.0,
+    ):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._queue = queue.Queue()
+        self._retries = []
+        self._order = itertools.count()
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "queued": 0,
+            "sent": 0,
+            "failed": 0,
+            "retried": 0,
+            "connections": 0,
+            "batches": 0,
+        }
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="email-queue", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        if not self._thread:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def enqueue(self, receiver: str, subject: str, body: str):
+        msg = MIMEMultipart()
+        msg["From"] = self.sender
+        msg["To"] = receiver
+        msg["Subject"] = subject
+        msg.attach(MIMEText(body, "plain"))
+
+        self.start()
+        self._queue.put((receiver, msg.as_string(), 0))
+        self._count("queued")
+        logger.info("Email to {receiver} queued for delivery", receiver=receiver)
+
+    def depth(self):
+        return self._queue.qsize() + len(self._retries)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["depth"] = self.depth()
+        stats["connected"] = self._server is not None
+        return stats
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            server.starttls()
+        if self.password:
+            server.login(self.sender, self.password)
+        self._count("connections")
+        return server
+
+    def _disconnect(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except smtplib.SMTPException:
+            pass
+        except OSError:
+            pass
+        self._server = None
+
+    def _next_batch(self):
+        wait = self.idle_timeout
+        if self._retries:
+            wait = max(0, min(wait, self._retries[0][0] - time.monotonic()))
+
+        batch, stopping = [], False
+        try:
+            item = self._queue.get(timeout=wait)
+            if item is None:
+                stopping = True
+            else:
+                batch.append(item)
+        except queue.Empty:
+            pass
+
+        while not stopping and len(batch) < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                stopping = True
+            else:
+                batch.append(item)
+
+        now = time.monotonic()
+        while self._retries and len(batch) < self.batch_size:
+            if self._retries[0][0] > now and not stopping:
+                break
+            batch.append(heapq.heappop(self._retries)[2])
+
+        return batch, stopping
+
+    def _deliver(self, receiver: str, message: str):
+        if self._server is None:
+            self._server = self._connect()
+            self._server.sendmail(self.sender, receiver, message)
+            return
+
+        try:
+            self._server.sendmail(self.sender, receiver, message)
+        except smtplib.SMTPServerDisconnected:
+            # The server dropped our reused connection; reconnect once
+            self._server = self._connect()
+            self._server.sendmail(self.sender, receiver, message)
+
+    def _send_batch(self, batch):
+        self._count("batches")
+        for receiver, message, attempts in batch:
+            started = time.perf_counter()
+            try:
+                self._deliver(receiver, message)
+                metrics.smtp_finished(time.perf_counter() - started, "sent")
+                self._count("sent")
+                logger.info("Email sent successfully to {receiver}", receiver=receiver)
+            except (smtplib.SMTPException, OSError) as e:
+                metrics.smtp_finished(time.perf_counter() - started, "error")
+                logger.error(
+                    "Failed to send email to {receiver}: {error}",
+                    receiver=receiver,
+                    error=e,
+                )
+                self._disconnect()
+                self._retry(receiver, message, attempts)
+
+    def _retry(self, receiver: str, message: str, attempts: int):
+        if attempts >= self.max_retries:
+            self._count("failed")
+            logger.error(
+                "Giving up on email to {receiver} after {attempts} retries",
+                receiver=receiver,
+                attempts=attempts,
+            )
+            return
+
+        delay = self.retry_backoff * 2**attempts
+        heapq.heappush(
+            self._retries,
+            (
+                time.monotonic() + delay,
+                next(self._order),
+                (receiver, message, attempts + 1),
+            ),
+        )
+        self._count("retried")
+
+    def _run(self):
+        while True:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._send_batch(batch)
+            elif self._server is not None and not self._retries:
+                self._disconnect()
+
+            if stopping and not batch:
+                self._disconnect()
+                return
+            if stopping:
+                self._queue.put(None)
+
+
+email_queue = EmailQueue(
+    host=SMTP_HOST,
+    port=SMTP_PORT,
+    sender=SENDER_EMAIL_ID,
+    password=EMAIL_PASSKEY,
+    starttls=SMTP_STARTTLS,
+    timeout=SMTP_TIMEOUT,
+    idle_timeout=SMTP_IDLE_TIMEOUT,
+    batch_size=EMAIL_BATCH_SIZE,
+    max_retries=EMAIL_MAX_RETRIES,
+    retry_backoff=EMAIL_RETRY_BACKOFF,
+)
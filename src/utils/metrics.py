@@ -0,0 +1,249 @@
+from config import METRICS_DB_HEADERS
+from bisect import bisect_left
+from contextvars import ContextVar
+from database.database import request_engine
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+import threading
+import time
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1)
+STATEMENT_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple, values: tuple, extra: str = ""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(
+                f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+            )
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: tuple, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self.labelnames = labelnames
+        self._series = {}
+
+    def observe(self, value: float, labels: tuple = ()):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = _labels(self.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            label_text = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_number(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class DBUsage:
+    """Statements run and seconds spent in the database by one request."""
+
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+# Set by the middleware for the duration of a request. Threadpool calls copy
+# the context, so statements run by ThreadedSession land on the same object.
+_db_usage: ContextVar = ContextVar("db_usage", default=None)
+
+
+class Metrics:
+    """Request, database and SMTP metrics in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_progress = 0
+        self.requests = Counter(
+            "http_requests_total",
+            "HTTP requests by route and status.",
+            ("method", "route", "status"),
+        )
+        self.latency = Histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by route.",
+            LATENCY_BUCKETS,
+            ("method", "route"),
+        )
+        self.request_statements = Histogram(
+            "http_request_db_statements",
+            "SQL statements run per HTTP request, by route.",
+            STATEMENT_COUNT_BUCKETS,
+            ("method", "route"),
+        )
+        self.request_db_seconds = Counter(
+            "http_request_db_seconds_total",
+            "Seconds spent executing SQL while serving each route.",
+            ("method", "route"),
+        )
+        self.statements = Histogram(
+            "db_statement_duration_seconds",
+            "Latency of every SQL statement, including background jobs.",
+            STATEMENT_BUCKETS,
+        )
+        self.smtp = Histogram(
+            "smtp_send_duration_seconds",
+            "Time to hand one email to the SMTP server, by outcome.",
+            LATENCY_BUCKETS,
+            ("outcome",),
+        )
+
+    def request_started(self):
+        with self._lock:
+            self.in_progress += 1
+
+    def request_finished(
+        self, method: str, route: str, status: int, seconds: float, usage: DBUsage
+    ):
+        with self._lock:
+            self.in_progress -= 1
+            self.requests.inc((method, route, str(status)))
+            self.latency.observe(seconds, (method, route))
+            self.request_statements.observe(usage.statements, (method, route))
+            self.request_db_seconds.inc((method, route), usage.seconds)
+
+    def statement_finished(self, seconds: float):
+        usage = _db_usage.get()
+        with self._lock:
+            self.statements.observe(seconds)
+            if usage is not None:
+                usage.statements += 1
+                usage.seconds += seconds
+
+    def smtp_finished(self, seconds: float, outcome: str):
+        with self._lock:
+            self.smtp.observe(seconds, (outcome,))
+
+    def render(self, gauges: dict = None):
+        """The metrics, plus every number in `gauges` (a /system_stats dict)."""
+        with self._lock:
+            lines = [
+                "# HELP http_requests_in_progress HTTP requests being served.",
+                "# TYPE http_requests_in_progress gauge",
+                f"http_requests_in_progress {self.in_progress}",
+            ]
+            for family in (
+                self.requests,
+                self.latency,
+                self.request_statements,
+                self.request_db_seconds,
+                self.statements,
+                self.smtp,
+            ):
+                lines += family.render()
+
+        for section, stats in (gauges or {}).items():
+            for key, value in stats.items():
+                if isinstance(value, bool):
+                    value = int(value)
+                elif not isinstance(value, (int, float)):
+                    continue
+                name = f"flight_booking_{section}_{key}"
+                lines += [f"# TYPE {name} gauge", f"{name} {_number(value)}"]
+        return "\n".join(lines) + "\n"
+
+
+def watch_statements(statement_engine, registry: Metrics):
+    @event.listens_for(statement_engine, "before_cursor_execute")
+    def _started(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(statement_engine, "after_cursor_execute")
+    def _finished(conn, cursor, statement, parameters, context, executemany):
+        registry.statement_finished(time.perf_counter() - context._metrics_started)
+
+
+class MetricsMiddleware:
+    """Times every HTTP request and counts the SQL statements it runs.
+
+    A pure ASGI middleware, so streamed responses are not buffered. Requests
+    are labelled with their route template rather than the raw path, and
+    with "unmatched" when no route matched. With `db_headers` the response
+    carries X-DB-Query-Count and X-DB-Time-ms for the statements run before
+    its headers were sent.
+    """
+
+    def __init__(self, app, registry=None, db_headers: bool = METRICS_DB_HEADERS):
+        self.app = app
+        self.registry = registry or metrics
+        self.db_headers = db_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        usage = DBUsage()
+        token = _db_usage.set(usage)
+        status = 500
+        started = time.perf_counter()
+        self.registry.request_started()
+
+        async def send_with_usage(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.db_headers:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(usage.statements)
+                    headers["X-DB-Time-ms"] = f"{usage.seconds * 1000:.2f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_usage)
+        finally:
+            _db_usage.reset(token)
+            route = scope.get("route")
+            self.registry.request_finished(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+                time.perf_counter() - started,
+                usage,
+            )
+
+
+metrics = Metrics()
+watch_statements(request_engine, metrics)
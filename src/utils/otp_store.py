@@ -0,0 +1,206 @@
+from abc import abstractmethod
+from config import (
+    OTP_BACKEND,
+    OTP_TTL_SECONDS,
+    OTP_SWEEP_INTERVAL,
+    OTP_SWEEP_BATCH_SIZE,
+)
+from database.database import open_session
+from datetime import datetime, timedelta
+from logs.log_config import logger
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.user import OTP
+from src.utils.periodic import PeriodicJob
+import random
+import threading
+import uuid
+
+VERIFY_EMAIL = "verify_email"
+RESET_PASSWORD = "reset_password"
+PAYMENT = "payment"
+
+
+def payment_purpose(booking_id: str):
+    # Payment OTPs are per booking, so one booking's OTP cannot confirm another
+    return f"{PAYMENT}:{booking_id}"
+
+
+class OTPStore(PeriodicJob):
+    """Keeps one OTP per (email, purpose) until it is used or its TTL runs out.
+
+    A new OTP replaces the previous one for the same purpose, and an OTP can
+    be consumed only once. Expired entries are removed by a sweeper task that
+    runs for the lifetime of the app.
+    """
+
+    name = "OTP sweep"
+
+    def __init__(self, ttl: int, sweep_interval: float, sweep_batch_size: int):
+        super().__init__(sweep_interval)
+        self.ttl = timedelta(seconds=ttl)
+        self.sweep_batch_size = sweep_batch_size
+        self.issued = 0
+        self.consumed = 0
+        self.rejected = 0
+        self.swept = 0
+
+    def new_code(self):
+        return str(random.randint(1000, 9999))
+
+    @abstractmethod
+    async def issue(self, db: AsyncSession, user_id: str, email: str, purpose: str): ...
+
+    @abstractmethod
+    async def consume(self, db: AsyncSession, email: str, purpose: str, otp: str): ...
+
+    @abstractmethod
+    async def sweep(self): ...
+
+    async def run_once(self):
+        removed = await self.sweep()
+        if removed:
+            logger.info("Swept {removed} expired OTPs", removed=removed)
+
+    def stats(self):
+        return {
+            "backend": type(self).__name__,
+            "ttl_seconds": int(self.ttl.total_seconds()),
+            "issued": self.issued,
+            "consumed": self.consumed,
+            "rejected": self.rejected,
+            "swept": self.swept,
+        }
+
+
+class DatabaseOTPStore(OTPStore):
+    """OTPs in the `otps` table, shared by every app process."""
+
+    async def issue(self, db: AsyncSession, user_id: str, email: str, purpose: str):
+        code = self.new_code()
+        now = datetime.now()
+
+        # A concurrent issue for the same email and purpose can win the
+        # unique index between our delete and insert; replace it once more.
+        for attempt in range(2):
+            await db.execute(
+                delete(OTP).where(OTP.email == email, OTP.purpose == purpose)
+            )
+            db.add(
+                OTP(
+                    id=str(uuid.uuid4()),
+                    user_id=user_id,
+                    email=email,
+                    otp=code,
+                    purpose=purpose,
+                    created_at=now,
+                    expires_at=now + self.ttl,
+                )
+            )
+            try:
+                await db.commit()
+                break
+            except IntegrityError:
+                await db.rollback()
+                if attempt:
+                    raise
+
+        self.issued += 1
+        return code
+
+    async def consume(self, db: AsyncSession, email: str, purpose: str, otp: str):
+        used = await db.execute(
+            delete(OTP).where(
+                OTP.email == email,
+                OTP.purpose == purpose,
+                OTP.otp == otp,
+                OTP.expires_at > datetime.now(),
+            )
+        )
+        await db.commit()
+
+        if used.rowcount != 1:
+            self.rejected += 1
+            return False
+        self.consumed += 1
+        return True
+
+    async def sweep(self):
+        removed = 0
+        async with open_session() as db:
+            while True:
+                expired = (
+                    await db.scalars(
+                        select(OTP.id)
+                        .where(OTP.expires_at <= datetime.now())
+                        .limit(self.sweep_batch_size)
+                    )
+                ).all()
+                if not expired:
+                    break
+
+                batch = await db.execute(delete(OTP).where(OTP.id.in_(expired)))
+                await db.commit()
+                removed += batch.rowcount
+                if len(expired) < self.sweep_batch_size:
+                    break
+
+        self.swept += removed
+        return removed
+
+
+class MemoryOTPStore(OTPStore):
+    """OTPs held in this process only; for single-node deployments."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    async def issue(self, db: AsyncSession, user_id: str, email: str, purpose: str):
+        code = self.new_code()
+        with self._lock:
+            self._entries[(email, purpose)] = (code, datetime.now() + self.ttl)
+            self.issued += 1
+        return code
+
+    async def consume(self, db: AsyncSession, email: str, purpose: str, otp: str):
+        with self._lock:
+            entry = self._entries.get((email, purpose))
+            if entry is None or entry[0] != otp or entry[1] <= datetime.now():
+                self.rejected += 1
+                return False
+            del self._entries[(email, purpose)]
+            self.consumed += 1
+            return True
+
+    async def sweep(self):
+        now = datetime.now()
+        with self._lock:
+            expired = [
+                key
+                for key, (_, expires_at) in self._entries.items()
+                if expires_at <= now
+            ]
+            for key in expired:
+                del self._entries[key]
+            self.swept += len(expired)
+        return len(expired)
+
+    def stats(self):
+        stats = super().stats()
+        stats["active"] = len(self._entries)
+        return stats
+
+
+OTP_BACKENDS = {"database": DatabaseOTPStore, "memory": MemoryOTPStore}
+
+if OTP_BACKEND not in OTP_BACKENDS:
+    raise ValueError(
+        f"OTP_BACKEND must be one of {', '.join(OTP_BACKENDS)}, not {OTP_BACKEND!r}"
+    )
+
+otp_store = OTP_BACKENDS[OTP_BACKEND](
+    OTP_TTL_SECONDS, OTP_SWEEP_INTERVAL, OTP_SWEEP_BATCH_SIZE
+)
@@ -0,0 +1,84 @@
+from config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from logs.log_config import logger
+from passlib.context import CryptContext
+import asyncio
+import threading
+import time
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded pool of worker threads.
+
+    bcrypt releases the GIL, so ``workers`` caps how many cores password work
+    may use. Once ``max_pending`` calls are queued or running, new ones are
+    rejected with 503 instead of piling up behind a login storm.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bcrypt"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {"completed": 0, "rejected": 0, "busy_time_total_ms": 0.0}
+
+    async def hash(self, password: str):
+        return await self._submit(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed: str):
+        return await self._submit(pwd_context.verify, password, hashed)
+
+    def _timed(self, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            busy_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._stats["completed"] += 1
+                self._stats["busy_time_total_ms"] += busy_ms
+
+    async def _submit(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats["rejected"] += 1
+                logger.warning("Password hashing queue is full, rejecting request")
+                raise HTTPException(
+                    status_code=503, detail="Server busy, please try again shortly"
+                )
+            self._pending += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._timed, fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = self._pending
+        stats["workers"] = self.workers
+        stats["max_pending"] = self.max_pending
+        return stats
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+
+
+async def hash_password(password: str):
+    return await password_hasher.hash(password)
+
+
+async def verify_password(password: str, hashed: str):
+    return await password_hasher.verify(password, hashed)
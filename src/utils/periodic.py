@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from logs.log_config import logger
+import asyncio
+
+
+class PeriodicJob(ABC):
+    """Runs `run_once` every `interval` seconds for the lifetime of the app.
+
+    Started and stopped from the app lifespan. A failing run is logged and
+    the job carries on with the next one.
+    """
+
+    name = "Periodic job"
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task = None
+
+    @abstractmethod
+    async def run_once(self): ...
+
+    async def _run_forever(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error("{name} failed: {error}", name=self.name, error=e)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
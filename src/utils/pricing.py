@@ -0,0 +1,73 @@
+from config import (
+    FARE_CHILD_MULTIPLIER,
+    FARE_DEMAND_TIERS,
+    FARE_INFANT_FLAT,
+    FARE_INFANT_MULTIPLIER,
+    FARE_TAX_RATE,
+)
+import numpy as np
+
+
+def parse_demand_tiers(text: str):
+    """Parse "seats:factor,..." into (seats, factor) pairs, loosest first."""
+    tiers = []
+    for part in filter(None, (part.strip() for part in text.split(","))):
+        seats, factor = part.split(":")
+        tiers.append((int(seats), float(factor)))
+    return sorted(tiers, reverse=True)
+
+
+class FareEngine:
+    """Quotes bills for whole arrays of flights and parties at once.
+
+    The flight price is the adult fare. Children and infants pay their
+    multiplier of it plus, for infants, a flat amount. When few seats are
+    left the price is raised by the tightest matching demand tier, and tax
+    is added on top. Every argument may be a scalar or an array; they are
+    broadcast against each other, so one call quotes a list of flights for
+    one party or many bookings for their flights.
+    """
+
+    def __init__(
+        self,
+        child_multiplier: float,
+        infant_multiplier: float,
+        infant_flat: float,
+        tax_rate: float,
+        demand_tiers: list,
+    ):
+        self.child_multiplier = child_multiplier
+        self.infant_multiplier = infant_multiplier
+        self.infant_flat = infant_flat
+        self.tax_rate = tax_rate
+        self.demand_tiers = demand_tiers
+
+    def demand_factor(self, available_capacity):
+        seats = np.asarray(available_capacity)
+        factor = np.ones(seats.shape)
+        for limit, surcharge in self.demand_tiers:
+            factor = np.where(seats <= limit, surcharge, factor)
+        return factor
+
+    def quote(self, flight_price, available_capacity, adults=1, children=0, infants=0):
+        price = np.asarray(flight_price, dtype=float) * self.demand_factor(
+            available_capacity
+        )
+        bill = (
+            np.asarray(adults) * price
+            + np.asarray(children) * (price * self.child_multiplier)
+            + np.asarray(infants) * (price * self.infant_multiplier + self.infant_flat)
+        )
+        return np.round(bill * (1 + self.tax_rate), 2)
+
+    def quote_one(self, *args, **kwargs):
+        return float(self.quote(*args, **kwargs))
+
+
+fare_engine = FareEngine(
+    FARE_CHILD_MULTIPLIER,
+    FARE_INFANT_MULTIPLIER,
+    FARE_INFANT_FLAT,
+    FARE_TAX_RATE,
+    parse_demand_tiers(FARE_DEMAND_TIERS),
+)
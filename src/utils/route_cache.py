@@ -0,0 +1,188 @@
+from config import FARE_CACHE_SIZE, ROUTE_CACHE_SIZE, ROUTE_CACHE_TTL
+from collections import OrderedDict
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, timedelta
+from src.models.flights import Flight
+from src.utils.events import flight_events
+import threading
+import time
+
+
+class RouteCache:
+    """Bounded LRU of the flights on a (journey_date, start_point, end_point) route.
+
+    Subscribed to flight_events, so every route a commit changes is dropped.
+    A search that read the database before such an invalidation does not
+    store its result, so a stale list cannot be cached. Entries also expire
+    after `ttl` seconds, which bounds staleness when several app processes
+    each keep their own cache.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, route: tuple):
+        with self._lock:
+            entry = self._entries.get(route)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            flights, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[route]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(route)
+            self.hits += 1
+            return flights
+
+    def put(self, route: tuple, flights: list, version: int):
+        if self.max_size <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[route] = (flights, expires_at)
+            self._entries.move_to_end(route)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *routes: tuple):
+        with self._lock:
+            self.version += 1
+            for route in routes:
+                if self._entries.pop(route, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class FareCalendarCache(RouteCache):
+    """Route cache keyed by (start_point, end_point, from_date, to_date).
+
+    A changed route drops every cached window on it that covers the date.
+    """
+
+    def invalidate(self, *routes: tuple):
+        with self._lock:
+            self.version += 1
+            for journey_date, start_point, end_point in routes:
+                stale = [
+                    window
+                    for window in self._entries
+                    if window[:2] == (start_point, end_point)
+                    and window[2] <= journey_date <= window[3]
+                ]
+                for window in stale:
+                    del self._entries[window]
+                    self.invalidations += 1
+
+
+route_cache = RouteCache(ROUTE_CACHE_SIZE, ROUTE_CACHE_TTL)
+flight_events.subscribe(route_cache.invalidate)
+fare_cache = FareCalendarCache(FARE_CACHE_SIZE, ROUTE_CACHE_TTL)
+flight_events.subscribe(fare_cache.invalidate)
+
+
+async def route_flights(
+    db: AsyncSession, journey_date: date, start_point: str, end_point: str
+):
+    """All flights on a route as plain rows, served from the route cache."""
+    route = (journey_date, start_point, end_point)
+    flights = route_cache.get(route)
+    if flights is not None:
+        return flights
+
+    version = route_cache.version
+    rows = await db.execute(
+        select(
+            Flight.flight_name,
+            Flight.journey_date,
+            Flight.journey_time,
+            Flight.available_capacity,
+            Flight.flight_price,
+        ).where(
+            Flight.journey_date == journey_date,
+            Flight.start_point == start_point,
+            Flight.end_point == end_point,
+            Flight.is_cancelled == False,
+        )
+    )
+    flights = [dict(row._mapping) for row in rows]
+    route_cache.put(route, flights, version)
+    return flights
+
+
+async def fare_calendar(
+    db: AsyncSession, start_point: str, end_point: str, from_date: date, to_date: date
+):
+    """Cheapest fare, seats left and bookable flights for each day of a window."""
+    window = (start_point, end_point, from_date, to_date)
+    days = fare_cache.get(window)
+    if days is not None:
+        return days
+
+    version = fare_cache.version
+    rows = await db.execute(
+        select(
+            Flight.journey_date,
+            func.min(Flight.flight_price),
+            func.sum(Flight.available_capacity),
+            func.count(),
+        )
+        .where(
+            Flight.start_point == start_point,
+            Flight.end_point == end_point,
+            Flight.journey_date.between(from_date, to_date),
+            Flight.available_capacity > 0,
+            Flight.is_cancelled == False,
+        )
+        .group_by(Flight.journey_date)
+    )
+    found = {journey_date: row for journey_date, *row in rows}
+
+    days = []
+    for offset in range((to_date - from_date).days + 1):
+        journey_date = from_date + timedelta(days=offset)
+        min_fare, available_seats, flights = found.get(journey_date, (None, 0, 0))
+        days.append(
+            {
+                "journey_date": journey_date,
+                "min_fare": min_fare,
+                "available_seats": available_seats,
+                "flights": flights,
+            }
+        )
+    fare_cache.put(window, days, version)
+    return days
@@ -0,0 +1,336 @@
+from config import SEAT_LAYOUT
+from fastapi import HTTPException
+from functools import lru_cache
+from logs.log_config import logger
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.booking import Booking, CONFIRMED
+from src.models.flights import Flight, FlightSeatMap
+from src.utils.states import in_state
+
+SWAP_ATTEMPTS = 5
+
+
+@lru_cache(maxsize=64)
+def _cuts(layout: str, rows: int):
+    """(start, end) of every section of every row in the rendered string."""
+    width = len(layout.replace("-", ""))
+    sections = SeatMap(layout, 0).sections
+    return [
+        (row * width + first, row * width + end)
+        for row in range(rows)
+        for first, end in sections
+    ]
+
+
+# Seat maps are read far more often than they change, and a cabin's
+# occupancy fully determines its rows, so recently drawn cabins are kept
+@lru_cache(maxsize=1024)
+def _rows(layout: str, seat_count: int, occupied: int):
+    taken = format(occupied, f"0{seat_count}b")[::-1]
+    taken = taken.replace("0", ".").replace("1", "x")
+    rows = -(-seat_count // len(layout.replace("-", "")))
+    per_row = layout.count("-") + 1
+    pieces = [taken[first:end] for first, end in _cuts(layout, rows)]
+    lines = [
+        "-".join(pieces[first : first + per_row])
+        for first in range(0, len(pieces), per_row)
+    ]
+    # The last row may be partly built; its missing seats are left out
+    lines[-1] = lines[-1].rstrip("-")
+    return tuple(lines)
+
+
+class SeatMap:
+    """One flight's seat occupancy, decoded into a single Python int.
+
+    Seat n is bit n, numbered row by row across the layout's letters, so a
+    search over the whole cabin is a handful of shifts and ANDs on one
+    integer instead of a loop over seats.
+    """
+
+    def __init__(self, layout: str, seat_count: int, occupied: int = 0, version=0):
+        self.layout = layout
+        self.letters = layout.replace("-", "")
+        self.width = len(self.letters)
+        self.seat_count = seat_count
+        self.occupied = occupied
+        self.version = version
+        self.rows = -(-seat_count // self.width)
+        # Runs of letters between aisles, as (first column, end column)
+        self.sections = []
+        column = 0
+        for section in layout.split("-"):
+            self.sections.append((column, column + len(section)))
+            column += len(section)
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(
+            row.layout,
+            row.seat_count,
+            int.from_bytes(row.occupied, "little"),
+            row.version,
+        )
+
+    def encode(self, occupied: int = None):
+        occupied = self.occupied if occupied is None else occupied
+        return occupied.to_bytes((self.seat_count + 7) // 8, "little")
+
+    @property
+    def free(self):
+        return ((1 << self.seat_count) - 1) & ~self.occupied
+
+    def label(self, seat: int):
+        row, column = divmod(seat, self.width)
+        return f"{row + 1}{self.letters[column]}"
+
+    def seat(self, label: str):
+        row, column = int(label[:-1]) - 1, self.letters.find(label[-1])
+        seat = row * self.width + column
+        if row < 0 or column < 0 or seat >= self.seat_count:
+            raise ValueError(f"No seat {label} in this cabin")
+        return seat
+
+    def _every_row(self, row_bits: int):
+        # row_bits repeated once per row: multiply by 1 + 2**w + 2**2w + ...
+        ones = ((1 << self.rows * self.width) - 1) // ((1 << self.width) - 1)
+        return row_bits * ones
+
+    def _starts(self, party: int, across_aisles: bool):
+        """Columns a block of `party` adjacent seats may start at."""
+        bits = 0
+        sections = [(0, self.width)] if across_aisles else self.sections
+        for first, end in sections:
+            for column in range(first, end - party + 1):
+                bits |= 1 << column
+        return bits
+
+    def best_block(self, party: int):
+        """Seat numbers for a party of `party`, or None if too few are free.
+
+        Prefers the front-most block of adjacent seats between two aisles,
+        then one spanning an aisle, and otherwise the fewest consecutive
+        rows that hold the party.
+        """
+        free = self.free
+        if party < 1 or free.bit_count() < party:
+            return None
+
+        # Bit n of runs is set when seats n .. n + party - 1 are all free
+        runs = free
+        for _ in range(party - 1):
+            runs &= runs >> 1
+        for across_aisles in (False, True):
+            starts = runs & self._every_row(self._starts(party, across_aisles))
+            if starts:
+                first = (starts & -starts).bit_length() - 1
+                return list(range(first, first + party))
+        return self._fewest_rows(free, party)
+
+    def _fewest_rows(self, free: int, party: int):
+        row_mask = (1 << self.width) - 1
+        counts = [
+            (free >> row * self.width & row_mask).bit_count()
+            for row in range(self.rows)
+        ]
+        best, first, total = None, 0, 0
+        for last, count in enumerate(counts):
+            total += count
+            while total - counts[first] >= party:
+                total -= counts[first]
+                first += 1
+            if total >= party and (best is None or last - first < best[1] - best[0]):
+                best = (first, last)
+
+        offset = best[0] * self.width
+        remaining = free >> offset
+        seats = []
+        while len(seats) < party:
+            lowest = remaining & -remaining
+            seats.append(offset + lowest.bit_length() - 1)
+            remaining ^= lowest
+        return seats
+
+    def render(self):
+        """The cabin as one string per row: "." free, "x" taken, "-" aisle."""
+        return {
+            "layout": self.layout,
+            "rows": _rows(self.layout, self.seat_count, self.occupied),
+            "seat_count": self.seat_count,
+            "free": self.free.bit_count(),
+            "version": self.version,
+        }
+
+
+class SeatMaps:
+    """Reads and updates seat maps with compare-and-swap on their version.
+
+    Every change reads the map, works out the new bitmap in Python and
+    writes it back only if the version is still the one read, retrying a
+    few times when a concurrent request got there first. Maps are created
+    with new flights; a flight registered before seat maps existed gets one
+    on first use, sized for its remaining seats plus those its confirmed
+    bookings hold, which stay unassigned.
+    """
+
+    def __init__(self, layout: str):
+        self.layout = layout
+        self.created = 0
+        self.assigned = 0
+        self.released = 0
+        self.conflicts = 0
+
+    def new_row(self, flight_id: str, seat_count: int):
+        seat_map = SeatMap(self.layout, seat_count)
+        return {
+            "flight_id": flight_id,
+            "layout": seat_map.layout,
+            "seat_count": seat_count,
+            "occupied": seat_map.encode(),
+            "version": 0,
+        }
+
+    async def read(self, db: AsyncSession, flight_id: str):
+        row = (
+            await db.execute(
+                select(
+                    FlightSeatMap.layout,
+                    FlightSeatMap.seat_count,
+                    FlightSeatMap.occupied,
+                    FlightSeatMap.version,
+                ).where(FlightSeatMap.flight_id == flight_id)
+            )
+        ).first()
+        return SeatMap.from_row(row) if row is not None else None
+
+    async def load(self, db: AsyncSession, flight_id: str):
+        """The flight's seat map, creating it if needed.
+
+        Creating commits, so call this before starting a transaction that
+        changes the map.
+        """
+        seat_map = await self.read(db, flight_id)
+        if seat_map is not None:
+            return seat_map
+
+        available = await db.scalar(
+            select(Flight.available_capacity).where(Flight.flight_id == flight_id)
+        )
+        if available is None:
+            logger.error("No flight found with ID: {flight_id}", flight_id=flight_id)
+            raise HTTPException(status_code=404, detail="Flight not found")
+        held = await db.scalar(
+            select(
+                func.coalesce(
+                    func.sum(Booking.no_of_adults + Booking.no_of_children), 0
+                )
+            ).where(in_state(Booking.status, CONFIRMED), Booking.flight_id == flight_id)
+        )
+
+        db.add(FlightSeatMap(**self.new_row(flight_id, available + held)))
+        try:
+            await db.commit()
+            self.created += 1
+        except IntegrityError:
+            # Another request created it first
+            await db.rollback()
+        return await self.read(db, flight_id)
+
+    async def _swap(
+        self, db: AsyncSession, flight_id: str, seat_map: SeatMap, **values
+    ):
+        swapped = await db.execute(
+            update(FlightSeatMap)
+            .where(
+                FlightSeatMap.flight_id == flight_id,
+                FlightSeatMap.version == seat_map.version,
+            )
+            .values(version=FlightSeatMap.version + 1, **values)
+            .execution_options(synchronize_session=False)
+        )
+        if swapped.rowcount != 1:
+            self.conflicts += 1
+            return False
+        return True
+
+    async def _change(self, db: AsyncSession, flight_id: str, change):
+        """Apply `change(seat_map)`, which returns (new values, result) or
+        None when the map should be left alone, until it wins the swap."""
+        for _ in range(SWAP_ATTEMPTS):
+            seat_map = await self.read(db, flight_id)
+            if seat_map is None:
+                return None
+            changed = change(seat_map)
+            if changed is None:
+                return None
+            values, result = changed
+            if await self._swap(db, flight_id, seat_map, **values):
+                return result
+
+        await db.rollback()
+        logger.warning("Seat map busy for flight ID: {flight_id}", flight_id=flight_id)
+        raise HTTPException(status_code=409, detail="Seat map busy, try again")
+
+    async def assign(self, db: AsyncSession, flight_id: str, party: int):
+        """Take the best block of seats for `party` and return their labels."""
+
+        def take(seat_map):
+            seats = seat_map.best_block(party)
+            if seats is None:
+                return None
+            occupied = seat_map.occupied
+            for seat in seats:
+                occupied |= 1 << seat
+            return {"occupied": seat_map.encode(occupied)}, [
+                seat_map.label(seat) for seat in seats
+            ]
+
+        labels = await self._change(db, flight_id, take)
+        if labels is None:
+            await db.rollback()
+            logger.warning(
+                "No seats left to assign on flight ID: {flight_id}",
+                flight_id=flight_id,
+            )
+            raise HTTPException(status_code=400, detail="Not enough seats available")
+        self.assigned += len(labels)
+        return labels
+
+    async def release(self, db: AsyncSession, flight_id: str, labels: list):
+        def give_back(seat_map):
+            occupied = seat_map.occupied
+            for label in labels:
+                occupied &= ~(1 << seat_map.seat(label))
+            return {"occupied": seat_map.encode(occupied)}, len(labels)
+
+        released = await self._change(db, flight_id, give_back)
+        self.released += released or 0
+
+    async def fit(self, db: AsyncSession, flight_id: str, available: int):
+        """Add seats at the back so the map has at least `available` free."""
+
+        def grow(seat_map):
+            missing = available - seat_map.free.bit_count()
+            if missing <= 0:
+                return None
+            seat_map.seat_count += missing
+            return {
+                "seat_count": seat_map.seat_count,
+                "occupied": seat_map.encode(),
+            }, missing
+
+        await self._change(db, flight_id, grow)
+
+    def stats(self):
+        return {
+            "layout": self.layout,
+            "created": self.created,
+            "assigned": self.assigned,
+            "released": self.released,
+            "conflicts": self.conflicts,
+        }
+
+
+seat_maps = SeatMaps(SEAT_LAYOUT)
@@ -0,0 +1,29 @@
+from sqlalchemy import literal_column, update
+
+
+def in_state(column, state: str):
+    """`column = 'state'` with the state written into the SQL.
+
+    A bound parameter would hide the value from the planner, which then
+    cannot prove the query matches a partial index such as
+    ix_bookings_draft_hold_expiry.
+    """
+    return column == literal_column(f"'{state}'")
+
+
+def transition(model, transitions: dict, source: str, target: str, *where, **values):
+    """UPDATE moving rows matching `where` from `source` to `target`.
+
+    Raises ValueError for a move `transitions` does not allow. The statement
+    only touches rows still in `source`, so callers check its rowcount to
+    learn whether another request got there first, and refresh any
+    loaded objects themselves.
+    """
+    if target not in transitions[source]:
+        raise ValueError(f"{model.__tablename__} cannot move from {source} to {target}")
+    return (
+        update(model)
+        .where(*where, in_state(model.status, source))
+        .values(status=target, **values)
+        .execution_options(synchronize_session=False)
+    )
@@ -1,51 +1,50 @@
-from database.database import SessionLocal
-from src.models.user import User, OTP
+from src.models.user import User, UNVERIFIED, ACTIVE, DELETED
 from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from logs.log_config import logger
-from passlib.context import CryptContext
+from src.utils.passwords import verify_password
 from config import SECRET_KEY, ALGORITHM
 from datetime import datetime, timedelta, timezone
 import jwt
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from config import SENDER_EMAIL_ID, EMAIL_PASSKEY
-import random, uuid
+from src.utils.mailer import email_queue
+from src.utils.otp_store import otp_store
 
-
-db = SessionLocal()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def find_same_email(email: str):
+async def find_same_email(db: AsyncSession, email: str):
     try:
-        find_same_email = db.query(User).filter(User.email == email).first()
-        logger.info(f"Verifying email: {email}")
+        find_same_email = await db.scalar(select(User).where(User.email == email))
+        logger.info("Verifying email: {email}", email=email)
 
         if find_same_email:
-            if find_same_email.is_active == True:
-                logger.error(f"Email {email} already exists.")
+            if find_same_email.status != DELETED:
+                logger.error("Email {email} already exists.", email=email)
                 raise HTTPException(status_code=400, detail="Email already exists")
-            if find_same_email.is_active == False:
-                logger.error(f"Email {email} exists but the account is deleted.")
+            if find_same_email.status == DELETED:
+                logger.error(
+                    "Email {email} exists but the account is deleted.", email=email
+                )
                 raise HTTPException(
                     status_code=400,
                     detail="Email already exists but this account is deleted. Try with a different email",
                 )
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in find_same_email: {e}")
+        logger.error("Error in find_same_email: {error}", error=e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
-def pass_checker(user_pass: str, hash_pass: str):
+async def pass_checker(user_pass: str, hash_pass: str):
     try:
-        if pwd_context.verify(user_pass, hash_pass):
+        if await verify_password(user_pass, hash_pass):
             return True
         else:
             logger.error("Password is incorrect")
             raise HTTPException(status_code=401, detail="Password is incorrect")
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in pass_checker: {e}")
+        logger.error("Error in pass_checker: {error}", error=e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
@@ -60,110 +59,53 @@ def get_token(id: str, first_name: str, last_name: str, email: str, phone_no: st
             "exp": datetime.now(timezone.utc) + timedelta(days=7),
         }
         access_token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
-        logger.info(f"Token generated for user {email}")
+        logger.info("Token generated for user {email}", email=email)
         return {"access_token": access_token}
     except Exception as e:
-        logger.error(f"Error in get_token: {e}")
+        logger.error("Error in get_token: {error}", error=e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
-def decode_token(token: str):
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
-        id = payload.get("id")
-        first_name = payload.get("first_name")
-        last_name = payload.get("last_name")
-        email = payload.get("email")
-        phone_no = payload.get("phone_no")
-
-        if not id or not first_name or not last_name or not email or not phone_no:
-            logger.error("Invalid token")
-            raise HTTPException(status_code=403, detail="Invalid token")
-        logger.info("Token decoded successfully")
-        return id, first_name, last_name, email, phone_no
-
-    except jwt.ExpiredSignatureError:
-        logger.error("Token has expired")
-        raise HTTPException(status_code=403, detail="Token has expired")
-    except jwt.InvalidTokenError as e:
-        logger.error(f"Invalid token: {e}")
-        raise HTTPException(status_code=403, detail="Invalid token")
-
-
-def send_email(receiver: str, subject: str, body: str):
+async def generate_otp(db: AsyncSession, email: str, purpose: str):
     try:
-        smtp_server = "smtp.gmail.com"
-        smtp_port = 587
-        smtp_user = SENDER_EMAIL_ID
-        smtp_pass = EMAIL_PASSKEY
-
-        msg = MIMEMultipart()
-        msg["From"] = SENDER_EMAIL_ID
-        msg["To"] = receiver
-        msg["Subject"] = subject
-        msg.attach(MIMEText(body, "plain"))
-
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.set_debuglevel(1)
-            server.starttls()
-            server.login(smtp_user, smtp_pass)
-            server.sendmail(SENDER_EMAIL_ID, receiver, msg.as_string())
-        logger.info(f"OTP email sent to {receiver}")
-        return True
-    except Exception as e:
-        logger.error(f"Error in send_email: {e}")
-        raise HTTPException(status_code=500, detail="Failed to send OTP email")
-
-
-def generate_otp(email: str):
-    try:
-        logger.info(f"Getting user data for email: {email}")
-        find_user = (
-            db.query(User)
-            .filter(
-                User.email == email, User.is_active == True, User.is_deleted == False
+        logger.info("Getting user data for email: {email}", email=email)
+        find_user = await db.scalar(
+            select(User).where(
+                User.email == email, User.status.in_((UNVERIFIED, ACTIVE))
             )
-            .first()
         )
 
         if not find_user:
-            logger.error(f"User not found with email: {email}")
+            logger.error("User not found with email: {email}", email=email)
             raise HTTPException(status_code=400, detail="User not found")
 
-        logger.info(f"Generating OTP for {email}")
-        random_otp = random.randint(1000, 9999)
-
-        new_otp = OTP(
-            id=str(uuid.uuid4()),
-            user_id=find_user.id,
-            email=find_user.email,
-            otp=random_otp,
+        logger.info(
+            "Generating {purpose} OTP for {email}", purpose=purpose, email=email
         )
+        random_otp = await otp_store.issue(db, find_user.id, find_user.email, purpose)
 
-        logger.info(f"Sending OTP email to {email}")
-        send_email(find_user.email, "Send OTP", f"OTP is {random_otp}")
-
-        db.add(new_otp)
-        db.commit()
-        db.refresh(new_otp)
-        logger.success(f"Verification OTP sent successfully to {email}")
+        logger.info("Queueing OTP email to {email}", email=email)
+        email_queue.enqueue(find_user.email, "Send OTP", f"OTP is {random_otp}")
+        logger.success("Verification OTP queued successfully for {email}", email=email)
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in generate_otp: {e}")
+        logger.error("Error in generate_otp: {error}", error=e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
-def verify_otp(email: str, otp: str):
+async def verify_otp(db: AsyncSession, email: str, otp: str, purpose: str):
     try:
-        logger.info(f"Verifying OTP for email: {email}")
-        find_otp = db.query(OTP).filter(OTP.email == email, OTP.otp == otp).first()
-
-        if not find_otp:
-            logger.error(f"Wrong OTP entered for email: {email}")
+        logger.info(
+            "Verifying {purpose} OTP for email: {email}", purpose=purpose, email=email
+        )
+        if not await otp_store.consume(db, email, purpose, otp):
+            logger.error("Wrong or expired OTP entered for email: {email}", email=email)
             raise HTTPException(status_code=400, detail="OTP not found")
 
         logger.info("OTP verified successfully")
-        db.delete(find_otp)
-        db.commit()
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in verify_otp: {e}")
+        logger.error("Error in verify_otp: {error}", error=e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -0,0 +1,244 @@
+from datetime import datetime
+from logs.log_config import logger
+from sqlalchemy import delete, func, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.booking import (
+    Booking,
+    BOOKING_TRANSITIONS,
+    CANCELLED,
+    CONFIRMED,
+    WAITLISTED,
+    WaitlistEntry,
+)
+from src.models.flights import Flight
+from src.utils.booking import reserve_seats
+from src.utils.mailer import email_queue
+from src.utils.seats import seat_maps
+from src.utils.states import transition
+
+
+def _head(flight_id: str, seats: int, after: int = 0):
+    """The first booking queued after `after` for a party of `seats`."""
+    return (
+        select(
+            WaitlistEntry.position,
+            WaitlistEntry.booking_id,
+            WaitlistEntry.seats,
+            Booking.email,
+        )
+        .join(Booking, Booking.booking_id == WaitlistEntry.booking_id)
+        .where(
+            WaitlistEntry.flight_id == flight_id,
+            WaitlistEntry.seats == seats,
+            WaitlistEntry.position > after,
+        )
+        .order_by(WaitlistEntry.position)
+        .limit(1)
+    )
+
+
+class Waitlist:
+    """Per-flight queues of bookings paid for while the flight was full.
+
+    When seats free up, the earliest queued bookings that fit are confirmed
+    in the transaction that freed them. The queue is never scanned: for each
+    party size that could fit, ix_waitlist_flight_seats_position gives the
+    first booking of that size, and every promotion takes the earliest of
+    those heads and seeks the next booking of its size. The work is one
+    seek per promotion plus one per party size, however long the queue.
+    """
+
+    def __init__(self):
+        self.joined = 0
+        self.promoted = 0
+        self.left = 0
+        self.closed = 0
+
+    async def join(self, db: AsyncSession, booking: Booking):
+        """Queue a booking the caller has just moved to waitlisted."""
+        db.add(
+            WaitlistEntry(
+                flight_id=booking.flight_id,
+                booking_id=booking.booking_id,
+                seats=booking.no_of_adults + booking.no_of_children,
+            )
+        )
+        await db.flush()
+        self.joined += 1
+
+    async def leave(self, db: AsyncSession, booking_id: str):
+        """Cancel a waitlisted booking; False if it was not waitlisted anymore."""
+        left = await db.execute(
+            transition(
+                Booking,
+                BOOKING_TRANSITIONS,
+                WAITLISTED,
+                CANCELLED,
+                Booking.booking_id == booking_id,
+                canceled_at=datetime.now(),
+            )
+        )
+        if left.rowcount != 1:
+            return False
+        await db.execute(
+            delete(WaitlistEntry).where(WaitlistEntry.booking_id == booking_id)
+        )
+        self.left += 1
+        return True
+
+    async def promote(self, db: AsyncSession, flight_id: str):
+        """Confirm the waitlisted bookings that fit the flight's free seats.
+
+        Runs in the caller's transaction and takes the seats and seat labels
+        for them there. The flight's seat map must already exist. Returns
+        (booking_id, email, seat labels) per promoted booking; hand them to
+        notify() once the transaction has committed.
+        """
+        free = await db.scalar(
+            select(Flight.available_capacity)
+            .where(Flight.flight_id == flight_id, Flight.is_cancelled == False)
+            .with_for_update()
+        )
+        largest = await db.scalar(
+            select(func.max(WaitlistEntry.seats)).where(
+                WaitlistEntry.flight_id == flight_id
+            )
+        )
+        if not free or largest is None:
+            return []
+
+        heads = {
+            head.seats: head
+            for head in await db.execute(
+                union_all(
+                    *(
+                        select(_head(flight_id, seats).subquery())
+                        for seats in range(1, min(free, largest) + 1)
+                    )
+                )
+            )
+        }
+
+        promoted = []
+        while True:
+            fitting = [head for seats, head in heads.items() if seats <= free]
+            if not fitting:
+                break
+            head = min(fitting, key=lambda head: head.position)
+            heads.pop(head.seats)
+            after = (
+                await db.execute(_head(flight_id, head.seats, head.position))
+            ).first()
+            if after is not None:
+                heads[head.seats] = after
+
+            confirmed = await db.execute(
+                transition(
+                    Booking,
+                    BOOKING_TRANSITIONS,
+                    WAITLISTED,
+                    CONFIRMED,
+                    Booking.booking_id == head.booking_id,
+                    booked_at=datetime.now(),
+                )
+            )
+            if confirmed.rowcount != 1:
+                # Cancelled since the head was read
+                continue
+
+            labels = await seat_maps.assign(db, flight_id, head.seats)
+            await db.execute(
+                update(Booking)
+                .where(Booking.booking_id == head.booking_id)
+                .values(seat_numbers=",".join(labels))
+                .execution_options(synchronize_session=False)
+            )
+            promoted.append((head.booking_id, head.email, labels))
+            free -= head.seats
+
+        if promoted:
+            booking_ids = [booking_id for booking_id, _, _ in promoted]
+            await db.execute(
+                delete(WaitlistEntry).where(WaitlistEntry.booking_id.in_(booking_ids))
+            )
+            await reserve_seats(
+                db, flight_id, sum(len(labels) for _, _, labels in promoted)
+            )
+            logger.info(
+                "Promoted {promoted} waitlisted bookings on flight ID: {flight_id}",
+                promoted=len(promoted),
+                flight_id=flight_id,
+            )
+        return promoted
+
+    async def close(self, db: AsyncSession, flight_id: str):
+        """Cancel every booking waiting on a flight that has been cancelled.
+
+        Runs in the caller's transaction, after the flight row was marked
+        cancelled, so no promotion can still be running against it. Returns
+        (booking_id, email) per cancelled booking; hand them to
+        notify_closed() once the transaction has committed.
+        """
+        waiting = (
+            await db.execute(
+                select(Booking.booking_id, Booking.email)
+                .join(WaitlistEntry, WaitlistEntry.booking_id == Booking.booking_id)
+                .where(WaitlistEntry.flight_id == flight_id)
+                .with_for_update()
+            )
+        ).all()
+        if not waiting:
+            return []
+
+        await db.execute(
+            transition(
+                Booking,
+                BOOKING_TRANSITIONS,
+                WAITLISTED,
+                CANCELLED,
+                Booking.booking_id.in_([booking_id for booking_id, _ in waiting]),
+                canceled_at=datetime.now(),
+            )
+        )
+        await db.execute(
+            delete(WaitlistEntry).where(WaitlistEntry.flight_id == flight_id)
+        )
+        logger.info(
+            "Cancelled {closed} waitlisted bookings on flight ID: {flight_id}",
+            closed=len(waiting),
+            flight_id=flight_id,
+        )
+        return [tuple(row) for row in waiting]
+
+    def notify(self, promoted: list):
+        """Queue a confirmation email per promoted booking."""
+        for booking_id, email, labels in promoted:
+            email_queue.enqueue(
+                email,
+                "Waitlisted booking confirmed",
+                f"Seats freed up and your booking {booking_id} is now confirmed. "
+                f"Seats: {', '.join(labels)}",
+            )
+        self.promoted += len(promoted)
+
+    def notify_closed(self, closed: list):
+        """Queue a cancellation email per booking close() cancelled."""
+        for booking_id, email in closed:
+            email_queue.enqueue(
+                email,
+                "Waitlisted booking cancelled",
+                f"The flight for your waitlisted booking {booking_id} has been "
+                "cancelled, so the booking is cancelled too.",
+            )
+        self.closed += len(closed)
+
+    def stats(self):
+        return {
+            "joined": self.joined,
+            "promoted": self.promoted,
+            "left": self.left,
+            "closed": self.closed,
+        }
+
+
+waitlist = Waitlist()
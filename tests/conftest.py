@@ -0,0 +1,167 @@
+"""Shared fixtures: the app on a throwaway SQLite database, with emails captured.
+
+Run from the repository root with ``python -m pytest``; set ``DB_ASYNC=true``
+to run the same tests against the async engine.
+"""
+
+import os
+import re
+import tempfile
+import uuid
+
+TMP_DIR = tempfile.mkdtemp()
+os.environ["DB_URL"] = f"sqlite:///{os.path.join(TMP_DIR, 'test.db')}"
+os.environ["LOG_FILE"] = os.path.join(TMP_DIR, "app.log")
+os.environ["LOG_STDOUT"] = "false"
+os.environ.setdefault("SECRET_KEY", "test-secret-key-used-only-by-the-test-suite")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+import main
+from database.database import Base, engine
+from src.models.flights import Flight
+from src.utils.mailer import email_queue
+
+
+@pytest.fixture(scope="session")
+def mailbox():
+    """(receiver, subject, body) of every email queued during the session."""
+    sent = []
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(
+            email_queue,
+            "enqueue",
+            lambda receiver, subject, body: sent.append((receiver, subject, body)),
+        )
+        yield sent
+
+
+@pytest.fixture(scope="session")
+def client(mailbox):
+    Base.metadata.create_all(engine)
+    with TestClient(main.app) as client:
+        yield client
+
+
+def last_otp(mailbox, receiver: str):
+    body = next(body for to, _, body in reversed(mailbox) if to == receiver)
+    return re.search(r"OTP(?: is|:) (\d+)", body).group(1)
+
+
+@pytest.fixture
+def otp_for(mailbox):
+    """The OTP in the latest email queued for a receiver."""
+    return lambda receiver: last_otp(mailbox, receiver)
+
+
+@pytest.fixture(scope="session")
+def admin_token(client):
+    staff = {"name": "Admin", "user_name": "admin", "email": "admin@example.com"}
+    response = client.post(
+        "/register_admin",
+        json={**staff, "password": "pw", "post": "admin", "key": "td"},
+    )
+    assert response.status_code == 200, response.text
+    response = client.get(
+        "/staff_sign_in", params={"email": staff["email"], "password": "pw"}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()[1]["access_token"]
+
+
+@pytest.fixture
+def new_customer(client, mailbox):
+    """Sign up, verify and sign in a customer; returns (email, token)."""
+
+    def sign_up():
+        email = f"{uuid.uuid4().hex[:12]}@example.com"
+        response = client.post(
+            "/sign_up",
+            json={
+                "first_name": "Test",
+                "last_name": "Customer",
+                "password": "pw123456",
+                "email": email,
+                "phone_no": "+1234567",
+            },
+        )
+        assert response.status_code == 200, response.text
+        client.post("/generate_otp", params={"email": email})
+        client.get(
+            "/verify_otp", params={"email": email, "otp": last_otp(mailbox, email)}
+        )
+        response = client.get(
+            "/sign_in", params={"email": email, "password": "pw123456"}
+        )
+        assert response.status_code == 200, response.text
+        return email, response.json()["access_token"]["access_token"]
+
+    return sign_up
+
+
+@pytest.fixture
+def customer(new_customer):
+    """A verified, signed-in customer: (email, token)."""
+    return new_customer()
+
+
+@pytest.fixture
+def start_booking(client):
+    """Draft a booking on a flight and send its payment OTP; returns its ID."""
+
+    def start(token, flight, adults=1):
+        response = client.post(
+            "/select_date_route_passengers",
+            headers={"token": token},
+            json={
+                "journey_date": flight["journey_date"],
+                "start_point": flight["start_point"],
+                "end_point": flight["end_point"],
+                "no_of_adults": adults,
+                "no_of_children": 0,
+                "no_of_infants": 0,
+            },
+        )
+        assert response.status_code == 200, response.text
+        booking_id = response.json()["booking_id"]
+        response = client.post(
+            "/select_time",
+            params={"booking_id": booking_id, "journey_time": flight["journey_time"]},
+        )
+        assert response.status_code == 200, response.text
+        client.post("/send_payment_otp", params={"booking_id": booking_id})
+        return booking_id
+
+    return start
+
+
+@pytest.fixture
+def register_flight(client, admin_token):
+    """Register a flight through the API; returns its flight_id."""
+
+    def register(**fields):
+        flight = {
+            "flight_name": f"T-{uuid.uuid4().hex[:8]}",
+            "journey_date": "2030-01-01",
+            "journey_time": "10:00",
+            "start_point": "TA",
+            "end_point": "TB",
+            "available_capacity": 10,
+            "flight_price": 100,
+            **fields,
+        }
+        response = client.post(
+            "/register_new_flight", headers={"token": admin_token}, json=flight
+        )
+        assert response.status_code == 200, response.text
+        with engine.connect() as connection:
+            return connection.scalar(
+                select(Flight.flight_id).where(
+                    Flight.flight_name == flight["flight_name"]
+                )
+            )
+
+    return register
@@ -0,0 +1,53 @@
+def test_cancelled_flight_is_not_listed_or_booked(
+    client, otp_for, admin_token, customer, register_flight
+):
+    email, token = customer
+    register_flight(
+        flight_name="CX-1", journey_date="2030-04-01", start_point="XA", end_point="XB"
+    )
+    response = client.post(
+        "/select_date_route_passengers",
+        headers={"token": token},
+        json={
+            "journey_date": "2030-04-01",
+            "start_point": "XA",
+            "end_point": "XB",
+            "no_of_adults": 1,
+            "no_of_children": 0,
+            "no_of_infants": 0,
+        },
+    )
+    assert response.status_code == 200, response.text
+    booking_id = response.json()["booking_id"]
+
+    # Listing the flight puts its route in the cache
+    response = client.get("/get_available_flights", params={"booking_id": booking_id})
+    assert response.status_code == 200, response.text
+    client.post(
+        "/select_time", params={"booking_id": booking_id, "journey_time": "10:00"}
+    )
+    client.post("/send_payment_otp", params={"booking_id": booking_id})
+
+    response = client.post(
+        "/cancel_flight",
+        headers={"token": admin_token},
+        json={
+            "flight_name": "CX-1",
+            "journey_date": "2030-04-01",
+            "journey_time": "10:00",
+        },
+    )
+    assert response.status_code == 200, response.text
+
+    response = client.get("/get_available_flights", params={"booking_id": booking_id})
+    assert response.status_code == 400
+    response = client.post(
+        "/verify_payment",
+        params={
+            "booking_id": booking_id,
+            "email": email,
+            "otp": otp_for(email),
+        },
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not enough seats available"
@@ -0,0 +1,36 @@
+from datetime import date
+
+from sqlalchemy import update
+
+from database.database import engine
+from src.models.flights import Flight
+from src.utils.connections import connection_graph
+
+
+def search(client):
+    response = client.get(
+        "/search_connections",
+        params={"start_point": "CA", "end_point": "CB", "journey_date": "2030-03-01"},
+    )
+    assert response.status_code == 200, response.text
+    return [itinerary["legs"][0]["flight_id"] for itinerary in response.json()]
+
+
+def test_day_changed_by_another_process_is_reloaded_after_ttl(client, register_flight):
+    flight_id = register_flight(
+        journey_date="2030-03-01", start_point="CA", end_point="CB"
+    )
+    assert search(client) == [flight_id]
+
+    # Written straight to the database, as another app process would, so no
+    # flight event reaches this process's graph
+    with engine.begin() as connection:
+        connection.execute(
+            update(Flight)
+            .where(Flight.flight_id == flight_id)
+            .values(is_cancelled=True)
+        )
+    assert search(client) == [flight_id]
+
+    connection_graph._days[date(2030, 3, 1)].loaded_at -= connection_graph.ttl
+    assert search(client) == []
@@ -0,0 +1,27 @@
+import json
+
+
+def test_malformed_ndjson_line_is_reported_as_invalid(client, admin_token):
+    flight = {
+        "flight_name": "IMPORT-1",
+        "journey_date": "2030-02-01",
+        "journey_time": "09:30",
+        "start_point": "IA",
+        "end_point": "IB",
+        "available_capacity": 10,
+        "flight_price": 100,
+    }
+    body = "\n".join([json.dumps(flight), '{"flight_name": "IMPORT-2",'])
+
+    response = client.post(
+        "/import_flights",
+        headers={"token": admin_token, "content-type": "application/x-ndjson"},
+        content=body,
+    )
+
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["created"], result["invalid"]) == (1, 1)
+    invalid = result["results"][1]
+    assert invalid["row"] == 2 and invalid["status"] == "invalid"
+    assert invalid["detail"].startswith("Invalid JSON: ")
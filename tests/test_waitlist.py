@@ -0,0 +1,88 @@
+from sqlalchemy import select
+
+from database.database import engine
+from src.models.booking import Booking, CANCELLED, CONFIRMED, DRAFT, WaitlistEntry
+
+FLIGHT = {
+    "flight_name": "WL-1",
+    "journey_date": "2030-05-01",
+    "journey_time": "10:00",
+    "start_point": "WA",
+    "end_point": "WB",
+}
+
+
+def pay(client, path, booking_id, email, otp):
+    response = client.post(
+        path, params={"booking_id": booking_id, "email": email, "otp": otp}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_cancelling_a_flight_cancels_and_notifies_its_waitlist(
+    client, mailbox, otp_for, admin_token, new_customer, register_flight, start_booking
+):
+    flight_id = register_flight(**FLIGHT, available_capacity=1)
+    booked_email, booked_token = new_customer()
+    booked = start_booking(booked_token, FLIGHT)
+    pay(client, "/verify_payment", booked, booked_email, otp_for(booked_email))
+
+    waiting = []
+    for _ in range(2):
+        email, token = new_customer()
+        booking_id = start_booking(token, FLIGHT)
+        joined = pay(client, "/join_waitlist", booking_id, email, otp_for(email))
+        assert joined["status"] == "waitlisted"
+        waiting.append((booking_id, email))
+    late_email, late_token = new_customer()
+    late = start_booking(late_token, FLIGHT)
+
+    response = client.post(
+        "/cancel_flight",
+        headers={"token": admin_token},
+        json={
+            key: FLIGHT[key] for key in ("flight_name", "journey_date", "journey_time")
+        },
+    )
+    assert response.status_code == 200, response.text
+
+    with engine.connect() as connection:
+        statuses = dict(
+            connection.execute(
+                select(Booking.booking_id, Booking.status).where(
+                    Booking.flight_id == flight_id
+                )
+            ).all()
+        )
+        queued = connection.scalar(
+            select(WaitlistEntry.booking_id).where(WaitlistEntry.flight_id == flight_id)
+        )
+    assert statuses == {
+        booked: CONFIRMED,
+        late: DRAFT,
+        **{booking_id: CANCELLED for booking_id, _ in waiting},
+    }
+    assert queued is None
+
+    notices = [
+        (receiver, body)
+        for receiver, subject, body in mailbox
+        if subject == "Waitlisted booking cancelled"
+    ]
+    assert sorted(notices) == sorted(
+        (
+            email,
+            f"The flight for your waitlisted booking {booking_id} has been "
+            "cancelled, so the booking is cancelled too.",
+        )
+        for booking_id, email in waiting
+    )
+
+    # A booking that picked the flight before it was cancelled cannot queue
+    response = client.post(
+        "/join_waitlist",
+        params={"booking_id": late, "email": late_email, "otp": otp_for(late_email)},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Flight cancelled"